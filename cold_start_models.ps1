@@ -2,8 +2,7 @@ Write-Host " Cold Starting Models (This may take a few minutes if they are scali
 
 $models = @(
     @{ Name = "IndicConformer STT"; Path = "src/modal/test_indicconformer.py" },
-    @{ Name = "IndicTrans2 (Indic -> English)"; Path = "src/modal/test_indictrans2.py" },
-    @{ Name = "IndicTrans2 (English -> Indic)"; Path = "src/modal/test_indictrans2_en_indic.py" },
+    @{ Name = "IndicTrans2 (both directions)"; Url = "https://akshaymp-1810--indictrans2-indictrans2service-web-app.modal.run/ready" },
     @{ Name = "IndicF5 TTS"; Path = "src/modal/test_indicf5.py" }
 )
 
@@ -13,11 +12,16 @@ $models | ForEach-Object {
     $model = $_
     Write-Host "🚀 Starting warmup for $($model.Name)..."
     $jobs += Start-Job -ScriptBlock {
-        param($name, $path)
+        param($name, $path, $url)
         Write-Output "⏳ Warming up $name..."
-        uv run python $path
+        if ($url) {
+            # Readiness endpoint: returns once the container has loaded and warmed up
+            Invoke-WebRequest -Uri $url -TimeoutSec 600 -SkipHttpErrorCheck | Out-Null
+        } else {
+            uv run python $path
+        }
         Write-Output "✅ $name warmed up!"
-    } -ArgumentList $model.Name, $model.Path
+    } -ArgumentList $model.Name, $model.Path, $model.Url
 }
 
 Write-Host "Waiting for all models to warm up..."
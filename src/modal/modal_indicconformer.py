@@ -2,13 +2,23 @@
 Modal deployment for IndicConformer STT (Speech-to-Text) model.
 Model: ai4bharat/indic-conformer-600m-multilingual
 
-Deploy:
+Deploy (GPU service IndicConformerSTT + CPU INT8 service IndicConformerSTTCPU):
     modal deploy src/modal_indicconformer.py
 
+Benchmark real-time factor (GPU vs CPU INT8 vs CPU FP32):
+    modal run src/modal/modal_indicconformer.py::benchmark --audio clip.wav
+
 Test locally:
     modal serve src/modal_indicconformer.py
 """
 
+import asyncio
+import functools
+import struct
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
 import modal
 
 app = modal.App("indicconformer-stt")
@@ -40,16 +50,350 @@ image = (
 
 MINUTES = 60  # seconds
 
-@app.cls(
-    image=image,
-    gpu="A10G",
-    secrets=[modal.Secret.from_name("huggingface-secret")],
-    volumes={"/cache": model_cache},  # Mount volume at /cache
-    timeout=10 * MINUTES,
-    scaledown_window=5 * MINUTES,
-)
-class IndicConformerSTT:
-    """IndicConformer STT service with FastAPI web endpoints."""
+# Streaming (/stream): re-decode the current block after this much new audio.
+# Once the block reaches STREAM_MAX_BLOCK_S, the audio up to the quietest
+# STREAM_CUT_FRAME_MS frame in its last STREAM_CUT_SEARCH_S is committed and
+# the rest starts the next block, so a partial never re-decodes more than
+# STREAM_MAX_BLOCK_S and blocks end in pauses rather than mid-word
+STREAM_PARTIAL_INTERVAL_S = 0.4
+STREAM_MAX_BLOCK_S = 8
+STREAM_CUT_SEARCH_S = 2
+STREAM_CUT_FRAME_MS = 20
+
+# Micro-batching: requests arriving within BATCH_MAX_WAIT_MS of each other are
+# run as one forward pass, grouped so the longest clip in a batch is at most
+# BATCH_BUCKET_RATIO times the shortest (bounds the padding)
+BATCH_MAX_SIZE = 16
+BATCH_MAX_WAIT_MS = 10
+BATCH_BUCKET_RATIO = 1.5
+MAX_CONCURRENT_INPUTS = 32
+
+# CPU deployment (IndicConformerSTTCPU): ONNX Runtime threads per container
+# (matches the reserved cores) and where the INT8 encoder is cached
+CPU_NUM_THREADS = 8
+INT8_DIR = "/cache/int8"
+
+# Warm-up at container start: clip lengths (s) batched together, and rounds
+# (the first pays CUDA/ORT setup, later ones show steady-state latency)
+WARMUP_CLIP_S = (1.0, 4.0)
+WARMUP_RUNS = 2
+
+
+TARGET_SR = 16000  # Model input rate
+
+
+@functools.lru_cache(maxsize=16)
+def get_resampler(orig_sr: int, target_sr: int = TARGET_SR):
+    """Resample module for a rate pair (kernel built once per container)."""
+    import torchaudio
+
+    return torchaudio.transforms.Resample(orig_freq=orig_sr, new_freq=target_sr)
+
+
+def pcm16_to_mono(buffer: bytes, channels: int = 1, offset: int = 0, count: int = -1):
+    """
+    View little-endian int16 PCM in `buffer` as a tensor without copying it,
+    then convert to a mono float32 (1, samples) tensor in a single pass.
+    """
+    import torch
+
+    with warnings.catch_warnings():
+        # The view is only read from; the float conversion below allocates
+        warnings.simplefilter("ignore", UserWarning)
+        samples = torch.frombuffer(buffer, dtype=torch.int16, offset=offset, count=count)
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].view(-1, channels)
+        return (samples.float().mean(dim=1) / 32768.0).unsqueeze(0)
+    return (samples.float() / 32768.0).unsqueeze(0)
+
+
+def parse_wav_pcm16(data: bytes) -> tuple[int, int, int, int] | None:
+    """
+    (sample_rate, channels, data_offset, n_samples) for a 16-bit PCM WAV file,
+    or None if it is anything else (compressed, float, WAVE_FORMAT_EXTENSIBLE...).
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    pos, fmt = 12, None
+    while pos + 8 <= len(data):
+        chunk_id, size = data[pos:pos + 4], struct.unpack_from("<I", data, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", data, body)
+        elif chunk_id == b"data":
+            if fmt is None or fmt[0] != 1 or fmt[5] != 16:
+                return None
+            # Streaming writers leave the size at 0 / 0xFFFFFFFF: read to the end
+            size = min(size, len(data) - body) or len(data) - body
+            return fmt[2], fmt[1], body, size // 2
+        pos = body + size + (size & 1)
+    return None
+
+
+def decode_audio(body: bytes, audio_format: str = "wav", sample_rate: int = TARGET_SR, channels: int = 1):
+    """
+    Mono float32 (1, samples) tensor and its sample rate.
+
+    Raw PCM and 16-bit PCM WAV are mapped straight from the request bytes;
+    anything else goes through torchaudio's container decoders.
+    """
+    import io
+    import torch
+    import torchaudio
+
+    if audio_format == "pcm_s16le":
+        return pcm16_to_mono(body, channels), sample_rate
+
+    wav_info = parse_wav_pcm16(body)
+    if wav_info:
+        sr, channels, offset, n_samples = wav_info
+        n_samples -= n_samples % channels
+        return pcm16_to_mono(body, channels, offset, n_samples), sr
+
+    wav, sr = torchaudio.load(io.BytesIO(body))
+    return torch.mean(wav, dim=0, keepdim=True), sr
+
+
+def quietest_cut(pcm: bytes, search_bytes: int, frame_bytes: int) -> int:
+    """Byte offset of the middle of the quietest frame in the last search_bytes of 16-bit PCM."""
+    import torch
+
+    start = max(0, len(pcm) - search_bytes)
+    start -= start % 2
+    samples = pcm16_to_mono(pcm, offset=start, count=(len(pcm) - start) // 2)[0]
+    frame = max(1, frame_bytes // 2)
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return len(pcm)
+    energy = samples[:n_frames * frame].view(n_frames, frame).pow(2).mean(dim=1)
+    return start + (int(torch.argmin(energy)) * frame + frame // 2) * 2
+
+
+def resample(wav, sr: int):
+    """Resample a (1, samples) tensor to the model rate with a cached kernel."""
+    if sr == TARGET_SR:
+        return wav
+    return get_resampler(sr)(wav)
+
+
+def synthetic_clip(seconds: float):
+    """Voice-like (1, samples) test signal: a gliding tone with syllable-rate bursts and noise."""
+    import torch
+
+    generator = torch.Generator().manual_seed(0)
+    t = torch.arange(int(seconds * TARGET_SR)) / TARGET_SR
+    pitch = 180 + 40 * torch.sin(2 * torch.pi * 0.7 * t)
+    envelope = 0.5 + 0.5 * torch.sin(2 * torch.pi * 4 * t).clamp(min=0)
+    tone = torch.sin(2 * torch.pi * torch.cumsum(pitch, 0) / TARGET_SR)
+    noise = torch.randn(t.shape, generator=generator)
+    return (0.3 * envelope * tone + 0.05 * noise).unsqueeze(0)
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent transcription requests into batched model calls.
+
+    Requests queue on the event loop; a single worker thread owns the model,
+    so the loop keeps accepting requests (and filling the next batch) while
+    the current one runs on the GPU.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        bucket_ratio: float = BATCH_BUCKET_RATIO,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.bucket_ratio = bucket_ratio
+
+        self._pending: list = []  # (wav, language, decoding, future)
+        self._wakeup = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt")
+        # Cleared the first time the model rejects a padded batch, or when
+        # check_batching() finds that padding changes the transcription; after
+        # that each bucket runs item by item on the worker thread
+        self.batched_forward = True
+        self.batch_check = "unchecked"
+
+        # Stats
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.padded_samples = 0
+        self.audio_samples = 0
+
+    async def submit(self, wav, language: str, decoding: str) -> tuple[str, float]:
+        """
+        Queue a mono 16kHz (1, samples) tensor and wait for its transcription.
+
+        Returns (text, inference_ms), where inference_ms is the forward pass
+        of the batch the request ran in (queueing excluded).
+        """
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((wav, language, decoding, future))
+        self._wakeup.set()
+        return await future
+
+    def stats(self) -> dict:
+        """Batching statistics since the container started."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": len(self._pending),
+            "padding_fraction": (
+                self.padded_samples / (self.padded_samples + self.audio_samples)
+                if self.audio_samples else 0.0
+            ),
+            "batched_forward": self.batched_forward,
+            "batch_check": self.batch_check,
+        }
+
+    def _buckets(self, items: list) -> list[list]:
+        """Split requests into batches of one language/decoding and similar length."""
+        groups: dict = {}
+        for item in items:
+            groups.setdefault((item[1], item[2]), []).append(item)
+
+        buckets = []
+        for group in groups.values():
+            group.sort(key=lambda item: item[0].shape[-1])
+            bucket = []
+            for item in group:
+                if bucket and (
+                    len(bucket) >= self.max_batch_size
+                    or item[0].shape[-1] > self.bucket_ratio * bucket[0][0].shape[-1]
+                ):
+                    buckets.append(bucket)
+                    bucket = []
+                bucket.append(item)
+            buckets.append(bucket)
+        return buckets
+
+    def _infer(self, wavs: list, language: str, decoding: str) -> list[str]:
+        """Run one bucket on the worker thread (padded batch, or item by item)."""
+        import torch
+
+        if len(wavs) > 1 and self.batched_forward:
+            lengths = [wav.shape[-1] for wav in wavs]
+            batch = torch.zeros(len(wavs), max(lengths))
+            for i, wav in enumerate(wavs):
+                batch[i, :lengths[i]] = wav[0]
+            try:
+                with torch.inference_mode():
+                    texts = self.model(batch, language, decoding)
+                if isinstance(texts, (list, tuple)) and len(texts) == len(wavs):
+                    self.padded_samples += len(wavs) * max(lengths) - sum(lengths)
+                    return list(texts)
+                raise ValueError(f"expected {len(wavs)} hypotheses, got {type(texts).__name__}")
+            except Exception as e:
+                print(f"⚠️ Batched forward unsupported ({e}), falling back to per-request calls")
+                self.batched_forward = False
+
+        with torch.inference_mode():
+            return [self.model(wav, language, decoding) for wav in wavs]
+
+    def check_batching(self, wavs: list, language: str, decoding: str) -> str:
+        """
+        Compare each clip's transcription in a zero-padded batch with its
+        transcription on its own. The model takes no lengths or masks, so if
+        the padding changes the output, batching is turned off.
+
+        Returns "match", "mismatch", "unsupported" or "inconclusive" (every
+        clip transcribed to empty text, so padding effects cannot show).
+        """
+        import torch
+
+        with torch.inference_mode():
+            single = [self.model(wav, language, decoding) for wav in wavs]
+        batched = self._infer(wavs, language, decoding)
+        if not self.batched_forward:
+            self.batch_check = "unsupported"
+        elif batched != single:
+            print(f"⚠️ Padded batch changes transcriptions ({batched} vs {single}), batching disabled")
+            self.batched_forward = False
+            self.batch_check = "mismatch"
+        elif not any(text.strip() for text in single):
+            self.batch_check = "inconclusive"
+        else:
+            self.batch_check = "match"
+        return self.batch_check
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Let concurrent requests join this batch
+            await asyncio.sleep(self.max_wait_ms / 1000)
+            self._wakeup.clear()
+
+            items = [item for item in self._pending if not item[3].done()]
+            self._pending = []
+            for bucket in self._buckets(items):
+                wavs = [item[0] for item in bucket]
+                try:
+                    start = time.perf_counter()
+                    texts = await loop.run_in_executor(
+                        self._executor, self._infer, wavs, bucket[0][1], bucket[0][2]
+                    )
+                    inference_ms = (time.perf_counter() - start) * 1000
+                except Exception as e:
+                    for item in bucket:
+                        if not item[3].done():
+                            item[3].set_exception(e)
+                    continue
+
+                self.requests += len(bucket)
+                self.batches += 1
+                self.max_batch_seen = max(self.max_batch_seen, len(bucket))
+                self.audio_samples += sum(wav.shape[-1] for wav in wavs)
+                for item, text in zip(bucket, texts):
+                    if not item[3].done():
+                        item[3].set_result((text, inference_ms))
+
+
+def find_ort_sessions(model) -> list[tuple]:
+    """(container, key, session) for each ONNX Runtime session held by the model."""
+    import onnxruntime as ort
+
+    found = []
+    for key, value in vars(model).items():
+        if isinstance(value, ort.InferenceSession):
+            found.append((model, key, value))
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                if isinstance(v, ort.InferenceSession):
+                    found.append((value, k, v))
+    return found
+
+
+def install_sessions(sessions: list[tuple]):
+    """Put (container, key, session) entries back on the model."""
+    for container, key, session in sessions:
+        if isinstance(container, dict):
+            container[key] = session
+        else:
+            setattr(container, key, session)
+
+
+class IndicConformerBase:
+    """IndicConformer STT service with FastAPI web endpoints (GPU and CPU deployments)."""
+
+    # Named inference paths that benchmark() compares: name -> sessions to
+    # install (None = the model as loaded)
+    session_sets: dict = {"stock": None}
+
+    def prepare_model(self):
+        """Hook run after the stock model is loaded (CPU mode swaps in INT8 ONNX)."""
 
     @modal.enter()
     def load_model(self):
@@ -58,6 +402,8 @@ class IndicConformerSTT:
         from huggingface_hub import login
         from transformers import AutoModel
 
+        load_start = time.perf_counter()
+
         # Set HuggingFace cache to volume (persists between restarts)
         os.environ["HF_HOME"] = "/cache/huggingface"
         os.makedirs("/cache/huggingface", exist_ok=True)
@@ -72,19 +418,45 @@ class IndicConformerSTT:
             trust_remote_code=True,
         )
         
+        self.prepare_model()
+
         # Commit volume to persist the cache
         model_cache.commit()
+
+        self.batcher = MicroBatcher(self.model)
+        self.load_s = round(time.perf_counter() - load_start, 2)
         print("✅ IndicConformer model loaded successfully!")
 
+        self.warmup()
+
+    def warmup(self):
+        """Run synthetic clips through the serving path so the first request is fast."""
+        wavs = [synthetic_clip(seconds) for seconds in WARMUP_CLIP_S]
+        self.warmup_ms = []
+        self.warmup_error = None
+        try:
+            for _ in range(WARMUP_RUNS):
+                start = time.perf_counter()
+                # Same call the batcher makes; also settles whether batched forward works
+                self.batcher._infer(wavs, "kn", "ctc")
+                self.warmup_ms.append(round((time.perf_counter() - start) * 1000, 1))
+            # The shorter clip is zero-padded in the batch: same text as on its own?
+            print(f"🔍 Batched vs single-clip check: {self.batcher.check_batching(wavs, 'kn', 'ctc')}")
+            self.warm = True
+            print(f"🔥 Warm-up done: {self.warmup_ms} ms")
+        except Exception as e:
+            self.warm = False
+            self.warmup_error = str(e)
+            print(f"⚠️ Warm-up failed: {e}")
+
     @modal.asgi_app()
     def web_app(self):
         """FastAPI web application with multiple endpoints."""
-        from fastapi import FastAPI, HTTPException
+        from fastapi import FastAPI, HTTPException, Header, Request, WebSocket, WebSocketDisconnect
+        from fastapi.responses import JSONResponse
         from pydantic import BaseModel
         import base64
-        import io
-        import torch
-        import torchaudio
+        import json
 
         web_app = FastAPI(
             title="IndicConformer STT API",
@@ -101,6 +473,10 @@ class IndicConformerSTT:
             transcription: str
             language: str
             decoding: str
+            # Server-side timings (ms)
+            decode_ms: float = 0.0
+            resample_ms: float = 0.0
+            inference_ms: float = 0.0
 
         class HealthResponse(BaseModel):
             status: str
@@ -122,48 +498,222 @@ class IndicConformerSTT:
                 supported_languages=SUPPORTED_LANGUAGES,
             )
 
+        def validate(language: str, decoding: str):
+            if language not in SUPPORTED_LANGUAGES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unsupported language: {language}"
+                )
+
+            if decoding not in ["ctc", "rnnt"]:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid decoding: {decoding}. Use 'ctc' or 'rnnt'"
+                )
+
+        async def run_model(body: bytes, language: str, decoding: str, audio_format: str = "wav",
+                            sample_rate: int = TARGET_SR, channels: int = 1) -> TranscribeResponse:
+            """Decode, resample to 16kHz and transcribe an audio body."""
+            start = time.perf_counter()
+            wav, sr = decode_audio(body, audio_format, sample_rate, channels)
+            decoded = time.perf_counter()
+
+            # Resample to 16kHz if needed (kernel cached per rate)
+            wav = resample(wav, sr)
+            resampled = time.perf_counter()
+
+            # Transcribe (batched with concurrent requests)
+            transcription, inference_ms = await self.batcher.submit(wav, language, decoding)
+
+            return TranscribeResponse(
+                transcription=transcription,
+                language=language,
+                decoding=decoding,
+                decode_ms=round((decoded - start) * 1000, 2),
+                resample_ms=round((resampled - decoded) * 1000, 2),
+                inference_ms=round(inference_ms, 2),
+            )
+
         @web_app.post("/transcribe", response_model=TranscribeResponse)
         async def transcribe(request: TranscribeRequest):
-            """Transcribe audio to text."""
+            """Transcribe audio to text (base64 JSON body; prefer /transcribe_raw)."""
+            validate(request.language, request.decoding)
             try:
-                if request.language not in SUPPORTED_LANGUAGES:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Unsupported language: {request.language}"
-                    )
-
-                if request.decoding not in ["ctc", "rnnt"]:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid decoding: {request.decoding}. Use 'ctc' or 'rnnt'"
-                    )
-
                 # Decode audio from base64
                 audio_bytes = base64.b64decode(request.audio_b64)
-                wav, sr = torchaudio.load(io.BytesIO(audio_bytes))
-
-                # Convert to mono
-                wav = torch.mean(wav, dim=0, keepdim=True)
+                return await run_model(audio_bytes, request.language, request.decoding)
 
-                # Resample to 16kHz if needed
-                if sr != 16000:
-                    resampler = torchaudio.transforms.Resample(
-                        orig_freq=sr, new_freq=16000
-                    )
-                    wav = resampler(wav)
-
-                # Transcribe
-                transcription = self.model(wav, request.language, request.decoding)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
 
-                return TranscribeResponse(
-                    transcription=transcription,
-                    language=request.language,
-                    decoding=request.decoding,
+        @web_app.post("/transcribe_raw", response_model=TranscribeResponse)
+        async def transcribe_raw(
+            request: Request,
+            language: str = "kn",
+            decoding: str = "ctc",
+            x_audio_format: str = Header("pcm_s16le"),
+            x_sample_rate: int = Header(16000),
+            x_channels: int = Header(1),
+        ):
+            """
+            Transcribe a binary audio body (no base64, no JSON).
+
+            Body is raw little-endian 16-bit PCM by default
+            (X-Audio-Format: pcm_s16le, X-Sample-Rate, X-Channels), or a whole
+            file with X-Audio-Format: wav / flac.
+            """
+            validate(language, decoding)
+            body = await request.body()
+            if not body:
+                raise HTTPException(status_code=400, detail="Empty audio body")
+
+            if x_audio_format not in ("pcm_s16le", "wav", "flac"):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid audio format: {x_audio_format}. Use 'pcm_s16le', 'wav' or 'flac'"
                 )
+            if x_channels < 1:
+                raise HTTPException(status_code=400, detail=f"Invalid X-Channels: {x_channels}")
+            if x_sample_rate <= 0:
+                raise HTTPException(status_code=400, detail=f"Invalid X-Sample-Rate: {x_sample_rate}")
+            if x_audio_format == "pcm_s16le" and len(body) % (2 * x_channels):
+                raise HTTPException(status_code=400, detail="Truncated PCM frame")
 
+            try:
+                return await run_model(body, language, decoding, x_audio_format, x_sample_rate, x_channels)
+
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @web_app.websocket("/stream")
+        async def stream(websocket: WebSocket):
+            """
+            Streaming transcription of one utterance.
+
+            Protocol:
+                client -> {"language": "kn", "decoding": "ctc", "sample_rate": 16000}
+                client -> binary frames of 16-bit mono PCM (any size)
+                server -> {"type": "partial", "transcription": "..."} while audio arrives
+                client -> {"type": "end"}
+                server -> {"type": "final", "transcription": "...", "audio_ms": ...}
+
+            The model has no incremental decoder state, so each partial
+            re-decodes the current block (at most STREAM_MAX_BLOCK_S, cut at
+            a pause); by end of speech the last partial usually already
+            covers all the audio and the final is immediate.
+            """
+            await websocket.accept()
+            try:
+                config = json.loads(await websocket.receive_text())
+                language = config.get("language", "kn")
+                decoding = config.get("decoding", "ctc")
+                sample_rate = int(config.get("sample_rate", 16000))
+                if sample_rate <= 0:
+                    raise ValueError(f"sample_rate must be positive, got {sample_rate}")
+                validate(language, decoding)
+            except WebSocketDisconnect:
+                return
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else f"Invalid config: {e}"
+                await websocket.send_json({"type": "error", "detail": detail})
+                await websocket.close()
+                return
+
+            pcm = bytearray()  # Current block (since the last commit)
+            committed: list[str] = []  # Hypotheses of finished blocks
+            total_bytes = 0
+            partial_step = int(STREAM_PARTIAL_INTERVAL_S * sample_rate) * 2
+            max_block = int(STREAM_MAX_BLOCK_S * sample_rate) * 2
+            cut_search = int(STREAM_CUT_SEARCH_S * sample_rate) * 2
+            cut_frame = int(STREAM_CUT_FRAME_MS * sample_rate / 1000) * 2
+            decoded = {"bytes": 0, "text": ""}  # Latest partial of the current block
+            partial_task: asyncio.Task | None = None
+
+            async def decode_block(block: bytes) -> str:
+                result = await run_model(block, language, decoding, "pcm_s16le", sample_rate)
+                return result.transcription
+
+            def joined(text: str) -> str:
+                return " ".join(t.strip() for t in committed + [text] if t and t.strip())
+
+            async def send_partial(block: bytes):
+                text = await decode_block(block)
+                decoded["bytes"], decoded["text"] = len(block), text
+                await websocket.send_json({"type": "partial", "transcription": joined(text)})
+
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect()
+                    if message.get("bytes"):
+                        pcm.extend(message["bytes"])
+                        total_bytes += len(message["bytes"])
+                    elif message.get("text") and json.loads(message["text"]).get("type") == "end":
+                        break
+
+                    if len(pcm) >= max_block:
+                        if partial_task:
+                            await partial_task
+                        # Commit up to a pause; the rest opens the next block
+                        cut = quietest_cut(bytes(pcm), cut_search, cut_frame)
+                        committed.append(await decode_block(bytes(pcm[:cut])))
+                        del pcm[:cut]
+                        decoded["bytes"], decoded["text"] = 0, ""
+                    elif len(pcm) - decoded["bytes"] >= partial_step and (
+                        partial_task is None or partial_task.done()
+                    ):
+                        if partial_task:
+                            partial_task.result()  # Surface decode errors
+                        partial_task = asyncio.create_task(send_partial(bytes(pcm)))
+
+                if partial_task:
+                    await partial_task
+                if len(pcm) == decoded["bytes"]:
+                    text = decoded["text"]  # No new audio since the last partial
+                else:
+                    text = await decode_block(bytes(pcm))
+                await websocket.send_json({
+                    "type": "final",
+                    "transcription": joined(text),
+                    "language": language,
+                    "decoding": decoding,
+                    "audio_ms": round(total_bytes / 2 / sample_rate * 1000),
+                })
+                await websocket.close()
+
+            except WebSocketDisconnect:
+                pass
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                await websocket.close()
+            finally:
+                if partial_task and not partial_task.done():
+                    partial_task.cancel()
+
+        @web_app.get("/ready")
+        async def ready():
+            """Readiness: 200 once warm-up inference has run, 503 otherwise."""
+            return JSONResponse(
+                status_code=200 if self.warm else 503,
+                content={
+                    "ready": self.warm,
+                    "model": MODEL_ID,
+                    "load_s": self.load_s,
+                    "warmup_ms": self.warmup_ms,
+                    "warmup_error": self.warmup_error,
+                    "batched_forward": self.batcher.batched_forward,
+                    "batch_check": self.batcher.batch_check,
+                },
+            )
+
+        @web_app.get("/stats")
+        async def stats():
+            """Micro-batching statistics for this container."""
+            return self.batcher.stats()
+
         @web_app.get("/languages")
         async def list_languages():
             """Get list of supported language codes with names."""
@@ -181,7 +731,142 @@ class IndicConformerSTT:
         return web_app
 
 
+    @modal.method()
+    def benchmark(self, audio: bytes = None, repeats: int = 3, language: str = "kn") -> dict:
+        """
+        Real-time factor (processing time / audio duration) of each inference
+        path in this container. Uses 10s of synthetic audio if none is given.
+        """
+        import torch
+
+        if audio:
+            wav = resample(*decode_audio(audio))
+        else:
+            wav = synthetic_clip(10)
+        duration_s = wav.shape[-1] / 16000
+
+        results = {}
+        for name, sessions in self.session_sets.items():
+            if sessions:
+                install_sessions(sessions)
+            with torch.inference_mode():
+                self.model(wav, language, "ctc")  # Warm-up
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    text = self.model(wav, language, "ctc")
+                    timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results[name] = {
+                "audio_s": round(duration_s, 2),
+                "latency_ms": round(best * 1000, 1),
+                "rtf": round(best / duration_s, 4),
+                "transcription": text,
+            }
+        # Serving path is the first entry
+        first = next(iter(self.session_sets.values()))
+        if first:
+            install_sessions(first)
+        return results
+
+
+@app.cls(
+    image=image,
+    gpu="A10G",
+    secrets=[modal.Secret.from_name("huggingface-secret")],
+    volumes={"/cache": model_cache},  # Mount volume at /cache
+    timeout=10 * MINUTES,
+    scaledown_window=5 * MINUTES,
+)
+@modal.concurrent(max_inputs=MAX_CONCURRENT_INPUTS)  # Concurrent requests feed the batcher
+class IndicConformerSTT(IndicConformerBase):
+    """GPU deployment (stock model, CUDA execution)."""
+
+
+@app.cls(
+    image=image,
+    cpu=CPU_NUM_THREADS,
+    memory=16384,
+    secrets=[modal.Secret.from_name("huggingface-secret")],
+    volumes={"/cache": model_cache},
+    timeout=10 * MINUTES,
+    scaledown_window=5 * MINUTES,
+)
+@modal.concurrent(max_inputs=MAX_CONCURRENT_INPUTS)
+class IndicConformerSTTCPU(IndicConformerBase):
+    """
+    CPU-only deployment: ONNX Runtime on CPU with a dynamically quantized
+    (INT8 weights) conformer encoder. The quantized encoder is built once
+    and kept on the cache volume.
+    """
+
+    def prepare_model(self):
+        import os
+        import onnxruntime as ort
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        torch.set_num_threads(CPU_NUM_THREADS)  # Preprocessor / decoding glue
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = CPU_NUM_THREADS
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+
+        fp32, int8 = [], []
+        for container, key, session in find_ort_sessions(self.model):
+            path = getattr(session, "_model_path", None)
+            if not isinstance(path, str):
+                raise RuntimeError(f"Cannot locate the ONNX file behind session {key!r}")
+            fp32.append((container, key, session))  # As loaded (kept for benchmark)
+
+            if "encoder" in os.path.basename(path):
+                quantized = os.path.join(INT8_DIR, os.path.basename(path).replace(".onnx", ".int8.onnx"))
+                if not os.path.exists(quantized):
+                    print(f"🔄 Quantizing {path} to INT8...")
+                    os.makedirs(INT8_DIR, exist_ok=True)
+                    quantize_dynamic(
+                        path,
+                        quantized,
+                        weight_type=QuantType.QInt8,
+                        op_types_to_quantize=["MatMul", "Gemm"],
+                        use_external_data_format=True,
+                    )
+                path = quantized
+                print(f"✅ INT8 encoder: {quantized}")
+            int8.append((container, key, ort.InferenceSession(path, options, providers=providers)))
+
+        if not any("encoder" in os.path.basename(s._model_path) for _, _, s in fp32):
+            raise RuntimeError("No ONNX encoder session found on the model; CPU INT8 mode needs the ONNX export")
+
+        install_sessions(int8)
+        self.session_sets = {"int8": int8, "fp32": fp32}
+        print(f"🧮 CPU mode: {CPU_NUM_THREADS} threads, INT8 encoder")
+
+
+@app.local_entrypoint()
+def benchmark(audio: str = "", repeats: int = 3):
+    """
+    Compare real-time factors of the GPU and CPU deployments.
+
+        modal run src/modal/modal_indicconformer.py::benchmark --audio clip.wav
+    """
+    audio_bytes = open(audio, "rb").read() if audio else None
+    results = {
+        "gpu": IndicConformerSTT().benchmark.remote(audio_bytes, repeats),
+        "cpu": IndicConformerSTTCPU().benchmark.remote(audio_bytes, repeats),
+    }
+    print(f"{'path':<12} {'audio_s':>8} {'latency_ms':>11} {'rtf':>8}")
+    for device, paths in results.items():
+        for name, r in paths.items():
+            print(f"{device + '/' + name:<12} {r['audio_s']:>8} {r['latency_ms']:>11} {r['rtf']:>8}")
+    for device, paths in results.items():
+        for name, r in paths.items():
+            print(f"📝 {device}/{name}: {r['transcription']}")
+
+
 @app.local_entrypoint()
 def main():
     print("🚀 IndicConformer STT deployed!")
-    print("📍 Endpoints: /health, /languages, /transcribe")
+    print("📍 Endpoints: /health, /languages, /transcribe, /transcribe_raw, /stream (WebSocket), /ready, /stats")
@@ -8,6 +8,7 @@ Deploy:
 """
 
 import modal
+from fastapi import Request
 
 app = modal.App("indicf5-tts")
 
@@ -81,6 +82,42 @@ image = (
 
 MINUTES = 60
 
+# Warm-up at container start: a short Kannada sentence with the default voice,
+# run WARMUP_RUNS times (the first pays CUDA setup and kernel selection)
+WARMUP_TEXT = "ನಮಸ್ಕಾರ, ನಾನು ನಿಮಗೆ ಹೇಗೆ ಸಹಾಯ ಮಾಡಲಿ?"
+WARMUP_RUNS = 2
+
+# n_steps accepted from clients (flow-matching steps; more is slower)
+MIN_N_STEPS = 1
+MAX_N_STEPS = 64
+DEFAULT_N_STEPS = 16
+
+# One synthesis at a time runs on the GPU; the extra input slots only let
+# cheap requests (/ready, requests waiting for the GPU) share the container
+# instead of starting new ones
+MAX_CONCURRENT_INPUTS = 4
+
+
+def parse_n_steps(value) -> int:
+    """Validate a client-supplied n_steps (400 on a bad value)."""
+    from fastapi import HTTPException
+
+    if value is None:
+        return DEFAULT_N_STEPS
+    try:
+        n_steps = int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"n_steps must be an integer, got {value!r}")
+    if isinstance(value, float) and value != n_steps:
+        raise HTTPException(status_code=400, detail=f"n_steps must be an integer, got {value!r}")
+    if not MIN_N_STEPS <= n_steps <= MAX_N_STEPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"n_steps must be between {MIN_N_STEPS} and {MAX_N_STEPS}, got {n_steps}",
+        )
+    return n_steps
+
+
 @app.cls(
     image=image,
     gpu="A10G",
@@ -88,6 +125,7 @@ MINUTES = 60
     timeout=10 * MINUTES,
     scaledown_window=5 * MINUTES,
 )
+@modal.concurrent(max_inputs=MAX_CONCURRENT_INPUTS)  # /ready must not wait for a synthesis
 class IndicF5Service:
     """IndicF5 Text-to-Speech Service."""
 
@@ -95,9 +133,14 @@ class IndicF5Service:
     def load_model(self):
         """Load model for inference."""
         import os
+        import threading
+        import time
         import torch
         from transformers import AutoModel
-        
+
+        # Inputs run concurrently; the model itself is used by one at a time
+        self.gpu_lock = threading.Lock()
+        load_start = time.perf_counter()
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         print(f"🔄 Loading IndicF5 from {MODEL_DIR} on {self.device}...")
 
@@ -120,133 +163,200 @@ class IndicF5Service:
         if not os.path.exists(self.default_ref_path):
             print("⚠️ Default reference audio not found!")
 
+        self.load_s = round(time.perf_counter() - load_start, 2)
         print("✅ IndicF5 loaded!")
 
-    @modal.web_endpoint(method="POST")
-    def generate(self, item: dict):
-        """
-        Generate speech.
-        Input: {
-            "text": "Text to speak",
-            "ref_audio": "base64_string" (Optional),
-            "ref_text": "Transcript of ref audio" (Optional)
-        }
-        Output: WAV audio bytes
-        """
-        import base64
-        import tempfile
-        import soundfile as sf
-        import numpy as np
+        self.warmup()
+
+    def warmup(self):
+        """Synthesize a short sentence with the default voice so the first request is fast."""
+        import time
+
+        self.warmup_ms = []
+        self.warmup_error = None
+        try:
+            for _ in range(WARMUP_RUNS):
+                start = time.perf_counter()
+                self._synthesize(WARMUP_TEXT, self.default_ref_path, self.default_ref_text)
+                self.warmup_ms.append(round((time.perf_counter() - start) * 1000, 1))
+            self.warm = True
+            print(f"🔥 Warm-up done: {self.warmup_ms} ms")
+        except Exception as e:
+            self.warm = False
+            self.warmup_error = str(e)
+            print(f"⚠️ Warm-up failed: {e}")
+
+    def _synthesize(self, text: str, ref_path: str, ref_text: str, n_steps: int = DEFAULT_N_STEPS) -> bytes:
+        """Run the model and return 24kHz WAV bytes."""
+        import inspect
         import io
-        import os
+        import numpy as np
+        import soundfile as sf
         import torch
 
-        text = item.get("text")
+        print(f"🗣 Generating TTS for: '{text}' using ref: {ref_path}")
+
+        # Generate speech
+        # Model signature: (text, ref_audio_path, ref_text)
+        # Note: The model forward might return raw audio array.
+
+        # Since custom code, assuming it adheres to README usage:
+        # audio = model(text, ref_audio_path=..., ref_text=...)
+
+        sig = inspect.signature(self.model.forward)
+        print(f"🔎 Model signature: {sig}")
+
+        # Try to use n_steps if available in signature
+        kwargs = {}
+        if "n_steps" in sig.parameters:
+            kwargs["n_steps"] = n_steps
+            print(f"🚀 Using n_steps={kwargs['n_steps']}")
+        elif "num_inference_steps" in sig.parameters:
+            kwargs["num_inference_steps"] = n_steps
+            print(f"🚀 Using num_inference_steps={kwargs['num_inference_steps']}")
+
+        with self.gpu_lock, torch.no_grad():
+            audio_out = self.model(
+                text,
+                ref_audio_path=ref_path,
+                ref_text=ref_text,
+                **kwargs
+            )
+
+        # Convert to numpy and save to bytes
+        # README says: if audio.dtype == np.int16 ... conversion logic
+
+        if hasattr(audio_out, "cpu"):
+            audio_out = audio_out.cpu().numpy()
+
+        if isinstance(audio_out, tuple):
+             # Some models return (sample_rate, audio) or similar using Pipeline?
+             # Custom AutoModel usually returns the output of forward().
+             # Based on README: audio = model(...) returns the array directly.
+             pass
+
+        # Conversion logic from README
+        if audio_out.dtype == np.int16:
+            audio_out = audio_out.astype(np.float32) / 32768.0
+
+        # Write to BytesIO
+        buffer = io.BytesIO()
+        sf.write(buffer, audio_out, 24000, format='WAV')
+        return buffer.getvalue()
+
+    def _generate_with_ref(self, text: str, ref_audio: bytes | None, ref_text: str | None, n_steps: int):
+        """Resolve the reference voice (custom bytes or default) and synthesize."""
+        import os
+        import tempfile
+        from fastapi import HTTPException
+        from fastapi.responses import Response
+
         if not text:
-            from fastapi import HTTPException
             raise HTTPException(status_code=400, detail="Text is required")
 
-        ref_audio_b64 = item.get("ref_audio")
-        ref_text = item.get("ref_text")
-
         # Determine reference inputs
         temp_ref_file = None
-        
-        if ref_audio_b64:
+
+        if ref_audio:
             # User provided custom reference
             if not ref_text:
-                 from fastapi import HTTPException
                  raise HTTPException(status_code=400, detail="ref_text is required when providing ref_audio")
-            
-            try:
-                audio_bytes = base64.b64decode(ref_audio_b64)
-                # Create temp file
-                fd, temp_ref_path = tempfile.mkstemp(suffix=".wav")
-                os.write(fd, audio_bytes)
-                os.close(fd)
-                
-                res_ref_path = temp_ref_path
-                res_ref_text = ref_text
-                temp_ref_file = temp_ref_path  # Mark for cleanup
-            except Exception as e:
-                from fastapi import HTTPException
-                raise HTTPException(status_code=400, detail=f"Invalid ref_audio: {e}")
+
+            # The model takes a path, so the reference goes to a temp file
+            fd, temp_ref_path = tempfile.mkstemp(suffix=".wav")
+            os.write(fd, ref_audio)
+            os.close(fd)
+
+            res_ref_path = temp_ref_path
+            res_ref_text = ref_text
+            temp_ref_file = temp_ref_path  # Mark for cleanup
         else:
             # Use default
             res_ref_path = self.default_ref_path
             res_ref_text = self.default_ref_text
             if not os.path.exists(res_ref_path):
-                 from fastapi import HTTPException
                  raise HTTPException(status_code=500, detail="Default reference audio missing on server")
 
-        print(f"🗣 Generating TTS for: '{text}' using ref: {res_ref_path}")
-
         try:
-            # Generate speech
-            # Model signature: (text, ref_audio_path, ref_text)
-            # Note: The model forward might return raw audio array.
-            
-            # Since custom code, assuming it adheres to README usage:
-            # audio = model(text, ref_audio_path=..., ref_text=...)
-            
-            import inspect
-            sig = inspect.signature(self.model.forward)
-            print(f"🔎 Model signature: {sig}")
-            
-            # Try to use n_steps if available in signature
-            kwargs = {}
-            if "n_steps" in sig.parameters:
-                kwargs["n_steps"] = item.get("n_steps", 16) # Default to 16 for speed?
-                print(f"🚀 Using n_steps={kwargs['n_steps']}")
-            elif "num_inference_steps" in sig.parameters:
-                kwargs["num_inference_steps"] = item.get("n_steps", 16)
-                print(f"🚀 Using num_inference_steps={kwargs['num_inference_steps']}")
-                
-            with torch.no_grad():
-                audio_out = self.model(
-                    text,
-                    ref_audio_path=res_ref_path,
-                    ref_text=res_ref_text,
-                    **kwargs
-                )
-
-            # Convert to numpy and save to bytes
-            # README says: if audio.dtype == np.int16 ... conversion logic
-            
-            if hasattr(audio_out, "cpu"):
-                audio_out = audio_out.cpu().numpy()
-            
-            if isinstance(audio_out, tuple):
-                 # Some models return (sample_rate, audio) or similar using Pipeline?
-                 # Custom AutoModel usually returns the output of forward().
-                 # Based on README: audio = model(...) returns the array directly.
-                 pass
-
-            # Conversion logic from README
-            if audio_out.dtype == np.int16:
-                audio_out = audio_out.astype(np.float32) / 32768.0
-            
-            # Write to BytesIO
-            buffer = io.BytesIO()
-            sf.write(buffer, audio_out, 24000, format='WAV')
-            buffer.seek(0)
-            wav_bytes = buffer.read()
+            wav_bytes = self._synthesize(text, res_ref_path, res_ref_text, n_steps)
 
             # Return as proper binary response
-            from fastapi.responses import Response
             return Response(content=wav_bytes, media_type="audio/wav")
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            from fastapi import HTTPException
             raise HTTPException(status_code=500, detail=str(e))
         finally:
             # Cleanup temp file
             if temp_ref_file and os.path.exists(temp_ref_file):
                 os.remove(temp_ref_file)
 
+    @modal.web_endpoint(method="POST")
+    def generate(self, item: dict):
+        """
+        Generate speech.
+        Input: {
+            "text": "Text to speak",
+            "ref_audio": "base64_string" (Optional),
+            "ref_text": "Transcript of ref audio" (Optional),
+            "n_steps": 16 (Optional, 1-64)
+        }
+        Output: WAV audio bytes
+        """
+        import base64
+        from fastapi import HTTPException
+
+        ref_audio = None
+        if item.get("ref_audio"):
+            try:
+                ref_audio = base64.b64decode(item["ref_audio"])
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Invalid ref_audio: {e}")
+
+        n_steps = parse_n_steps(item.get("n_steps"))
+        return self._generate_with_ref(item.get("text"), ref_audio, item.get("ref_text"), n_steps)
+
+    @modal.web_endpoint(method="POST")
+    async def generate_raw(self, request: Request):
+        """
+        Generate speech with a binary reference clip (no base64).
+        Input: query ?text=...&ref_text=...&n_steps=16,
+               body = reference WAV bytes (Optional, application/octet-stream)
+        Output: WAV audio bytes
+        """
+        import asyncio
+
+        params = request.query_params
+        n_steps = parse_n_steps(params.get("n_steps"))
+        ref_audio = await request.body()
+        # Off the event loop, so /ready is answered while this waits for the GPU
+        return await asyncio.to_thread(
+            self._generate_with_ref,
+            params.get("text"),
+            ref_audio or None,
+            params.get("ref_text"),
+            n_steps,
+        )
+
+    @modal.web_endpoint(method="GET")
+    def ready(self):
+        """Readiness: 200 once warm-up inference has run, 503 otherwise."""
+        from fastapi.responses import JSONResponse
+
+        return JSONResponse(
+            status_code=200 if self.warm else 503,
+            content={
+                "ready": self.warm,
+                "model": MODEL_ID,
+                "load_s": self.load_s,
+                "warmup_ms": self.warmup_ms,
+                "warmup_error": self.warmup_error,
+            },
+        )
+
 
 @app.local_entrypoint()
 def main():
     print("🚀 IndicF5 TTS Service deployed!")
+    print("📍 Endpoints: generate (JSON), generate_raw (binary reference audio), ready (GET)")
@@ -0,0 +1,851 @@
+"""
+Modal deployment for IndicTrans2 Translation, both directions in one service.
+Models: ai4bharat/indictrans2-indic-en-1B (Indic → English)
+        ai4bharat/indictrans2-en-indic-1B (English → Indic)
+
+Every turn translates Indic → English and then English → Indic, so both
+models live in the same container (one GPU, one cold start, one idle
+timeout) behind a single /translate with a `direction` field. Requests for
+both directions share one batching queue and one IndicProcessor.
+
+Deploy (GPU service IndicTrans2Service on Hugging Face transformers + CPU
+service IndicTrans2CT2Service on CTranslate2 INT8):
+    modal deploy src/modal/modal_translation.py
+
+Benchmark latency and sentences/s (GPU HF vs CPU CTranslate2 INT8 vs CPU HF):
+    modal run src/modal/modal_translation.py::benchmark
+
+Test locally:
+    modal serve src/modal/modal_translation.py
+
+Note: Models are downloaded (and converted to CTranslate2) during deploy
+(image build) for fast cold starts.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import modal
+
+app = modal.App("indictrans2")
+
+# Directions -> model IDs
+MODELS = {
+    "indic_en": "ai4bharat/indictrans2-indic-en-1B",
+    "en_indic": "ai4bharat/indictrans2-en-indic-1B",
+}
+# Models stored in image (HF checkpoint + CTranslate2 conversion per direction)
+MODEL_DIRS = {direction: f"/model/{direction}" for direction in MODELS}
+CT2_DIRS = {direction: f"/model-ct2/{direction}" for direction in MODELS}
+CT2_QUANTIZATION = "int8"  # Weight type stored by the converter
+
+ENGLISH = "eng_Latn"
+DEFAULT_INDIC_LANG = "kan_Knda"  # Default: Kannada
+
+
+def download_models():
+    """Download both models during image build for fast cold starts."""
+    from huggingface_hub import snapshot_download, login
+
+    # Login with HF token
+    hf_token = os.environ.get("HF_TOKEN")
+    if hf_token:
+        login(token=hf_token)
+
+    for direction, model_id in MODELS.items():
+        print(f"📥 Downloading {model_id}...")
+        snapshot_download(
+            repo_id=model_id,
+            local_dir=MODEL_DIRS[direction],
+            local_dir_use_symlinks=False,
+        )
+        print(f"✅ Model downloaded to {MODEL_DIRS[direction]}")
+
+
+def convert_ct2():
+    """Convert both models to CTranslate2 with INT8 weights during image build."""
+    import ctranslate2
+    import torch
+    from ctranslate2.converters.transformers import M2M100Loader
+    from ctranslate2.specs import common_spec, transformer_spec
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    class IndicTransConverter(ctranslate2.converters.Converter):
+        """IndicTrans2 has the M2M100 layer layout, plus separate vocabularies."""
+
+        def __init__(self, model_dir: str):
+            self.model_dir = model_dir
+
+        def _load(self):
+            model = AutoModelForSeq2SeqLM.from_pretrained(
+                self.model_dir, trust_remote_code=True, torch_dtype=torch.float32
+            )
+            tokenizer = AutoTokenizer.from_pretrained(self.model_dir, trust_remote_code=True)
+            config = model.config
+
+            spec = transformer_spec.TransformerSpec.from_config(
+                (config.encoder_layers, config.decoder_layers),
+                config.encoder_attention_heads,
+                pre_norm=config.encoder_normalize_before,
+                activation=common_spec.Activation.GELU
+                if config.activation_function == "gelu"
+                else common_spec.Activation.RELU,
+                layernorm_embedding=config.layernorm_embedding,
+            )
+            loader = M2M100Loader()
+            loader.set_encoder(spec.encoder, model.model.encoder)
+            loader.set_decoder(spec.decoder, model.model.decoder)
+            loader.set_linear(spec.decoder.projection, model.lm_head)
+
+            # Vocabularies in id order (the HF tokenizer's ids index them at runtime)
+            source = sorted(tokenizer.encoder, key=tokenizer.encoder.get)
+            target = sorted(tokenizer.decoder, key=tokenizer.decoder.get)
+            spec.register_source_vocabulary(source)
+            spec.register_target_vocabulary(target)
+            spec.config.bos_token = "<s>"
+            spec.config.eos_token = "</s>"
+            spec.config.unk_token = "<unk>"
+            spec.config.decoder_start_token = target[config.decoder_start_token_id]
+            return spec
+
+    for direction in MODELS:
+        print(f"🔄 Converting {MODEL_DIRS[direction]} to CTranslate2 ({CT2_QUANTIZATION})...")
+        IndicTransConverter(MODEL_DIRS[direction]).convert(
+            CT2_DIRS[direction], quantization=CT2_QUANTIZATION, force=True
+        )
+        print(f"✅ CTranslate2 model saved to {CT2_DIRS[direction]}")
+
+
+# Container image with all dependencies
+# Models are downloaded during image build
+image = (
+    modal.Image.debian_slim(python_version="3.10")
+    .apt_install("git")
+    .pip_install(
+        "torch",
+        "ctranslate2",
+        "transformers==4.38.2",  # Pinned for compatibility with custom model code
+        "indictranstoolkit",
+        "sentencepiece",
+        "protobuf",
+        "huggingface_hub",
+        "fastapi[standard]",
+        "pydantic",
+    )
+    .env({"HF_HOME": "/root/.cache/huggingface"})
+    .run_function(
+        download_models,
+        secrets=[modal.Secret.from_name("huggingface-secret")],
+    )
+    .run_function(convert_ct2)
+)
+
+
+MINUTES = 60  # seconds
+
+# Warm-up at container start: a representative batch per direction, run
+# WARMUP_RUNS times (the first pays CUDA setup and kernel selection)
+WARMUP_SENTENCES = {
+    "indic_en": [
+        "ನಮಸ್ಕಾರ",
+        "ಇಂದು ಬೆಂಗಳೂರಿನಲ್ಲಿ ಹವಾಮಾನ ಹೇಗಿದೆ?",
+        "ನನಗೆ ಹತ್ತಿರದ ಒಳ್ಳೆಯ ಆಸ್ಪತ್ರೆಯ ಬಗ್ಗೆ ಮಾಹಿತಿ ಬೇಕು, ದಯವಿಟ್ಟು ವಿಳಾಸ ಮತ್ತು ಫೋನ್ ನಂಬರ್ ತಿಳಿಸಿ.",
+    ],
+    "en_indic": [
+        "Hello",
+        "The weather in Bengaluru is pleasant today.",
+        "Here is the address and phone number of the nearest hospital, which is open all day and has an emergency ward.",
+    ],
+}
+WARMUP_RUNS = 2
+
+# Batching: sentences from requests arriving within BATCH_MAX_WAIT_MS of each
+# other (or while the previous generate runs) are translated together, sorted
+# by token length into buckets whose longest sentence is at most
+# BATCH_BUCKET_RATIO times the shortest and whose padded size stays under
+# BATCH_MAX_TOKENS (beam search multiplies activation memory by num_beams)
+BATCH_MAX_SIZE = 32
+BATCH_MAX_TOKENS = 4096
+BATCH_MAX_WAIT_MS = 5
+BATCH_BUCKET_RATIO = 1.5
+MAX_CONCURRENT_INPUTS = 64  # Two requests per turn now land on this service
+
+# Decoding profiles (same for both engines), chosen per request. Beam width
+# is the main cost of generate: realtime is greedy for the voice path,
+# quality is the original beam-5 search.
+DECODING_PROFILES = {
+    "realtime": {"num_beams": 1, "early_stopping": False},
+    "balanced": {"num_beams": 3, "early_stopping": True},
+    "quality": {"num_beams": 5, "early_stopping": False},
+}
+DEFAULT_PROFILE = "quality"
+# Output length cap per batch: MAX_LENGTH_RATIO[direction] x the longest input
+# (in tokens) + MAX_LENGTH_EXTRA, never above MAX_LENGTH. Indic scripts take
+# more tokens than the same sentence in English.
+MAX_LENGTH = 256
+MAX_LENGTH_RATIO = {"indic_en": 1.5, "en_indic": 2.0}
+MAX_LENGTH_EXTRA = 16
+
+# CPU deployment (CTranslate2): threads per container (matches the reserved
+# cores) and compute type (INT8 matmuls on the INT8 weights)
+CPU_NUM_THREADS = 8
+CT2_COMPUTE_TYPE = "int8"
+# CTranslate2 has no early_stopping flag: its beam search stops once
+# beam_size * patience hypotheses have finished. patience=1 is HF's
+# early_stopping=True; without early stopping HF keeps searching after the
+# first num_beams hypotheses finish, which CT2_SEARCH_PATIENCE approximates.
+CT2_SEARCH_PATIENCE = 2
+
+# Engine check at CPU warm-up: CTranslate2 output is compared with the HF
+# fp32 engine on WARMUP_SENTENCES for every profile (word-level similarity
+# after the same IndicProcessor postprocess). INT8 weights may change a word
+# here and there; a mean below ENGINE_CHECK_MIN_SIMILARITY means the engines
+# disagree and the container does not report ready.
+ENGINE_CHECK = True
+ENGINE_CHECK_MIN_SIMILARITY = 0.75
+
+
+def max_length_for(input_tokens: int, direction: str) -> int:
+    """Generation length cap for a batch whose longest input has input_tokens tokens."""
+    return min(MAX_LENGTH, int(MAX_LENGTH_RATIO[direction] * input_tokens) + MAX_LENGTH_EXTRA)
+
+
+class HFEngine:
+    """Hugging Face transformers generate (fp16 on GPU, fp32 on CPU)."""
+
+    name = "hf"
+
+    def __init__(self, direction: str, device: str = None):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        self.direction = direction
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_DIRS[direction], trust_remote_code=True)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(
+            MODEL_DIRS[direction],
+            trust_remote_code=True,
+            torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+        ).to(self.device)
+
+    def token_lengths(self, batch: list[str]) -> list[int]:
+        """Source length in tokens of each preprocessed sentence."""
+        return [len(ids) for ids in self.tokenizer(batch, truncation=True)["input_ids"]]
+
+    def generate(self, batch: list[str], profile: str = DEFAULT_PROFILE) -> list[str]:
+        """Translate preprocessed sentences (one padded batch)."""
+        import torch
+
+        # Tokenize
+        inputs = self.tokenizer(
+            batch,
+            truncation=True,
+            padding="longest",
+            return_tensors="pt",
+            return_attention_mask=True,
+        ).to(self.device)
+
+        # Generate translations
+        decoding = DECODING_PROFILES[profile]
+        with torch.no_grad():
+            generated_tokens = self.model.generate(
+                **inputs,
+                use_cache=True,
+                min_length=0,
+                max_length=max_length_for(inputs["input_ids"].shape[1], self.direction),
+                num_beams=decoding["num_beams"],
+                early_stopping=decoding["early_stopping"],
+                num_return_sequences=1,
+            )
+
+        # Decode tokens
+        return self.tokenizer.batch_decode(
+            generated_tokens,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+
+class CT2Engine:
+    """CTranslate2 translator over the model converted at image build."""
+
+    name = "ct2"
+
+    def __init__(
+        self,
+        direction: str,
+        device: str = "cpu",
+        compute_type: str = CT2_COMPUTE_TYPE,
+        threads: int = CPU_NUM_THREADS,
+    ):
+        import ctranslate2
+        from transformers import AutoTokenizer
+
+        self.direction = direction
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_DIRS[direction], trust_remote_code=True)
+        self.translator = ctranslate2.Translator(
+            CT2_DIRS[direction],
+            device=device,
+            compute_type=compute_type,
+            inter_threads=1,  # One batch at a time (the batcher owns the models)
+            intra_threads=threads,
+        )
+        # Token ids from the HF tokenizer map onto the converted vocabularies
+        # (the converter wrote both in the tokenizer's id order)
+        with open(os.path.join(CT2_DIRS[direction], "source_vocabulary.json")) as f:
+            self.source_vocab = json.load(f)
+        with open(os.path.join(CT2_DIRS[direction], "target_vocabulary.json")) as f:
+            self.target_ids = {token: i for i, token in enumerate(json.load(f))}
+        self.unk_id = self.target_ids["<unk>"]
+
+    def token_lengths(self, batch: list[str]) -> list[int]:
+        """Source length in tokens of each preprocessed sentence."""
+        return [len(ids) for ids in self.tokenizer(batch, truncation=True)["input_ids"]]
+
+    def generate(self, batch: list[str], profile: str = DEFAULT_PROFILE) -> list[str]:
+        """Translate preprocessed sentences (one batch)."""
+        ids = self.tokenizer(batch, truncation=True)["input_ids"]
+        decoding = DECODING_PROFILES[profile]
+        results = self.translator.translate_batch(
+            [[self.source_vocab[i] for i in seq] for seq in ids],
+            beam_size=decoding["num_beams"],
+            patience=1 if decoding["early_stopping"] else CT2_SEARCH_PATIENCE,
+            max_decoding_length=max_length_for(max(len(seq) for seq in ids), self.direction),
+        )
+
+        # Decode through the HF tokenizer, as HFEngine does
+        return self.tokenizer.batch_decode(
+            [[self.target_ids.get(token, self.unk_id) for token in r.hypotheses[0]] for r in results],
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+
+class TranslationBatcher:
+    """
+    Batches sentences from concurrent translation requests into generate calls.
+
+    Requests for both directions queue on the event loop; a single worker
+    thread owns the models. Each time the worker is free it takes every
+    queued sentence, groups them by direction, language pair and profile,
+    sorts each group by token length and runs one generate per length
+    bucket, so short sentences are not padded to the longest one in flight.
+    Requests that arrive during a generate join the next round.
+    """
+
+    def __init__(
+        self,
+        engines: dict,
+        processor,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_batch_tokens: int = BATCH_MAX_TOKENS,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        bucket_ratio: float = BATCH_BUCKET_RATIO,
+    ):
+        self.engines = engines  # direction -> engine
+        self.processor = processor
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait_ms = max_wait_ms
+        self.bucket_ratio = bucket_ratio
+
+        self._pending: list = []  # (sentences, direction, src_lang, tgt_lang, profile, future)
+        self._wakeup = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate")
+
+        # Stats
+        self.requests = 0
+        self.sentences = 0
+        self.rounds = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.padded_tokens = 0
+        self.input_tokens = 0
+        self.generate_ms = 0.0
+        self.requests_by_direction = {direction: 0 for direction in engines}
+
+    async def submit(
+        self,
+        sentences: list[str],
+        direction: str,
+        src_lang: str,
+        tgt_lang: str,
+        profile: str = DEFAULT_PROFILE,
+    ) -> tuple[list[str], float]:
+        """
+        Queue a request's sentences and wait for their translations (same order).
+
+        Returns (translations, generation_ms), where generation_ms is the
+        generate time of the round the request ran in (queueing excluded).
+        """
+        if not sentences:
+            return [], 0.0
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((sentences, direction, src_lang, tgt_lang, profile, future))
+        self._wakeup.set()
+        return await future
+
+    def stats(self) -> dict:
+        """Batching statistics since the container started."""
+        return {
+            "requests": self.requests,
+            "requests_by_direction": self.requests_by_direction,
+            "sentences": self.sentences,
+            "rounds": self.rounds,
+            "batches": self.batches,
+            "mean_batch_size": self.sentences / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": sum(len(item[0]) for item in self._pending),
+            "padding_fraction": (
+                self.padded_tokens / (self.padded_tokens + self.input_tokens)
+                if self.input_tokens else 0.0
+            ),
+            "mean_generate_ms": self.generate_ms / self.batches if self.batches else 0.0,
+        }
+
+    def _buckets(self, lengths: list[int]) -> list[list[int]]:
+        """Split sentence indices into batches of similar token length."""
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        buckets = []
+        bucket = []
+        for i in order:
+            if bucket and (
+                len(bucket) >= self.max_batch_size
+                or lengths[i] > self.bucket_ratio * lengths[bucket[0]]
+                or (len(bucket) + 1) * lengths[i] > self.max_batch_tokens
+            ):
+                buckets.append(bucket)
+                bucket = []
+            bucket.append(i)
+        if bucket:
+            buckets.append(bucket)
+        return buckets
+
+    def _infer(
+        self,
+        sentences: list[str],
+        direction: str,
+        src_lang: str,
+        tgt_lang: str,
+        profile: str = DEFAULT_PROFILE,
+    ) -> tuple[list[str], float]:
+        """Translate sentences of one direction, language pair and profile on the worker thread."""
+        engine = self.engines[direction]
+
+        # Preprocess the whole group at once: IndicProcessor keeps per-sentence
+        # placeholder state that postprocess_batch consumes in the same order
+        batch = self.processor.preprocess_batch(sentences, src_lang=src_lang, tgt_lang=tgt_lang)
+        lengths = engine.token_lengths(batch)
+
+        decoded = [""] * len(batch)
+        generate_ms = 0.0
+        for bucket in self._buckets(lengths):
+            start = time.perf_counter()
+            texts = engine.generate([batch[i] for i in bucket], profile)
+            generate_ms += (time.perf_counter() - start) * 1000
+            for i, text in zip(bucket, texts):
+                decoded[i] = text
+
+            bucket_lengths = [lengths[i] for i in bucket]
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(bucket))
+            self.input_tokens += sum(bucket_lengths)
+            self.padded_tokens += len(bucket) * max(bucket_lengths) - sum(bucket_lengths)
+
+        self.generate_ms += generate_ms
+
+        # Postprocess translations
+        return self.processor.postprocess_batch(decoded, lang=tgt_lang), generate_ms
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Let concurrent requests join this round
+            await asyncio.sleep(self.max_wait_ms / 1000)
+            self._wakeup.clear()
+
+            items = [item for item in self._pending if not item[5].done()]
+            self._pending = []
+            groups: dict = {}
+            for item in items:
+                groups.setdefault(item[1:5], []).append(item)
+
+            self.rounds += 1
+            for key, group in groups.items():
+                sentences = [sentence for item in group for sentence in item[0]]
+                try:
+                    translations, generate_ms = await loop.run_in_executor(
+                        self._executor, self._infer, sentences, *key
+                    )
+                except Exception as e:
+                    for item in group:
+                        if not item[5].done():
+                            item[5].set_exception(e)
+                    continue
+
+                self.requests += len(group)
+                self.requests_by_direction[key[0]] += len(group)
+                self.sentences += len(sentences)
+                offset = 0
+                for item in group:
+                    n = len(item[0])
+                    if not item[5].done():
+                        item[5].set_result((translations[offset:offset + n], generate_ms))
+                    offset += n
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def language_pair(direction: str, lang: str) -> tuple[str, str]:
+    """(src_lang, tgt_lang) for a direction, given the Indic side's language."""
+    return (lang, ENGLISH) if direction == "indic_en" else (ENGLISH, lang)
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity of two translations (1.0 = identical)."""
+    from difflib import SequenceMatcher
+
+    return SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+class IndicTrans2Base:
+    """IndicTrans2 Translation service (both directions) with FastAPI web endpoints (GPU and CPU deployments)."""
+
+    def create_engine(self, direction: str):
+        """Engine this deployment serves a direction with."""
+        return HFEngine(direction)
+
+    def benchmark_engines(self, direction: str) -> dict:
+        """Engines that benchmark() compares for a direction: name -> engine."""
+        engine = self.engines[direction]
+        return {f"hf_{engine.device}": engine}
+
+    def check_engines(self) -> dict | None:
+        """Compare the serving engine with a reference at warm-up (None = no check)."""
+        return None
+
+    def translate_with(self, engine, sentences: list[str], direction: str, profile: str) -> list[str]:
+        """Translate sentences with a given engine (one batch, outside the batcher)."""
+        src_lang, tgt_lang = language_pair(direction, DEFAULT_INDIC_LANG)
+        batch = self.processor.preprocess_batch(sentences, src_lang=src_lang, tgt_lang=tgt_lang)
+        return self.processor.postprocess_batch(engine.generate(batch, profile), lang=tgt_lang)
+
+    @modal.enter()
+    def load_model(self):
+        """Load both models from pre-downloaded locations (fast cold start)."""
+        from IndicTransToolkit.processor import IndicProcessor
+
+        load_start = time.perf_counter()
+        self.engines = {}
+        for direction in MODELS:
+            print(f"🔄 Loading model from {MODEL_DIRS[direction]}...")
+            self.engines[direction] = self.create_engine(direction)
+
+        # One IndicProcessor for preprocessing/postprocessing in both directions
+        self.processor = IndicProcessor(inference=True)
+
+        self.batcher = TranslationBatcher(self.engines, self.processor)
+        self.load_s = round(time.perf_counter() - load_start, 2)
+        engine = self.engines["indic_en"]
+        print(f"✅ IndicTrans2 models loaded successfully! (engine: {engine.name} on {engine.device})")
+
+        self.warmup()
+
+    def warmup(self):
+        """Translate a representative batch per direction so the first request is fast."""
+        self.warmup_ms = []
+        self.warmup_error = None
+        self.engine_check = None
+        try:
+            for _ in range(WARMUP_RUNS):
+                start = time.perf_counter()
+                # Same call the batcher makes, once per direction and decoding profile
+                for direction, sentences in WARMUP_SENTENCES.items():
+                    src_lang, tgt_lang = language_pair(direction, DEFAULT_INDIC_LANG)
+                    for profile in DECODING_PROFILES:
+                        self.batcher._infer(sentences, direction, src_lang, tgt_lang, profile)
+                self.warmup_ms.append(round((time.perf_counter() - start) * 1000, 1))
+            print(f"🔥 Warm-up done: {self.warmup_ms} ms")
+
+            self.engine_check = self.check_engines()
+            if self.engine_check is not None and not self.engine_check["passed"]:
+                raise RuntimeError(f"Engine check failed: {self.engine_check['similarity']}")
+            self.warm = True
+        except Exception as e:
+            self.warm = False
+            self.warmup_error = str(e)
+            print(f"⚠️ Warm-up failed: {e}")
+
+    @modal.asgi_app()
+    def web_app(self):
+        """FastAPI web application with multiple endpoints."""
+        from fastapi import FastAPI, HTTPException
+        from fastapi.responses import JSONResponse
+        from pydantic import BaseModel
+
+        web_app = FastAPI(
+            title="IndicTrans2 Translation API",
+            description="Indic ↔ English Translation API for 22 Indian languages",
+            version="1.0.0",
+        )
+
+        class TranslateRequest(BaseModel):
+            text: str | list[str]  # Single sentence or batch
+            direction: str  # "indic_en" or "en_indic"
+            lang: str = DEFAULT_INDIC_LANG  # Indic side: source for indic_en, target for en_indic
+            profile: str = DEFAULT_PROFILE  # Decoding profile (see DECODING_PROFILES)
+
+        class TranslateResponse(BaseModel):
+            translations: list[str]
+            direction: str
+            src_lang: str
+            tgt_lang: str
+            profile: str
+            generation_ms: float
+
+        class HealthResponse(BaseModel):
+            status: str
+            models: dict[str, str]
+            supported_languages: list[str]
+
+        # FLORES-200 language codes for IndicTrans2
+        SUPPORTED_LANGUAGES = {
+            "asm_Beng": "Assamese",
+            "ben_Beng": "Bengali",
+            "brx_Deva": "Bodo",
+            "doi_Deva": "Dogri",
+            "guj_Gujr": "Gujarati",
+            "hin_Deva": "Hindi",
+            "kan_Knda": "Kannada",
+            "kas_Arab": "Kashmiri (Arabic)",
+            "kas_Deva": "Kashmiri (Devanagari)",
+            "kok_Deva": "Konkani",
+            "mai_Deva": "Maithili",
+            "mal_Mlym": "Malayalam",
+            "mni_Beng": "Manipuri (Bengali)",
+            "mni_Mtei": "Manipuri (Meitei)",
+            "mar_Deva": "Marathi",
+            "npi_Deva": "Nepali",
+            "ory_Orya": "Odia",
+            "pan_Guru": "Punjabi",
+            "san_Deva": "Sanskrit",
+            "sat_Olck": "Santali",
+            "snd_Arab": "Sindhi (Arabic)",
+            "snd_Deva": "Sindhi (Devanagari)",
+            "tam_Taml": "Tamil",
+            "tel_Telu": "Telugu",
+            "urd_Arab": "Urdu",
+        }
+
+        @web_app.get("/health", response_model=HealthResponse)
+        async def health():
+            """Health check endpoint."""
+            return HealthResponse(
+                status="healthy",
+                models=MODELS,
+                supported_languages=list(SUPPORTED_LANGUAGES.keys()),
+            )
+
+        @web_app.get("/ready")
+        async def ready():
+            """Readiness: 200 once warm-up inference has run, 503 otherwise."""
+            return JSONResponse(
+                status_code=200 if self.warm else 503,
+                content={
+                    "ready": self.warm,
+                    "models": MODELS,
+                    "engine": self.engines["indic_en"].name,
+                    "load_s": self.load_s,
+                    "warmup_ms": self.warmup_ms,
+                    "warmup_error": self.warmup_error,
+                    "engine_check": self.engine_check,
+                },
+            )
+
+        @web_app.post("/translate", response_model=TranslateResponse)
+        async def translate(request: TranslateRequest):
+            """Translate Indic text to English (indic_en) or English text to Indic (en_indic)."""
+            try:
+                if request.direction not in MODELS:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Unknown direction: {request.direction}. Supported: {list(MODELS)}"
+                    )
+
+                # Validate the Indic side's language
+                if request.lang not in SUPPORTED_LANGUAGES:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Unsupported language: {request.lang}. Supported: {list(SUPPORTED_LANGUAGES.keys())}"
+                    )
+
+                if request.profile not in DECODING_PROFILES:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Unknown profile: {request.profile}. Supported: {list(DECODING_PROFILES)}"
+                    )
+
+                # Handle single string or list
+                sentences = [request.text] if isinstance(request.text, str) else request.text
+                src_lang, tgt_lang = language_pair(request.direction, request.lang)
+
+                # Batched with concurrent requests (both directions share the queue)
+                translations, generation_ms = await self.batcher.submit(
+                    sentences, request.direction, src_lang, tgt_lang, profile=request.profile
+                )
+
+                return TranslateResponse(
+                    translations=translations,
+                    direction=request.direction,
+                    src_lang=src_lang,
+                    tgt_lang=tgt_lang,
+                    profile=request.profile,
+                    generation_ms=round(generation_ms, 1),
+                )
+
+            except HTTPException:
+                raise
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                raise HTTPException(status_code=500, detail=f"{e}")
+
+        @web_app.get("/stats")
+        async def stats():
+            """Batching statistics (batch sizes, queue depth, padding)."""
+            return self.batcher.stats()
+
+        @web_app.get("/languages")
+        async def list_languages():
+            """Get list of supported Indic language codes with names."""
+            return {"languages": SUPPORTED_LANGUAGES, "english": f"{ENGLISH} (English)"}
+
+        return web_app
+
+    @modal.method()
+    def benchmark(self, repeats: int = 3, profile: str = DEFAULT_PROFILE) -> dict:
+        """
+        Latency and throughput of each engine and direction in this container:
+        best-of-repeats time to translate one sentence (median over the
+        sentences) and sentences/s for the whole list as one batch.
+        """
+        results = {}
+        for direction, warmup_sentences in WARMUP_SENTENCES.items():
+            sentences = warmup_sentences * 4
+            src_lang, tgt_lang = language_pair(direction, DEFAULT_INDIC_LANG)
+            for name, engine in self.benchmark_engines(direction).items():
+                batch = self.processor.preprocess_batch(sentences, src_lang=src_lang, tgt_lang=tgt_lang)
+                engine.generate(batch[:1], profile)  # Warm-up
+
+                single = []
+                for text in batch:
+                    single.append(min(_timed(engine.generate, [text], profile) for _ in range(repeats)))
+                batch_s = min(_timed(engine.generate, batch, profile) for _ in range(repeats))
+
+                # Full batch, so postprocess consumes exactly the state preprocess queued
+                translations = self.processor.postprocess_batch(engine.generate(batch, profile), lang=tgt_lang)
+                results[f"{direction}/{name}"] = {
+                    "sentences": len(batch),
+                    "latency_ms": round(sorted(single)[len(single) // 2] * 1000, 1),
+                    "sentences_per_s": round(len(batch) / batch_s, 2),
+                    "sample": translations[0],
+                }
+        return results
+
+
+@app.cls(
+    image=image,
+    gpu="A10G",  # 24GB VRAM - both 1B models at FP16 fit with room for batches
+    secrets=[modal.Secret.from_name("huggingface-secret")],
+    timeout=10 * MINUTES,
+    scaledown_window=5 * MINUTES,
+)
+@modal.concurrent(max_inputs=MAX_CONCURRENT_INPUTS)  # Concurrent requests feed the batcher
+class IndicTrans2Service(IndicTrans2Base):
+    """GPU deployment (Hugging Face transformers, fp16)."""
+
+
+@app.cls(
+    image=image,
+    cpu=CPU_NUM_THREADS,
+    memory=24576,  # Room for the fp32 HF models that the engine check and benchmark() load
+    secrets=[modal.Secret.from_name("huggingface-secret")],
+    timeout=10 * MINUTES,
+    scaledown_window=5 * MINUTES,
+)
+@modal.concurrent(max_inputs=MAX_CONCURRENT_INPUTS)
+class IndicTrans2CT2Service(IndicTrans2Base):
+    """CPU-only deployment: CTranslate2 with INT8 weights and compute."""
+
+    def create_engine(self, direction: str):
+        return CT2Engine(direction)
+
+    def hf_cpu(self, direction: str) -> HFEngine:
+        """The HF fp32 engine on the same cores (reference for the check and the benchmark)."""
+        if not hasattr(self, "_hf_cpu"):
+            self._hf_cpu = {}
+        if direction not in self._hf_cpu:
+            self._hf_cpu[direction] = HFEngine(direction, "cpu")
+        return self._hf_cpu[direction]
+
+    def benchmark_engines(self, direction: str) -> dict:
+        return {"ct2_int8": self.engines[direction], "hf_fp32": self.hf_cpu(direction)}
+
+    def check_engines(self) -> dict | None:
+        if not ENGINE_CHECK:
+            return None
+        scores = {}
+        for direction, sentences in WARMUP_SENTENCES.items():
+            for profile in DECODING_PROFILES:
+                ct2 = self.translate_with(self.engines[direction], sentences, direction, profile)
+                hf = self.translate_with(self.hf_cpu(direction), sentences, direction, profile)
+                scores[f"{direction}/{profile}"] = round(
+                    sum(similarity(a, b) for a, b in zip(ct2, hf)) / len(sentences), 3
+                )
+                if scores[f"{direction}/{profile}"] < 1.0:
+                    print(f"⚠️ CT2 vs HF ({direction}/{profile}): {ct2} vs {hf}")
+        # The reference models are only needed again by benchmark(), which reloads them
+        self._hf_cpu = {}
+
+        passed = min(scores.values()) >= ENGINE_CHECK_MIN_SIMILARITY
+        print(f"{'✅' if passed else '❌'} CT2 vs HF similarity: {scores}")
+        return {"passed": passed, "similarity": scores}
+
+
+@app.local_entrypoint()
+def benchmark(repeats: int = 3, profile: str = DEFAULT_PROFILE):
+    """
+    Compare the GPU (HF) and CPU (CTranslate2 INT8, HF fp32) paths.
+
+        modal run src/modal/modal_translation.py::benchmark --profile realtime
+    """
+    results = {
+        "gpu": IndicTrans2Service().benchmark.remote(repeats, profile),
+        "cpu": IndicTrans2CT2Service().benchmark.remote(repeats, profile),
+    }
+    print(f"{'path':<23} {'sentences':>9} {'latency_ms':>11} {'sentences/s':>12}")
+    for device, engines in results.items():
+        for name, r in engines.items():
+            print(f"{device + '/' + name:<23} {r['sentences']:>9} {r['latency_ms']:>11} {r['sentences_per_s']:>12}")
+    for device, engines in results.items():
+        for name, r in engines.items():
+            print(f"📝 {device}/{name}: {r['sample']}")
+
+
+@app.local_entrypoint()
+def main():
+    print("🚀 IndicTrans2 Translation Service (both directions) deployed!")
+    print("📍 Endpoints: /health, /ready, /stats, /languages, /translate")
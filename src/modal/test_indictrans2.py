@@ -1,19 +1,19 @@
 """
-Test script for IndicTrans2 Modal deployment.
+Test script for the IndicTrans2 Modal deployment (Indic → English).
 
 Usage:
     # 1. First deploy or serve the Modal app:
-    modal serve src/modal_indictrans2.py
+    modal serve src/modal/modal_translation.py
     
     # 2. Run this test script:
-    python src/test_indictrans2.py
+    python src/modal/test_indictrans2.py
 """
 
 import httpx
 import sys
 
 # Modal deployed URL
-BASE_URL = "https://akshaymp-1810--indictrans2-indic-en-indictrans2service-web-app.modal.run"
+BASE_URL = "https://akshaymp-1810--indictrans2-indictrans2service-web-app.modal.run"
 
 # Test sentences in different languages
 TEST_CASES = [
@@ -43,7 +43,7 @@ def test_health():
         response.raise_for_status()
         data = response.json()
         print(f"   Status: {data['status']}")
-        print(f"   Model: {data['model']}")
+        print(f"   Models: {', '.join(data['models'].values())}")
         print(f"   Languages: {len(data['supported_languages'])} supported")
         return True
     except Exception as e:
@@ -58,8 +58,8 @@ def test_languages():
         response = httpx.get(f"{BASE_URL}/languages", timeout=30.0)
         response.raise_for_status()
         data = response.json()
-        print(f"   Target: {data['target']}")
-        print(f"   Source languages: {len(data['languages'])}")
+        print(f"   English: {data['english']}")
+        print(f"   Indic languages: {len(data['languages'])}")
         for code, name in list(data['languages'].items())[:5]:
             print(f"      - {code}: {name}")
         print("      ...")
@@ -79,7 +79,7 @@ def test_translate():
         try:
             response = httpx.post(
                 f"{BASE_URL}/translate",
-                json={"text": test["text"], "src_lang": test["src_lang"]},
+                json={"text": test["text"], "direction": "indic_en", "lang": test["src_lang"]},
                 timeout=120.0,  # Long timeout for cold start
             )
             response.raise_for_status()
@@ -116,7 +116,7 @@ def test_batch_translate():
     try:
         response = httpx.post(
             f"{BASE_URL}/translate",
-            json={"text": sentences, "src_lang": "kan_Knda"},
+            json={"text": sentences, "direction": "indic_en", "lang": "kan_Knda"},
             timeout=120.0,
         )
         response.raise_for_status()
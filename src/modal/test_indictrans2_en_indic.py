@@ -3,9 +3,9 @@ import httpx
 import time
 import sys
 
-# Replace with the actual deployed URL after running modal deploy
-# Typically: https://your-username--indictrans2-en-indic-indictrans2enindicservice-web-app.modal.run
-BASE_URL = "https://akshaymp-1810--indictrans2-en-indic-indictrans2enindicse-9e3146.modal.run"
+# Replace with the actual deployed URL after running modal deploy src/modal/modal_translation.py
+# Typically: https://your-username--indictrans2-indictrans2service-web-app.modal.run
+BASE_URL = "https://akshaymp-1810--indictrans2-indictrans2service-web-app.modal.run"
 
 def test_health():
     print("\n Testing /health endpoint...")
@@ -15,7 +15,7 @@ def test_health():
         response.raise_for_status()
         data = response.json()
         print(f"   Status: {data['status']}")
-        print(f"   Model: {data['model']}")
+        print(f"   Models: {', '.join(data['models'].values())}")
         print(f"   Languages: {len(data['supported_languages'])} supported")
         return True
     except Exception as e:
@@ -28,8 +28,8 @@ def test_languages():
         response = httpx.get(f"{BASE_URL}/languages", timeout=10.0)
         response.raise_for_status()
         data = response.json()
-        print(f"   Source: {data['source']}")
-        print(f"   Target languages: {len(data['languages'])}")
+        print(f"   English: {data['english']}")
+        print(f"   Indic languages: {len(data['languages'])}")
         # Print first 5
         for code, name in list(data['languages'].items())[:5]:
             print(f"      - {code}: {name}")
@@ -53,7 +53,8 @@ def test_translate_single():
         print(f"\n   Test {idx}: {tgt} (English -> {tgt})")
         payload = {
             "text": text,
-            "tgt_lang": tgt
+            "direction": "en_indic",
+            "lang": tgt
         }
         try:
             # First request might be slow (cold start)
@@ -100,7 +101,8 @@ def test_translate_batch():
             "Thank you",
             "What is your name?"
         ],
-        "tgt_lang": "kan_Knda"
+        "direction": "en_indic",
+        "lang": "kan_Knda"
     }
     
     try:
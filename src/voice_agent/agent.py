@@ -3,11 +3,22 @@ Voice Agent Implementation
 Uses Nebius AI (Qwen) via LangChain OpenAI with Tavily Search.
 """
 import os
+import time
+from typing import AsyncIterator
 from dotenv import load_dotenv
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
 from langchain_openai import ChatOpenAI
 from langchain_tavily import TavilySearch
 from langgraph.prebuilt import create_react_agent
 
+from .events import (
+    VoiceAgentEvent,
+    AgentChunkEvent,
+    ToolCallEvent,
+    ToolResultEvent,
+    AgentEndEvent,
+)
+
 load_dotenv()
 
 # Initialize Nebius (Qwen) client via LangChain
@@ -61,9 +72,96 @@ async def run_agent(user_query: str) -> str:
         return f"Sorry, I encountered an error: {str(e)}"
 
 
+def _text(content) -> str:
+    """Text of a message's content (a string, or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, (str, dict))
+    )
+
+
+async def astream_agent(user_query: str) -> AsyncIterator[VoiceAgentEvent]:
+    """
+    Run Agent with Search capabilities, streaming its output.
+    
+    Response tokens are yielded as they are generated; tool calls and their
+    results are yielded as the agent makes them.
+    
+    Args:
+        user_query: User's question in English
+    
+    Yields:
+        AgentChunkEvent per token, ToolCallEvent/ToolResultEvent per search,
+        then AgentEndEvent with the full response, time to first token and
+        tokens/sec
+    """
+    start = time.perf_counter()
+    first_token_at = last_token_at = None
+    chunks = 0
+    usage_tokens = 0
+    response: list[str] = []
+
+    async for mode, payload in agent_executor.astream(
+        {"messages": [("user", user_query)]},
+        stream_mode=["messages", "updates"],
+    ):
+        if mode == "messages":
+            chunk, _metadata = payload
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            text = _text(chunk.content)
+            if text:
+                last_token_at = time.perf_counter()
+                first_token_at = first_token_at or last_token_at
+                chunks += 1
+                response.append(text)
+                yield AgentChunkEvent.create(text=text)
+            if chunk.usage_metadata:
+                usage_tokens += chunk.usage_metadata.get("output_tokens", 0)
+            continue
+
+        # "updates": complete messages written by the agent and tool nodes
+        for update in payload.values():
+            if not isinstance(update, dict):
+                continue
+            for message in update.get("messages", []):
+                if isinstance(message, AIMessage) and message.tool_calls:
+                    # Text streamed before a tool call is not part of the answer
+                    response = []
+                    for call in message.tool_calls:
+                        print(f"🔍 Tool call: {call['name']}({call['args']})")
+                        yield ToolCallEvent.create(id=call["id"] or "", name=call["name"], args=call["args"])
+                elif isinstance(message, ToolMessage):
+                    yield ToolResultEvent.create(
+                        tool_call_id=message.tool_call_id,
+                        name=message.name or "",
+                        result=_text(message.content),
+                    )
+
+    full_response = "".join(response).strip() or "I couldn't find an answer to that question."
+    output_tokens = usage_tokens or chunks  # One streamed chunk ≈ one token without usage data
+    ttft_ms = (first_token_at - start) * 1000 if first_token_at else None
+    decode_s = (last_token_at - first_token_at) if first_token_at else 0.0
+    tokens_per_sec = (output_tokens - 1) / decode_s if decode_s > 0 and output_tokens > 1 else None
+    if ttft_ms is not None:
+        rate = f"{tokens_per_sec:.1f} tok/s" if tokens_per_sec else "n/a"
+        print(f"🤖 Agent TTFT: {ttft_ms:.0f}ms, {output_tokens} tokens, {rate}")
+    yield AgentEndEvent.create(
+        full_response=full_response,
+        ttft_ms=ttft_ms,
+        tokens_per_sec=tokens_per_sec,
+        output_tokens=output_tokens,
+    )
+
+
 def run_agent_sync(user_query: str) -> str:
     """
     Synchronous version of run_agent for simpler usage.
+    Blocks for the whole LLM and search round trip: don't call it from the
+    server's event loop (the pipeline uses astream_agent).
     
     Args:
         user_query: User's question in English
@@ -0,0 +1,85 @@
+"""
+Shared HTTP clients for the Modal backends.
+One keep-alive (HTTP/2) connection pool per service for the whole process,
+so turns stop paying DNS + TCP + TLS setup on every request.
+"""
+import asyncio
+import time
+import httpx
+from .config import (
+    BACKENDS,
+    HTTP2_ENABLED,
+    BACKEND_CONNECT_TIMEOUT,
+    BACKEND_KEEPALIVE_EXPIRY,
+)
+
+
+class BackendClients:
+    """Process-wide registry of pooled AsyncClients, one per backend service."""
+
+    def __init__(self, backends: dict = BACKENDS):
+        self.backends = backends
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        # service -> monotonic time of its last successful response
+        self.last_response: dict[str, float] = {}
+
+    def record_activity(self, service: str):
+        """Mark a service as just answered (also used for non-HTTP traffic, e.g. WebSockets)."""
+        self.last_response[service] = time.monotonic()
+
+    def get(self, service: str) -> httpx.AsyncClient:
+        """Return the pooled client for a service (created on first use)."""
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._create(service)
+            self._clients[service] = client
+        return client
+
+    def _create(self, service: str) -> httpx.AsyncClient:
+        cfg = self.backends[service]
+        group = cfg.get("service", service)
+
+        async def record_response(response: httpx.Response):
+            if response.status_code < 500:
+                self.record_activity(group)
+
+        kwargs = dict(
+            base_url=cfg["url"],
+            timeout=httpx.Timeout(cfg["timeout"], connect=BACKEND_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_keepalive"],
+                keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY,
+            ),
+            event_hooks={"response": [record_response]},
+        )
+        try:
+            return httpx.AsyncClient(http2=HTTP2_ENABLED, **kwargs)
+        except ImportError:
+            # httpx[http2] (h2) not installed - keep-alive HTTP/1.1 still avoids reconnects
+            print("⚠️ h2 not installed, using HTTP/1.1 for backend connections")
+            return httpx.AsyncClient(**kwargs)
+
+    async def preconnect(self):
+        """Open a connection to every backend so the first turn skips DNS/TLS setup."""
+        async def connect(service: str):
+            try:
+                await self.get(service).head("/", timeout=BACKEND_CONNECT_TIMEOUT)
+                print(f"🔗 Connected to {service}")
+            except httpx.HTTPError as e:
+                print(f"⚠️ Pre-connect to {service} failed: {e!r}")
+
+        await asyncio.gather(*(connect(service) for service in self.backends))
+
+    async def aclose(self):
+        """Close all pools (called from the server lifespan)."""
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients))
+
+
+backends = BackendClients()
+
+
+def get_client(service: str) -> httpx.AsyncClient:
+    """Pooled client for a backend service (a key of config.BACKENDS)."""
+    return backends.get(service)
@@ -5,10 +5,80 @@ Contains Modal endpoint URLs and language settings.
 import os
 
 # Modal Service URLs (deployed endpoints)
-MODAL_STT_URL = "https://akshaymp-1810--indicconformer-stt-indicconformerstt-web-app.modal.run"
-MODAL_TRANS_INDIC_EN_URL = "https://akshaymp-1810--indictrans2-indic-en-indictrans2service-web-app.modal.run"
-MODAL_TRANS_EN_INDIC_URL = "https://akshaymp-1810--indictrans2-en-indic-indictrans2enindicse-9e3146.modal.run"
+MODAL_STT_GPU_URL = "https://akshaymp-1810--indicconformer-stt-indicconformerstt-web-app.modal.run"
+MODAL_STT_CPU_URL = "https://akshaymp-1810--indicconformer-stt-indicconformersttcpu-web-app.modal.run"
+STT_CPU_INT8 = False  # Use the CPU-only INT8 ONNX deployment (no GPU)
+MODAL_STT_URL = MODAL_STT_CPU_URL if STT_CPU_INT8 else MODAL_STT_GPU_URL
+# Translation: one service for both directions (src/modal/modal_translation.py)
+MODAL_TRANSLATION_HF_URL = "https://akshaymp-1810--indictrans2-indictrans2service-web-app.modal.run"
+MODAL_TRANSLATION_CT2_URL = "https://akshaymp-1810--indictrans2-indictrans2ct2service-web-app.modal.run"
+TRANSLATION_ENGINE = "hf"  # "hf" (transformers on GPU) or "ct2" (CTranslate2 INT8 on CPU)
+MODAL_TRANSLATION_URL = MODAL_TRANSLATION_CT2_URL if TRANSLATION_ENGINE == "ct2" else MODAL_TRANSLATION_HF_URL
+TRANSLATION_PROFILE = "realtime"  # Decoding profile for the voice path: realtime, balanced or quality
 MODAL_TTS_URL = "https://akshaymp-1810--indicf5-tts-indicf5service-generate.modal.run"
+MODAL_TTS_RAW_URL = "https://akshaymp-1810--indicf5-tts-indicf5service-generate-raw.modal.run"
+MODAL_TTS_READY_URL = "https://akshaymp-1810--indicf5-tts-indicf5service-ready.modal.run"
+
+# Translation cache: in-memory LRU in front of a SQLite file shared by all
+# server workers on the machine. Entries are keyed by model version too, so
+# bump TRANSLATION_MODEL_VERSION when the deployed models change.
+TRANSLATION_CACHE = True
+TRANSLATION_CACHE_SIZE = 4096  # In-memory entries per process
+TRANSLATION_CACHE_PATH = os.environ.get(
+    "TRANSLATION_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "voice_agent", "translations.sqlite3"),
+)
+TRANSLATION_CACHE_MAX_ROWS = 200000  # On-disk entries (oldest are pruned)
+TRANSLATION_MODEL_VERSION = f"indictrans2-1B/{TRANSLATION_ENGINE}"
+
+# Long texts are translated sentence by sentence (clauses for sentences over
+# SEGMENT_MAX_WORDS), in batches of up to TRANSLATION_BATCH_SIZE segments per
+# request; larger batches are split into concurrent requests. Kannada
+# sentences under SEGMENT_MIN_WORDS are merged with a neighbour (IndicTrans2
+# drifts into Hindi on very short Kannada input)
+TRANSLATION_SEGMENTING = True
+SEGMENT_MAX_WORDS = 40
+SEGMENT_MIN_WORDS = 5
+TRANSLATION_BATCH_SIZE = 16
+
+# Agent answers are cut into segments while they stream, and each segment is
+# translated and synthesized as soon as it is complete. The first segment ends
+# at the first clause boundary after STREAM_FIRST_SEGMENT_WORDS (fast first
+# audio); later ones collect sentences up to STREAM_SEGMENT_WORDS
+RESPONSE_STREAMING = True
+STREAM_FIRST_SEGMENT_WORDS = 5
+STREAM_SEGMENT_WORDS = 20
+
+# Pipeline engine: each stage runs as its own task behind a bounded queue
+# (a full queue blocks the stage feeding it); per-stage concurrency caps the
+# jobs (turns or response segments) a stage works on at once
+PIPELINE_QUEUE_SIZE = 64
+STAGE_CONCURRENCY = {
+    "indic_en": 2,
+    "agent": 1,
+    "en_indic": 4,
+    "tts": 2,
+}
+
+# Barge-in: new speech cancels all in-flight work of earlier turns and the
+# client stops playing their audio (the mic stays open during playback). It
+# fires once the new turn has BARGE_IN_MIN_SPEECH_MS of speech windows loud
+# enough over the noise floor, so coughs, echo and noise bursts do not cut
+# the answer off
+BARGE_IN = True
+BARGE_IN_MIN_SPEECH_MS = 500
+
+# Send audio to STT/TTS as raw binary bodies instead of base64 JSON
+BINARY_AUDIO_TRANSPORT = True
+
+# Streaming STT: send audio to the STT /stream WebSocket while the user speaks
+# and get partial transcripts back (falls back to batch /transcribe on failure)
+STT_STREAMING = True
+MODAL_STT_WS_URL = MODAL_STT_URL.replace("https://", "wss://") + "/stream"
+STT_STREAM_FINAL_TIMEOUT = 10  # seconds to wait for the final after end of speech
+# VAD segments (up to MAX_UTTERANCE_MS each) kept per streamed turn for the
+# batch fallback; longer turns fall back to the stream's last partial
+STT_FALLBACK_MAX_SEGMENTS = 4
 
 # Language Configuration
 LANGUAGE_CODE = "kn"  # Kannada for STT
@@ -23,10 +93,67 @@ VAD_THRESHOLD = 0.5
 MIN_SILENCE_DURATION_MS = 500
 MIN_SPEECH_DURATION_MS = 250
 
+# Adaptive endpointing: per-turn silence timeout between these bounds
+# (MIN_SILENCE_DURATION_MS is the upper bound)
+ADAPTIVE_ENDPOINTING = True
+ENDPOINT_MIN_SILENCE_MS = 200
+
+# Utterance segmenting: long turns are cut near this length (at the quietest
+# window within the search span) and emitted as continuation segments
+VAD_SEGMENTING = True
+MAX_UTTERANCE_MS = 15000
+SEGMENT_SEARCH_MS = 2000
+
+# Noise gate: skip the VAD model on windows near the tracked noise floor and
+# drop utterances too weak to be speech before they reach STT
+NOISE_GATE = True
+NOISE_GATE_MARGIN_DB = 3.0  # Windows less than this above the floor skip the model
+NOISE_GATE_ABS_DB = -60.0  # Windows below this level (dBFS) always skip the model
+MIN_UTTERANCE_SNR_DB = 6.0  # Minimum utterance level over the noise floor
+
+# VAD Engine (Silero ONNX model bundled in the package, shared per process)
+VAD_MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "silero_vad.onnx")
+VAD_NUM_THREADS = 1  # ONNX Runtime intra-op threads for the shared session
+
+# Cross-session VAD batching (one forward pass per tick on a worker thread)
+VAD_BATCHING = True
+VAD_MAX_BATCH_SIZE = 128  # Windows per forward pass
+VAD_BATCH_TICK_MS = 0  # Extra wait to gather windows before each pass
+
 # API Timeouts (seconds)
 STT_TIMEOUT = 120
 TRANSLATION_TIMEOUT = 60
 TTS_TIMEOUT = 120
 
+# Backend connection pools: one keep-alive HTTP/2 pool per Modal service,
+# shared by every session in the process
+HTTP2_ENABLED = True
+BACKEND_CONNECT_TIMEOUT = 10  # seconds
+BACKEND_KEEPALIVE_EXPIRY = 300  # seconds an idle connection is kept open
+BACKENDS = {
+    "stt": {"url": MODAL_STT_URL, "timeout": STT_TIMEOUT, "max_connections": 50, "max_keepalive": 10},
+    "translation": {"url": MODAL_TRANSLATION_URL, "timeout": TRANSLATION_TIMEOUT, "max_connections": 100, "max_keepalive": 20},
+    "tts": {"url": MODAL_TTS_URL, "timeout": TTS_TIMEOUT, "max_connections": 20, "max_keepalive": 5},
+    # Other endpoints of the TTS container ("service" groups them for warm-up tracking)
+    "tts_raw": {"url": MODAL_TTS_RAW_URL, "timeout": TTS_TIMEOUT, "max_connections": 20, "max_keepalive": 5, "service": "tts"},
+    "tts_ready": {"url": MODAL_TTS_READY_URL, "timeout": TTS_TIMEOUT, "max_connections": 5, "max_keepalive": 1, "service": "tts"},
+}
+
+# Backend warm-up from the orchestrator: ping each service's readiness
+# endpoint on session open, re-warm idle services at speech onset, and keep
+# them warm in the background while users are around
+PREDICTIVE_WARMUP = True
+WARMUP_PROBES = {  # service -> (BACKENDS client, readiness path)
+    "stt": ("stt", "/ready"),
+    "translation": ("translation", "/ready"),
+    "tts": ("tts_ready", ""),
+}
+BACKEND_SCALEDOWN_S = 300  # Modal scaledown_window of the services
+WARMUP_IDLE_S = 240  # A service idle this long may scale down: re-warm it
+KEEPALIVE_INTERVAL_S = 30  # Keep-alive scheduler tick
+KEEPALIVE_IDLE_HORIZON_S = 900  # Keep backends warm this long after the last user activity
+WARMUP_TIMEOUT = 300  # A cold start (image pull + model load + warm-up) can take minutes
+COLD_START_THRESHOLD_MS = 3000  # Probe slower than this = the container was cold
+
 # Google Gemini Configuration
 GEMINI_MODEL = "gemini-3-flash-preview"  # Using experimental flash model
@@ -0,0 +1,130 @@
+"""
+Adaptive endpointing for the VAD.
+Picks the end-of-turn silence timeout per turn from signals the VAD already
+has: the speech-probability trend, utterance length and the trailing
+energy/pitch contour, plus an optional "looks complete" vote from a
+downstream stage.
+"""
+from collections import deque
+
+import numpy as np
+
+from .config import (
+    SAMPLE_RATE,
+    MIN_SILENCE_DURATION_MS,
+    ENDPOINT_MIN_SILENCE_MS,
+)
+
+# Speech windows kept for the trailing contour (~0.5s at 32ms windows)
+CONTOUR_WINDOWS = 16
+# Silence windows used for the probability trend
+TREND_WINDOWS = 4
+
+# Score weights (sum to 1.0; a score of 1.0 gives the minimum timeout)
+WEIGHT_PROB = 0.35
+WEIGHT_LENGTH = 0.25
+WEIGHT_ENERGY = 0.2
+WEIGHT_PITCH = 0.2
+
+
+def estimate_pitch(window: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
+    """Autocorrelation pitch estimate in Hz (0.0 for unvoiced windows)."""
+    n = len(window)
+    spectrum = np.fft.rfft(window, 2 * n)
+    ac = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+    if ac[0] <= 0:
+        return 0.0
+    lo, hi = sample_rate // 400, min(sample_rate // 70, n - 1)
+    lag = lo + int(np.argmax(ac[lo:hi]))
+    if ac[lag] / ac[0] < 0.3:
+        return 0.0
+    return sample_rate / lag
+
+
+def _slope(values) -> float:
+    """Least-squares slope per window of a short series."""
+    y = np.asarray(values, dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64)
+    x -= x.mean()
+    return float((x * (y - y.mean())).sum() / (x * x).sum())
+
+
+class AdaptiveEndpointer:
+    """Chooses how much trailing silence ends the current turn."""
+
+    def __init__(
+        self,
+        min_silence_ms: float = ENDPOINT_MIN_SILENCE_MS,
+        max_silence_ms: float = MIN_SILENCE_DURATION_MS,
+        frame_duration_ms: float = 32.0,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.min_silence_ms = min_silence_ms
+        self.max_silence_ms = max_silence_ms
+        self.frame_duration_ms = frame_duration_ms
+        self.sample_rate = sample_rate
+        self.start_turn()
+
+    def start_turn(self):
+        """Forget everything about the previous turn."""
+        self.speech_windows = 0
+        self.energy_db: deque[float] = deque(maxlen=CONTOUR_WINDOWS)
+        self.pitch_hz: deque[float] = deque(maxlen=CONTOUR_WINDOWS)
+        self.silence_probs: deque[float] = deque(maxlen=TREND_WINDOWS)
+        self.complete_vote = False
+        self.last_signals: dict = {}
+
+    def observe(self, window: np.ndarray, speech_prob: float, is_speech: bool):
+        """Feed one float32 window of the current turn and its speech probability."""
+        if is_speech:
+            self.speech_windows += 1
+            self.silence_probs.clear()
+            rms = float(np.sqrt(np.mean(np.square(window))))
+            self.energy_db.append(20 * np.log10(rms + 1e-9))
+            pitch = estimate_pitch(window, self.sample_rate)
+            if pitch:
+                self.pitch_hz.append(pitch)
+        else:
+            self.silence_probs.append(speech_prob)
+
+    def vote_complete(self):
+        """Hook for downstream stages: the utterance looks complete."""
+        self.complete_vote = True
+
+    def silence_timeout_ms(self, threshold: float) -> float:
+        """Silence needed to end the turn given what has been observed so far."""
+        if self.complete_vote:
+            self.last_signals = {"vote": True}
+            return self.min_silence_ms
+
+        # Model confidently back to silence (not hovering near threshold)
+        prob_score = 0.0
+        if self.silence_probs:
+            prob_score = 1.0 - min(float(np.mean(self.silence_probs)) / (0.6 * threshold), 1.0)
+
+        # Longer utterances are more likely to be complete requests
+        speech_ms = self.speech_windows * self.frame_duration_ms
+        length_score = float(np.clip((speech_ms - 500) / 2500, 0.0, 1.0))
+
+        # Falling energy / pitch at the end of speech marks a finished phrase
+        energy_score = 0.0
+        if len(self.energy_db) >= 3:
+            energy_score = float(np.clip(-_slope(self.energy_db) / 1.5, 0.0, 1.0))
+        pitch_score = 0.0
+        if len(self.pitch_hz) >= 3:
+            relative = _slope(self.pitch_hz) / float(np.mean(self.pitch_hz))
+            pitch_score = float(np.clip(-relative / 0.01, 0.0, 1.0))
+
+        score = (
+            WEIGHT_PROB * prob_score
+            + WEIGHT_LENGTH * length_score
+            + WEIGHT_ENERGY * energy_score
+            + WEIGHT_PITCH * pitch_score
+        )
+        self.last_signals = {
+            "prob": round(prob_score, 2),
+            "length": round(length_score, 2),
+            "energy": round(energy_score, 2),
+            "pitch": round(pitch_score, 2),
+        }
+        return self.max_silence_ms - score * (self.max_silence_ms - self.min_silence_ms)
@@ -12,6 +12,7 @@ class VoiceAgentEvent:
     """Base class for all voice agent events."""
     type: str
     timestamp: float = field(default_factory=time.time)
+    turn_id: int = 0  # VAD turn the event belongs to
 
 
 @dataclass
@@ -56,10 +57,25 @@ class TranslationEvent(VoiceAgentEvent):
     src_lang: str = ""
     tgt_lang: str = ""
     direction: Literal["indic_to_en", "en_to_indic"] = "indic_to_en"
+    seq: int = 0  # Segment number of the agent response (en_to_indic)
+    final: bool = False  # Last segment of the response (text may be empty)
+    skipped: bool = False  # The segment failed to translate: it has no audio
 
     @classmethod
-    def create(cls, text: str, src_lang: str, tgt_lang: str, direction: str) -> "TranslationEvent":
-        return cls(text=text, src_lang=src_lang, tgt_lang=tgt_lang, direction=direction)
+    def create(
+        cls,
+        text: str,
+        src_lang: str,
+        tgt_lang: str,
+        direction: str,
+        seq: int = 0,
+        final: bool = False,
+        skipped: bool = False,
+    ) -> "TranslationEvent":
+        return cls(
+            text=text, src_lang=src_lang, tgt_lang=tgt_lang, direction=direction,
+            seq=seq, final=final, skipped=skipped,
+        )
 
 
 @dataclass
@@ -104,10 +120,27 @@ class AgentEndEvent(VoiceAgentEvent):
     """Agent finished responding."""
     type: Literal["agent_end"] = "agent_end"
     full_response: str = ""
+    ttft_ms: float | None = None  # Time to first response token
+    tokens_per_sec: float | None = None  # Response decode rate after the first token
+    output_tokens: int = 0
+    error: bool = False  # The agent failed: full_response is an apology to speak
 
     @classmethod
-    def create(cls, full_response: str = "") -> "AgentEndEvent":
-        return cls(full_response=full_response)
+    def create(
+        cls,
+        full_response: str = "",
+        ttft_ms: float | None = None,
+        tokens_per_sec: float | None = None,
+        output_tokens: int = 0,
+        error: bool = False,
+    ) -> "AgentEndEvent":
+        return cls(
+            full_response=full_response,
+            ttft_ms=ttft_ms,
+            tokens_per_sec=tokens_per_sec,
+            output_tokens=output_tokens,
+            error=error,
+        )
 
 
 @dataclass
@@ -115,10 +148,12 @@ class TTSChunkEvent(VoiceAgentEvent):
     """Audio chunk from TTS."""
     type: Literal["tts_chunk"] = "tts_chunk"
     audio: bytes = b""
+    seq: int = 0  # Segment number: play audio in this order
+    skipped: bool = False  # The segment has no audio: playback moves past its seq
 
     @classmethod
-    def create(cls, audio: bytes) -> "TTSChunkEvent":
-        return cls(audio=audio)
+    def create(cls, audio: bytes, seq: int = 0, skipped: bool = False) -> "TTSChunkEvent":
+        return cls(audio=audio, seq=seq, skipped=skipped)
 
 
 @dataclass
@@ -131,11 +166,37 @@ class TTSCompleteEvent(VoiceAgentEvent):
         return cls()
 
 
+@dataclass
+class TurnCancelledEvent(VoiceAgentEvent):
+    """A turn's remaining work was cancelled (the user spoke over it)."""
+    type: Literal["turn_cancelled"] = "turn_cancelled"
+    reason: str = "barge_in"
+
+    @classmethod
+    def create(cls, turn_id: int, reason: str = "barge_in") -> "TurnCancelledEvent":
+        return cls(turn_id=turn_id, reason=reason)
+
+
+@dataclass
+class ResponseRestartEvent(VoiceAgentEvent):
+    """
+    The agent called a tool after part of its text was already segmented:
+    audio of segments before `seq` is withdrawn and the answer continues at `seq`.
+    """
+    type: Literal["response_restart"] = "response_restart"
+    seq: int = 0
+
+    @classmethod
+    def create(cls, seq: int) -> "ResponseRestartEvent":
+        return cls(seq=seq)
+
+
 def event_to_dict(event: VoiceAgentEvent) -> dict:
     """Convert event to dictionary for JSON serialization."""
     data = {
         "type": event.type,
         "ts": int(event.timestamp * 1000),  # Convert to milliseconds for frontend
+        "turn_id": event.turn_id,
     }
     
     if isinstance(event, UserInputEvent):
@@ -150,6 +211,9 @@ def event_to_dict(event: VoiceAgentEvent) -> dict:
         data["src_lang"] = event.src_lang
         data["tgt_lang"] = event.tgt_lang
         data["direction"] = event.direction
+        data["seq"] = event.seq
+        data["final"] = event.final
+        data["skipped"] = event.skipped
     elif isinstance(event, AgentChunkEvent):
         data["text"] = event.text
     elif isinstance(event, ToolCallEvent):
@@ -162,10 +226,20 @@ def event_to_dict(event: VoiceAgentEvent) -> dict:
         data["result"] = event.result
     elif isinstance(event, AgentEndEvent):
         data["full_response"] = event.full_response
+        data["ttft_ms"] = event.ttft_ms
+        data["tokens_per_sec"] = event.tokens_per_sec
+        data["output_tokens"] = event.output_tokens
+        data["error"] = event.error
     elif isinstance(event, TTSChunkEvent):
         # Audio bytes are sent separately, not in JSON
         data["audio_length"] = len(event.audio)
+        data["seq"] = event.seq
+        data["skipped"] = event.skipped
     elif isinstance(event, TTSCompleteEvent):
         pass
+    elif isinstance(event, TurnCancelledEvent):
+        data["reason"] = event.reason
+    elif isinstance(event, ResponseRestartEvent):
+        data["seq"] = event.seq
     
     return data
@@ -0,0 +1,118 @@
+"""
+Energy pre-gate and noise-floor tracking for the VAD.
+Windows clearly at or below the session's noise floor skip the Silero model,
+and utterances too weak to be speech are dropped before they reach STT.
+"""
+from collections import deque
+
+import numpy as np
+
+from .config import (
+    NOISE_GATE_MARGIN_DB,
+    NOISE_GATE_ABS_DB,
+    MIN_UTTERANCE_SNR_DB,
+)
+
+# Noise floor smoothing: follow quieter audio quickly, louder audio slowly
+FLOOR_ALPHA_DOWN = 0.2
+FLOOR_ALPHA_UP = 0.02
+# Zero-crossing rate above which low-energy audio is treated as hiss
+NOISE_ZCR = 0.35
+# Skipped windows replayed through the model when the gate opens, so its
+# recurrent state is warm at speech onset (~256ms at 16kHz)
+PREROLL_WINDOWS = 8
+
+
+def window_features(window: np.ndarray) -> tuple[float, float]:
+    """(energy in dBFS, zero-crossing rate) of a float32 window."""
+    power = float(np.dot(window, window)) / len(window)
+    energy_db = 10 * np.log10(power + 1e-12)
+    zcr = np.count_nonzero(np.diff(np.signbit(window))) / (len(window) - 1)
+    return energy_db, zcr
+
+
+class NoiseGate:
+    """Per-session noise floor and model pre-gate."""
+
+    def __init__(
+        self,
+        margin_db: float = NOISE_GATE_MARGIN_DB,
+        abs_silence_db: float = NOISE_GATE_ABS_DB,
+        min_snr_db: float = MIN_UTTERANCE_SNR_DB,
+    ):
+        self.margin_db = margin_db
+        self.abs_silence_db = abs_silence_db
+        self.min_snr_db = min_snr_db
+        self.noise_floor_db: float | None = None
+        self.preroll: deque[np.ndarray] = deque(maxlen=PREROLL_WINDOWS)
+
+        self.energy_db = 0.0  # Features of the last window seen
+        self.zcr = 0.0
+
+        # Stats
+        self.windows = 0
+        self.skipped = 0
+        self.rejected_utterances = 0
+
+    def measure(self, window: np.ndarray):
+        """Compute the features of a window (used by should_skip and update)."""
+        self.energy_db, self.zcr = window_features(window)
+        self.windows += 1
+
+    def should_skip(self, window: np.ndarray) -> bool:
+        """True if the window is clearly noise and the model can be skipped."""
+        self.measure(window)
+
+        skip = self.energy_db < self.abs_silence_db
+        if not skip and self.noise_floor_db is not None:
+            above_floor = self.energy_db - self.noise_floor_db
+            skip = above_floor < self.margin_db or (
+                above_floor < 2 * self.margin_db and self.zcr > NOISE_ZCR
+            )
+        if skip:
+            self.skipped += 1
+            self.preroll.append(window.copy())
+        return skip
+
+    def take_preroll(self) -> list[np.ndarray]:
+        """Skipped windows to replay before the model sees a gated-through window."""
+        windows = list(self.preroll)
+        self.preroll.clear()
+        return windows
+
+    def update(self, is_speech: bool, skipped: bool):
+        """
+        Track the noise floor from windows classified as non-speech.
+
+        Windows the model never saw may only lower the floor; otherwise audio
+        just above the floor could ratchet it up into the speech range.
+        """
+        if is_speech:
+            return
+        if self.noise_floor_db is None:
+            self.noise_floor_db = self.energy_db
+            return
+        if self.energy_db < self.noise_floor_db:
+            self.noise_floor_db += FLOOR_ALPHA_DOWN * (self.energy_db - self.noise_floor_db)
+        elif not skipped:
+            self.noise_floor_db += FLOOR_ALPHA_UP * (self.energy_db - self.noise_floor_db)
+
+    def is_speech_level(self, window_powers: list[float], window_size: int, record: bool = True) -> bool:
+        """
+        True if an utterance is loud enough over the noise floor to be speech.
+
+        Uses the louder half of the utterance's windows so trailing silence
+        padding does not drag the level down. With record=False (checks on a
+        turn still in progress) rejections are not counted or logged.
+        """
+        if self.noise_floor_db is None or not window_powers:
+            return True
+        loud = np.sort(np.asarray(window_powers))[len(window_powers) // 2:]
+        level_db = 10 * np.log10(float(loud.mean()) / window_size + 1e-12)
+        if level_db - self.noise_floor_db >= self.min_snr_db:
+            return True
+        if not record:
+            return False
+        self.rejected_utterances += 1
+        print(f"🔕 Dropped weak utterance ({level_db - self.noise_floor_db:.1f} dB over noise floor)")
+        return False
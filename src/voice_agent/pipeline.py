@@ -1,8 +1,12 @@
 """
 Voice Agent Pipeline.
-Async generator-based pipeline for voice sandwich architecture:
-VAD → STT → Indic→En → Agent → En→Indic → TTS
+Voice sandwich architecture: VAD → STT → Indic→En → Agent → En→Indic → TTS
+
+STT is the event source; the other stages run on the PipelineEngine, each
+as its own task connected by bounded queues, so a turn's TTS overlaps the
+next turn's STT and a response's segments overlap each other.
 """
+import asyncio
 from typing import AsyncIterator
 from .events import (
     VoiceAgentEvent,
@@ -11,201 +15,514 @@ from .events import (
     STTOutputEvent,
     TranslationEvent,
     AgentChunkEvent,
+    ToolCallEvent,
     AgentEndEvent,
     TTSChunkEvent,
     TTSCompleteEvent,
+    ResponseRestartEvent,
 )
 from . import stt_client, translation_client, tts_client
-from .agent import run_agent_sync
-from .vad import SileroVAD, vad_stream
-from .config import LANGUAGE_CODE, LANGUAGE_SCRIPT
+from .agent import astream_agent
+from .pipeline_engine import PipelineEngine, Stage
+from .segmentation import IncrementalSegmenter
+from .vad import SileroVAD, SpeechAudio, Utterance, vad_stream
+from .warmup import warmer
+from .config import (
+    LANGUAGE_CODE,
+    LANGUAGE_SCRIPT,
+    STT_STREAMING,
+    STT_FALLBACK_MAX_SEGMENTS,
+    PREDICTIVE_WARMUP,
+    RESPONSE_STREAMING,
+    BARGE_IN,
+    STAGE_CONCURRENCY,
+)
+
+
+def _in_turn(event: VoiceAgentEvent, turn_id: int) -> VoiceAgentEvent:
+    event.turn_id = turn_id
+    return event
+
+
+class STTTurns:
+    """
+    In-flight STT work per turn (request tasks and WebSocket streams), so
+    barge-in can abort the transcription of turns it supersedes.
+    """
+
+    def __init__(self):
+        self._work: dict[int, set] = {}  # turn -> tasks / StreamingTranscribers
+        self._cancel_before = 0  # Every turn below this one is cancelled
+
+    def is_cancelled(self, turn_id: int) -> bool:
+        return turn_id < self._cancel_before
+
+    def add(self, turn_id: int, work):
+        """Track a task or stream of a turn until it is done (cancelled at once if the turn is)."""
+        if self.is_cancelled(turn_id):
+            work.cancel()
+            return work
+        self._work.setdefault(turn_id, set()).add(work)
+        if isinstance(work, asyncio.Task):
+            work.add_done_callback(lambda _: self.discard(turn_id, work))
+        return work
+
+    def discard(self, turn_id: int, work):
+        items = self._work.get(turn_id)
+        if items is not None:
+            items.discard(work)
+            if not items:
+                del self._work[turn_id]
+
+    def cancel_turns(self, before: int) -> list[int]:
+        """
+        Cancel the STT requests and close the streams of every turn older than `before`.
+
+        Returns:
+            Turns that had STT work in flight
+        """
+        if before <= self._cancel_before:
+            return []
+        self._cancel_before = before
+        turns = sorted(turn for turn in self._work if turn < before)
+        for turn in turns:
+            for work in self._work.pop(turn):
+                work.cancel()
+        return turns
 
 
 async def stt_stream(
-    audio_stream: AsyncIterator[bytes],
+    utterance_stream: AsyncIterator[Utterance | SpeechAudio],
+    streaming: bool = STT_STREAMING,
+    turns: STTTurns | None = None,
 ) -> AsyncIterator[VoiceAgentEvent]:
     """
     STT Stage: Audio → Kannada text
     
+    Continuation segments of a long turn are sent to STT as soon as the VAD
+    cuts them; the turn's transcript is assembled when its final segment arrives.
+    
+    In streaming mode the turn's audio (SpeechAudio from the VAD) goes to the
+    STT WebSocket while the user speaks: partial transcripts are yielded as
+    STTChunkEvents and the final is ready right at end of speech. If the
+    stream fails, the turn falls back to batch transcription of its segments
+    (up to STT_FALLBACK_MAX_SEGMENTS of them; longer turns fall back to the
+    last partial transcript).
+    
+    Each turn's final transcription runs in its own task, so the VAD keeps
+    reading audio meanwhile; transcripts are still yielded in turn order.
+    
     Args:
-        audio_stream: Async iterator of WAV audio bytes (complete utterances from VAD)
+        utterance_stream: Async iterator of utterance segments (and SpeechAudio) from VAD
+        streaming: Use the streaming STT endpoint for SpeechAudio
+        turns: Tracks each turn's STT work; cancelling turns there (barge-in)
+            aborts their requests and streams and skips their remaining audio
     
     Yields:
-        STTOutputEvent with Kannada transcription
+        STTChunkEvent with partial transcripts, STTOutputEvent with Kannada
+        transcription, all tagged with the VAD's turn_id
     """
-    async for audio_bytes in audio_stream:
-        # Signal start of STT/Turn (Audio Received)
-        yield UserInputEvent.create(audio=audio_bytes)
-        # Signal STT processing started (for latency tracking)
-        yield STTChunkEvent.create(text="")
+    events: asyncio.Queue[VoiceAgentEvent | None] = asyncio.Queue()
+    finals: set[asyncio.Task] = set()
+    turns = turns or STTTurns()
+
+    async def read():
+        segments: list[asyncio.Task] = []
+        segment_audio: list[bytes] | None = []
+        stream: stt_client.StreamingTranscriber | None = None
+        stream_turn = 0
+        partial = ""
+        previous: asyncio.Task | None = None  # Final transcription of the previous turn
         try:
-            transcript = await stt_client.transcribe(audio_bytes, LANGUAGE_CODE)
-            if transcript and transcript.strip():
-                print(f"📝 STT: {transcript}")
-                yield STTOutputEvent.create(transcript=transcript, language=LANGUAGE_CODE)
-        except Exception as e:
-            print(f"❌ STT Error: {e}")
+            async for utterance in utterance_stream:
+                if turns.is_cancelled(utterance.turn_id):
+                    # Superseded by barge-in: its STT work was cancelled
+                    if stream and stream_turn == utterance.turn_id:
+                        stream = None
+                    continue
+                if isinstance(utterance, SpeechAudio):
+                    if not streaming:
+                        continue
+                    if utterance.start:
+                        if stream:
+                            stream.cancel()  # Previous turn was dropped by the VAD
+                            turns.discard(stream_turn, stream)
+                        stream = turns.add(utterance.turn_id, stt_client.StreamingTranscriber(LANGUAGE_CODE))
+                        stream_turn = utterance.turn_id
+                        partial = ""
+                    if stream:
+                        stream.send(utterance.pcm)
+                        for partial in stream.take_partials():
+                            events.put_nowait(_in_turn(STTChunkEvent.create(text=partial), utterance.turn_id))
+                    continue
 
+                if utterance.segment == 0:
+                    # Signal start of STT/Turn (Audio Received)
+                    events.put_nowait(_in_turn(UserInputEvent.create(audio=utterance.audio), utterance.turn_id))
+                    # Signal STT processing started (for latency tracking)
+                    events.put_nowait(_in_turn(STTChunkEvent.create(text=""), utterance.turn_id))
+                    segments = []
+                    segment_audio = []
 
-async def indic_en_stream(
-    event_stream: AsyncIterator[VoiceAgentEvent],
-) -> AsyncIterator[VoiceAgentEvent]:
+                if not stream:
+                    segments.append(turns.add(utterance.turn_id, asyncio.create_task(
+                        stt_client.transcribe(utterance.audio, LANGUAGE_CODE)
+                    )))
+                elif segment_audio is not None:
+                    segment_audio.append(utterance.audio)
+                    if len(segment_audio) > STT_FALLBACK_MAX_SEGMENTS:
+                        segment_audio = None  # Too long to keep: fall back to the last partial
+                if not utterance.is_final:
+                    continue
+
+                previous = turns.add(utterance.turn_id, asyncio.create_task(_finish_turn(
+                    utterance.turn_id, stream, segments, segment_audio, partial, previous, events, turns
+                )))
+                finals.add(previous)
+                previous.add_done_callback(finals.discard)
+                stream = None
+            if previous:
+                await asyncio.wait([previous])
+        finally:
+            if stream:
+                stream.cancel()
+            events.put_nowait(None)
+
+    reader = asyncio.create_task(read())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        reader.result()  # Surface errors of the audio source
+    finally:
+        for task in [reader, *finals]:
+            task.cancel()
+        await asyncio.gather(reader, *finals, return_exceptions=True)
+
+
+async def _finish_turn(
+    turn_id: int,
+    stream: "stt_client.StreamingTranscriber | None",
+    segments: list[asyncio.Task],
+    segment_audio: list[bytes] | None,
+    partial: str,
+    previous: asyncio.Task | None,
+    events: asyncio.Queue,
+    turns: STTTurns,
+):
+    """Final transcription of one turn (streamed, or its batch segments), queued after the previous turn's."""
+    transcript = ""
+    try:
+        if stream:
+            try:
+                texts = [await stream.finish()]
+            except Exception as e:
+                if segment_audio is None:
+                    print(f"⚠️ STT stream failed ({e!r}), using the last partial")
+                    texts = [partial]
+                else:
+                    print(f"⚠️ STT stream failed ({e!r}), falling back to batch")
+                    texts = await asyncio.gather(*(
+                        stt_client.transcribe(audio, LANGUAGE_CODE) for audio in segment_audio
+                    ))
+            finally:
+                stream.cancel()
+                turns.discard(turn_id, stream)
+        else:
+            texts = await asyncio.gather(*segments)
+        transcript = " ".join(t.strip() for t in texts if t and t.strip())
+    except Exception as e:
+        print(f"❌ STT Error: {e}")
+        for task in segments:
+            task.cancel()
+
+    if previous:
+        await asyncio.wait([previous])  # Transcripts leave in turn order
+    if transcript:
+        print(f"📝 STT: {transcript}")
+        events.put_nowait(_in_turn(
+            STTOutputEvent.create(transcript=transcript, language=LANGUAGE_CODE), turn_id
+        ))
+
+
+class IndicEnStage(Stage):
     """
     Translation Stage: Kannada → English
     
-    Passes through all events, translates STT output to English.
-    
-    Args:
-        event_stream: Async iterator of upstream events
-    
-    Yields:
-        All upstream events plus TranslationEvent with English text
+    Translates STT output to English.
     """
-    async for event in event_stream:
-        # Pass through all events
-        yield event
-        
-        # Translate STT output
-        if isinstance(event, STTOutputEvent):
-            try:
-                # Signal translation start
+
+    name = "indic_en"
+
+    def __init__(self, concurrency: int = STAGE_CONCURRENCY["indic_en"]):
+        self.concurrency = concurrency
+
+    def accepts(self, event: VoiceAgentEvent) -> bool:
+        return isinstance(event, STTOutputEvent)
+
+    def plan(self, event: STTOutputEvent) -> list[AsyncIterator[VoiceAgentEvent]]:
+        return [self.translate(event.transcript)]
+
+    async def translate(self, transcript: str) -> AsyncIterator[VoiceAgentEvent]:
+        try:
+            # Signal translation start
+            yield TranslationEvent.create(
+                text="",
+                src_lang=LANGUAGE_SCRIPT,
+                tgt_lang="eng_Latn",
+                direction="indic_to_en",
+            )
+            
+            english_text = await translation_client.translate_indic_to_english(
+                transcript, LANGUAGE_SCRIPT
+            )
+            if english_text and english_text.strip():
+                print(f"🔄 Kannada→En: {english_text}")
                 yield TranslationEvent.create(
-                    text="",
+                    text=english_text,
                     src_lang=LANGUAGE_SCRIPT,
                     tgt_lang="eng_Latn",
                     direction="indic_to_en",
                 )
-                
-                english_text = await translation_client.translate_indic_to_english(
-                    event.transcript, LANGUAGE_SCRIPT
-                )
-                if english_text and english_text.strip():
-                    print(f"🔄 Kannada→En: {english_text}")
-                    yield TranslationEvent.create(
-                        text=english_text,
-                        src_lang=LANGUAGE_SCRIPT,
-                        tgt_lang="eng_Latn",
-                        direction="indic_to_en",
-                    )
-            except Exception as e:
-                print(f"❌ Translation Error: {e}")
+        except Exception as e:
+            print(f"❌ Translation Error: {e}")
 
 
-async def agent_stream(
-    event_stream: AsyncIterator[VoiceAgentEvent],
-) -> AsyncIterator[VoiceAgentEvent]:
+class AgentStage(Stage):
     """
     Agent Stage: Process English text, generate response.
     
-    Uses Gemini with Google Search to answer questions.
-    
-    Args:
-        event_stream: Async iterator of upstream events
-    
-    Yields:
-        All upstream events plus AgentChunkEvent and AgentEndEvent
+    Uses Qwen with Tavily Search to answer questions. The agent runs on the
+    async streaming API, so other sessions keep running while it waits on the
+    LLM, and response tokens are forwarded as they arrive.
     """
-    async for event in event_stream:
-        # Pass through all events
-        yield event
-        
-        # Process English translation through agent
-        if isinstance(event, TranslationEvent) and event.direction == "indic_to_en" and event.text:
-            try:
-                print(f"🤖 Agent processing: {event.text}")
-                # Signal agent start (for latency tracking)
-                yield AgentChunkEvent.create(text="")
-                
-                # Run agent (synchronous for now, can be made async)
-                response = run_agent_sync(event.text)
-                
-                if response and response.strip():
-                    # Yield the full response
-                    yield AgentChunkEvent.create(text=response)
-                    yield AgentEndEvent.create(full_response=response)
-                    print(f"🤖 Agent response: {response[:100]}...")
-            except Exception as e:
-                print(f"❌ Agent Error: {e}")
-                yield AgentEndEvent.create(full_response="Sorry, I couldn't process that request.")
 
+    name = "agent"
 
-async def en_indic_stream(
-    event_stream: AsyncIterator[VoiceAgentEvent],
-) -> AsyncIterator[VoiceAgentEvent]:
+    def __init__(self, concurrency: int = STAGE_CONCURRENCY["agent"]):
+        self.concurrency = concurrency
+
+    def accepts(self, event: VoiceAgentEvent) -> bool:
+        return isinstance(event, TranslationEvent) and event.direction == "indic_to_en" and bool(event.text)
+
+    def plan(self, event: TranslationEvent) -> list[AsyncIterator[VoiceAgentEvent]]:
+        return [self.respond(event.text)]
+
+    async def respond(self, query: str) -> AsyncIterator[VoiceAgentEvent]:
+        try:
+            print(f"🤖 Agent processing: {query}")
+            # Signal agent start (for latency tracking)
+            yield AgentChunkEvent.create(text="")
+            
+            async for agent_event in astream_agent(query):
+                yield agent_event
+                if isinstance(agent_event, AgentEndEvent):
+                    print(f"🤖 Agent response: {agent_event.full_response[:100]}...")
+        except Exception as e:
+            print(f"❌ Agent Error: {e}")
+            yield AgentEndEvent.create(full_response="Sorry, I couldn't process that request.", error=True)
+
+
+class EnIndicStage(Stage):
     """
     Translation Stage: English → Kannada
     
-    Translates agent response back to Kannada.
+    Cuts the agent's token stream into segments (IncrementalSegmenter) and
+    translates each one as soon as it is complete, while the agent is still
+    writing. Translations are numbered by seq; the response's last one is
+    marked final (an empty final event if the last segment went out earlier).
     
-    Args:
-        event_stream: Async iterator of upstream events
+    Text the agent writes before a tool call is not part of the answer. If
+    some of it was already sent, its translations are cancelled and a
+    ResponseRestartEvent tells TTS and the client to drop those segments.
     
-    Yields:
-        All upstream events plus TranslationEvent with Kannada text
+    If the agent fails mid-answer, its unfinished text is dropped and the
+    apology in the error AgentEndEvent is spoken as the final segment.
     """
-    async for event in event_stream:
-        # Pass through all events
-        yield event
-        
-        # Translate agent response to Kannada
-        if isinstance(event, AgentEndEvent) and event.full_response:
-            try:
-                # Signal translation start
-                yield TranslationEvent.create(
-                    text="",
-                    src_lang="eng_Latn",
-                    tgt_lang=LANGUAGE_SCRIPT,
-                    direction="en_to_indic",
-                )
-                
-                kannada_text = await translation_client.translate_english_to_indic(
-                    event.full_response, LANGUAGE_SCRIPT
-                )
-                if kannada_text and kannada_text.strip():
-                    print(f"🔄 En→Kannada: {kannada_text[:100]}...")
-                    yield TranslationEvent.create(
-                        text=kannada_text,
-                        src_lang="eng_Latn",
-                        tgt_lang=LANGUAGE_SCRIPT,
-                        direction="en_to_indic",
-                    )
-            except Exception as e:
-                print(f"❌ Translation Error: {e}")
 
+    name = "en_indic"
 
-async def tts_stream(
-    event_stream: AsyncIterator[VoiceAgentEvent],
-) -> AsyncIterator[VoiceAgentEvent]:
+    def __init__(self, concurrency: int = STAGE_CONCURRENCY["en_indic"], streaming: bool = RESPONSE_STREAMING):
+        """
+        Args:
+            concurrency: Segments translated at once
+            streaming: Translate segments while the agent streams; otherwise
+                the whole response is translated at AgentEndEvent
+        """
+        self.concurrency = concurrency
+        self.streaming = streaming
+        self._segmenters: dict[int, IncrementalSegmenter] = {}  # Per turn
+        self._next_seq: dict[int, int] = {}
+        self._first_seq: dict[int, int] = {}  # First seq after the last restart
+
+    def accepts(self, event: VoiceAgentEvent) -> bool:
+        return isinstance(event, (AgentChunkEvent, ToolCallEvent, AgentEndEvent))
+
+    def plan(self, event: VoiceAgentEvent) -> list[AsyncIterator[VoiceAgentEvent]]:
+        turn = event.turn_id
+        if isinstance(event, AgentChunkEvent):
+            if not event.text:
+                # Agent start: a new response
+                self._segmenters[turn] = IncrementalSegmenter()
+                self._next_seq[turn] = 0
+                self._first_seq[turn] = 0
+                return []
+            if not self.streaming:
+                return []
+            return [self._job(turn, segment) for segment in self._segmenter(turn).feed(event.text)]
+
+        if isinstance(event, ToolCallEvent):
+            self._segmenter(turn).reset()  # Text before a tool call is not part of the answer
+            seq = self._next_seq.get(turn, 0)
+            if seq == self._first_seq.get(turn, 0):
+                return []
+            # Some of it was already segmented: withdraw those translations
+            self.engine.cancel_jobs(self, turn)
+            self._first_seq[turn] = seq
+            return [self._restart(seq)]
+
+        # AgentEndEvent
+        if event.error:
+            # The answer was cut off: end it with the apology instead
+            self._segmenter(turn).reset()
+            rest = event.full_response
+        else:
+            rest = self._segmenter(turn).flush() if self.streaming else ""
+            if not rest and self._next_seq.get(turn, 0) == 0:
+                rest = event.full_response
+        jobs = [self._job(turn, rest, final=True)] if rest else []
+        if not jobs:
+            jobs = [self._end(self._next_seq.get(turn, 0))]
+        self._segmenters.pop(turn, None)
+        self._next_seq.pop(turn, None)
+        self._first_seq.pop(turn, None)
+        return jobs
+
+    def cancel_turn(self, turn_id: int):
+        self._segmenters.pop(turn_id, None)
+        self._next_seq.pop(turn_id, None)
+        self._first_seq.pop(turn_id, None)
+
+    def _segmenter(self, turn: int) -> IncrementalSegmenter:
+        return self._segmenters.setdefault(turn, IncrementalSegmenter())
+
+    def _job(self, turn: int, text: str, final: bool = False) -> AsyncIterator[VoiceAgentEvent]:
+        seq = self._next_seq.get(turn, 0)
+        self._next_seq[turn] = seq + 1
+        return self.translate(text, seq, final)
+
+    async def translate(self, text: str, seq: int, final: bool) -> AsyncIterator[VoiceAgentEvent]:
+        if seq == 0:
+            # Signal translation start
+            yield TranslationEvent.create(
+                text="",
+                src_lang="eng_Latn",
+                tgt_lang=LANGUAGE_SCRIPT,
+                direction="en_to_indic",
+            )
+        try:
+            kannada_text = await translation_client.translate_english_to_indic(text, LANGUAGE_SCRIPT)
+        except Exception as e:
+            print(f"❌ Translation Error: {e}")
+            kannada_text = ""
+        skipped = not (kannada_text and kannada_text.strip())
+        if skipped:
+            # Still sent, so TTS and the client move past this seq
+            kannada_text = ""
+        else:
+            print(f"🔄 En→Kannada [{seq}]: {kannada_text[:100]}...")
+        yield TranslationEvent.create(
+            text=kannada_text,
+            src_lang="eng_Latn",
+            tgt_lang=LANGUAGE_SCRIPT,
+            direction="en_to_indic",
+            seq=seq,
+            final=final,
+            skipped=skipped,
+        )
+
+    async def _restart(self, seq: int) -> AsyncIterator[VoiceAgentEvent]:
+        print(f"↩️ En→Kannada: dropped segments before {seq} (tool call)")
+        yield ResponseRestartEvent.create(seq=seq)
+
+    async def _end(self, seq: int) -> AsyncIterator[VoiceAgentEvent]:
+        yield TranslationEvent.create(
+            text="",
+            src_lang="eng_Latn",
+            tgt_lang=LANGUAGE_SCRIPT,
+            direction="en_to_indic",
+            seq=seq,
+            final=True,
+        )
+
+
+class TTSStage(Stage):
     """
     TTS Stage: Kannada text → Audio
     
-    Synthesizes speech from Kannada text.
-    
-    Args:
-        event_stream: Async iterator of upstream events
-    
-    Yields:
-        All upstream events plus TTSChunkEvent with audio
+    Synthesizes each translated segment as soon as it arrives (segments are
+    synthesized concurrently); audio is numbered by the segment's seq.
+    TTSCompleteEvent follows the response's last audio. A segment without
+    audio (failed translation or synthesis) still gets a TTSChunkEvent, marked
+    skipped, so playback does not wait for it. A ResponseRestartEvent cancels
+    the synthesis of the segments it withdraws.
     """
-    async for event in event_stream:
-        # Pass through all events
-        yield event
-        
-        # Synthesize translated text (skip empty start events)
-        if isinstance(event, TranslationEvent) and event.direction == "en_to_indic" and event.text:
-            try:
-                print(f"🔊 TTS: Synthesizing...")
-                # Signal TTS start (for latency tracking)
-                yield TTSChunkEvent.create(audio=b"")
-                audio_bytes = await tts_client.synthesize(event.text)
-                if audio_bytes:
-                    yield TTSChunkEvent.create(audio=audio_bytes)
-                    print(f"🔊 TTS: Generated {len(audio_bytes)} bytes")
-                
-                # Signal completion of TTS for this turn
-                yield TTSCompleteEvent.create()
-            except Exception as e:
-                print(f"❌ TTS Error: {e}")
+
+    name = "tts"
+
+    def __init__(self, concurrency: int = STAGE_CONCURRENCY["tts"]):
+        self.concurrency = concurrency
+        self._started: set[int] = set()  # Turns whose TTS start was signalled
+
+    def accepts(self, event: VoiceAgentEvent) -> bool:
+        if isinstance(event, ResponseRestartEvent):
+            return True
+        return isinstance(event, TranslationEvent) and event.direction == "en_to_indic" and (
+            bool(event.text) or event.final or event.skipped
+        )
+
+    def plan(self, event: TranslationEvent | ResponseRestartEvent) -> list[AsyncIterator[VoiceAgentEvent]]:
+        if isinstance(event, ResponseRestartEvent):
+            # Every segment synthesized so far for the turn was withdrawn
+            self.engine.cancel_jobs(self, event.turn_id)
+            return []
+        jobs = []
+        if event.text:
+            first = event.turn_id not in self._started
+            self._started.add(event.turn_id)
+            jobs.append(self.synthesize(event.text, event.seq, first))
+        elif event.skipped:
+            jobs.append(self._skip(event.seq))
+        if event.final:
+            self._started.discard(event.turn_id)
+            jobs.append(self._complete())
+        return jobs
+
+    def cancel_turn(self, turn_id: int):
+        self._started.discard(turn_id)
+
+    async def synthesize(self, text: str, seq: int, first: bool) -> AsyncIterator[VoiceAgentEvent]:
+        if first:
+            print(f"🔊 TTS: Synthesizing...")
+            # Signal TTS start (for latency tracking)
+            yield TTSChunkEvent.create(audio=b"")
+        try:
+            audio_bytes = await tts_client.synthesize(text)
+        except Exception as e:
+            print(f"❌ TTS Error: {e}")
+            audio_bytes = b""
+        if audio_bytes:
+            print(f"🔊 TTS [{seq}]: Generated {len(audio_bytes)} bytes")
+            yield TTSChunkEvent.create(audio=audio_bytes, seq=seq)
+        else:
+            yield TTSChunkEvent.create(audio=b"", seq=seq, skipped=True)
+
+    async def _skip(self, seq: int) -> AsyncIterator[VoiceAgentEvent]:
+        print(f"🔇 TTS [{seq}]: skipped (no translation)")
+        yield TTSChunkEvent.create(audio=b"", seq=seq, skipped=True)
+
+    async def _complete(self) -> AsyncIterator[VoiceAgentEvent]:
+        # Signal completion of TTS for this turn
+        yield TTSCompleteEvent.create()
 
 
 async def full_pipeline(
@@ -220,19 +537,33 @@ async def full_pipeline(
         raw_audio_stream: Async iterator of raw PCM audio chunks
     
     Yields:
-        VoiceAgentEvent for each stage
+        VoiceAgentEvent for each stage, tagged with its turn_id
     """
+    engine = PipelineEngine([IndicEnStage(), AgentStage(), EnIndicStage(), TTSStage()])
+    
     # Create VAD filtered stream
-    vad = SileroVAD()
-    utterance_stream = vad_stream(raw_audio_stream, vad)
+    vad = SileroVAD(stream_audio=STT_STREAMING)
     
-    # Chain the pipeline stages
-    stt_events = stt_stream(utterance_stream)
-    trans1_events = indic_en_stream(stt_events)
-    agent_events = agent_stream(trans1_events)
-    trans2_events = en_indic_stream(agent_events)
-    tts_events = tts_stream(trans2_events)
+    def on_speech_start():
+        if PREDICTIVE_WARMUP:
+            # Speech onset: the turn reaches STT/translation/TTS within seconds,
+            # so wake any stage that has been idle long enough to scale down
+            warmer.touch()
+            warmer.warm_idle()
+    vad.on_speech_start = on_speech_start
+
+    stt_turns = STTTurns()
+
+    def on_speech_confirmed():
+        # The user is talking over the previous answer: stop working on it
+        # (STT, translation, agent and TTS requests are cancelled mid-flight)
+        for turn_id in stt_turns.cancel_turns(before=vad.turn_id):
+            print(f"✋ Barge-in: cancelled STT of turn {turn_id}")
+        for turn_id in engine.cancel_turns(before=vad.turn_id):
+            print(f"✋ Barge-in: cancelled turn {turn_id}")
+    if BARGE_IN:
+        vad.on_speech_confirmed = on_speech_confirmed
+    utterance_stream = vad_stream(raw_audio_stream, vad)
     
-    # Yield all events from the pipeline
-    async for event in tts_events:
+    async for event in engine.run(stt_stream(utterance_stream, turns=stt_turns)):
         yield event
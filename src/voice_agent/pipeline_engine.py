@@ -0,0 +1,258 @@
+"""
+Queue-connected stage engine for the voice pipeline.
+Each stage runs as its own task, reading events from a bounded asyncio.Queue.
+Events are routed straight to the stages that consume them and to a single
+output stream, instead of being re-yielded by every stage in a generator
+chain, so stages overlap across turns and segments.
+"""
+import asyncio
+from collections import Counter
+from typing import AsyncIterator
+
+from .config import PIPELINE_QUEUE_SIZE
+from .events import VoiceAgentEvent, TurnCancelledEvent
+
+_END = object()
+
+
+class Stage:
+    """
+    Base class for a pipeline stage.
+
+    plan() is called for every accepted event, in arrival order, and must not
+    block: it updates the stage's state and returns jobs (async iterators of
+    output events). Up to `concurrency` jobs run at once; the events of one
+    turn's jobs are released in the order the jobs were planned.
+    """
+
+    name = "stage"
+    concurrency = 1
+    engine: "PipelineEngine | None" = None  # Set by the engine running the stage
+
+    def accepts(self, event: VoiceAgentEvent) -> bool:
+        """Whether this stage consumes the event."""
+        raise NotImplementedError
+
+    def plan(self, event: VoiceAgentEvent) -> list[AsyncIterator[VoiceAgentEvent]]:
+        """Jobs to run for the event (may be empty)."""
+        raise NotImplementedError
+
+    def cancel_turn(self, turn_id: int):
+        """Drop any per-turn state (the turn's jobs are cancelled by the engine)."""
+
+
+class PipelineEngine:
+    """Runs stages as queue-connected tasks and merges their output in order."""
+
+    def __init__(self, stages: list[Stage], queue_size: int = PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            stages: Pipeline stages (an event goes to every stage that accepts it)
+            queue_size: Capacity of each stage's input queue and of the output
+                queue; a full queue blocks the producer (backpressure)
+        """
+        self.stages = stages
+        for stage in stages:
+            stage.engine = self
+        self._inputs = {stage.name: asyncio.Queue(queue_size) for stage in stages}
+        self._output: asyncio.Queue = asyncio.Queue(queue_size)
+        # Last emitter task per (stage, turn): the next job's events wait for it
+        self._tails: dict[tuple[str, int], asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._turn_tasks: dict[int, set[asyncio.Task]] = {}
+        self._job_tasks: dict[tuple[str, int], set[asyncio.Task]] = {}  # Per (stage, turn)
+        self._busy = 0  # Queued events + running jobs
+        self._turn_busy: Counter[int] = Counter()  # The same, per turn
+        self._cancel_before = 0  # Every turn below this one is cancelled
+        self._latest_turn: int | None = None  # Newest turn published so far
+        self._source_done = False
+        self._error: BaseException | None = None
+
+    async def run(self, source: AsyncIterator[VoiceAgentEvent]) -> AsyncIterator[VoiceAgentEvent]:
+        """
+        Feed source events through the stages.
+
+        Args:
+            source: Events entering the pipeline (e.g. from the STT stage)
+
+        Yields:
+            Every event (source and stage outputs); per stage and turn in job order
+        """
+        workers = [asyncio.create_task(self._dispatch(stage)) for stage in self.stages]
+        feeder = asyncio.create_task(self._feed(source))
+        try:
+            while (event := await self._output.get()) is not _END:
+                yield event
+            if self._error is not None:
+                raise self._error
+        finally:
+            tasks = [feeder, *workers, *self._tasks]
+            for task in tasks:
+                task.cancel()
+            # Let cancelled jobs close their backend requests before returning
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def publish(self, event: VoiceAgentEvent):
+        """Send an event to the output and to every stage that accepts it."""
+        if self._is_cancelled(event.turn_id) and not isinstance(event, TurnCancelledEvent):
+            return
+        if self._latest_turn is None or event.turn_id > self._latest_turn:
+            self._latest_turn = event.turn_id
+        await self._output.put(event)
+        for stage in self.stages:
+            if stage.accepts(event):
+                self._acquire(event.turn_id)
+                await self._inputs[stage.name].put(event)
+
+    def cancel_turns(self, before: int, reason: str = "barge_in") -> list[int]:
+        """
+        Cancel the work of every turn older than `before` (barge-in).
+
+        Running jobs are cancelled (which aborts their backend requests),
+        queued events of those turns are skipped, and anything they would
+        still publish is dropped. A TurnCancelledEvent is published for
+        each turn that had work in flight and always for the latest earlier
+        turn, whose answer may still be playing on the client after the
+        pipeline has finished with it.
+
+        Args:
+            before: First turn to keep
+            reason: Reason reported on the TurnCancelledEvent
+
+        Returns:
+            Turns that had work in flight
+        """
+        if before <= self._cancel_before:
+            return []
+        busy = sorted(turn for turn, count in self._turn_busy.items() if turn < before and count > 0)
+        notify = set(busy)
+        if self._latest_turn is not None and self._cancel_before <= self._latest_turn < before:
+            notify.add(self._latest_turn)
+        self._cancel_before = before
+
+        for turn in busy:
+            for task in self._turn_tasks.pop(turn, set()):
+                task.cancel()
+            for stage in self.stages:
+                stage.cancel_turn(turn)
+        for turn in sorted(notify):
+            # Counted as work until sent, so the output stream does not end first
+            self._busy += 1
+            task = self._track(asyncio.create_task(self.publish(TurnCancelledEvent.create(turn, reason))))
+            task.add_done_callback(lambda _: self._release(None))
+        return busy
+
+    def cancel_jobs(self, stage: Stage, turn_id: int):
+        """
+        Cancel a stage's started jobs for a turn (the turn itself goes on).
+
+        Events those jobs have not published yet are dropped; jobs the stage
+        plans afterwards run as usual.
+
+        Args:
+            stage: Stage whose jobs to cancel
+            turn_id: Turn of the jobs
+        """
+        key = (stage.name, turn_id)
+        self._tails.pop(key, None)
+        for task in self._job_tasks.pop(key, set()):
+            task.cancel()
+
+    async def _feed(self, source: AsyncIterator[VoiceAgentEvent]):
+        self._busy += 1
+        try:
+            async for event in source:
+                await self.publish(event)
+        except Exception as e:
+            print(f"❌ Pipeline source error: {e}")
+            self._error = e
+        finally:
+            self._source_done = True
+            self._release(None)
+
+    async def _dispatch(self, stage: Stage):
+        queue = self._inputs[stage.name]
+        limit = asyncio.Semaphore(stage.concurrency)
+        while True:
+            event = await queue.get()
+            try:
+                if self._is_cancelled(event.turn_id):
+                    continue
+                for job in stage.plan(event):
+                    await limit.acquire()
+                    if self._is_cancelled(event.turn_id):
+                        limit.release()  # Cancelled while waiting for a slot
+                        break
+                    self._start_job(stage, event.turn_id, job, limit)
+            except Exception as e:
+                print(f"❌ {stage.name} error: {e}")
+            finally:
+                self._release(event.turn_id)
+
+    def _start_job(self, stage: Stage, turn_id: int, job: AsyncIterator[VoiceAgentEvent], limit: asyncio.Semaphore):
+        self._acquire(turn_id)
+        buffer: asyncio.Queue = asyncio.Queue()  # Unbounded: a finished job frees its slot at once
+        key = (stage.name, turn_id)
+        previous = self._tails.get(key)
+
+        async def run_job():
+            try:
+                async for event in job:
+                    event.turn_id = turn_id
+                    buffer.put_nowait(event)
+            except Exception as e:
+                print(f"❌ {stage.name} error: {e}")
+            finally:
+                buffer.put_nowait(_END)
+
+        async def emit():
+            if previous is not None:
+                await asyncio.wait([previous])  # Even if it was cancelled
+            while (event := await buffer.get()) is not _END:
+                await self.publish(event)
+
+        def emitted(task: asyncio.Task):
+            if self._tails.get(key) is task:
+                del self._tails[key]
+            self._release(turn_id)
+
+        # Bookkeeping in done callbacks: they also run for tasks cancelled
+        # before they started
+        runner = self._track(asyncio.create_task(run_job()), turn_id, key)
+        runner.add_done_callback(lambda _: limit.release())
+        tail = self._track(asyncio.create_task(emit()), turn_id, key)
+        tail.add_done_callback(emitted)
+        self._tails[key] = tail
+
+    def _track(self, task: asyncio.Task, turn_id: int | None = None, key: tuple[str, int] | None = None) -> asyncio.Task:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if turn_id is not None:
+            turn_tasks = self._turn_tasks.setdefault(turn_id, set())
+            turn_tasks.add(task)
+            task.add_done_callback(turn_tasks.discard)
+        if key is not None:
+            job_tasks = self._job_tasks.setdefault(key, set())
+            job_tasks.add(task)
+            task.add_done_callback(job_tasks.discard)
+        return task
+
+    def _is_cancelled(self, turn_id: int) -> bool:
+        return turn_id < self._cancel_before
+
+    def _acquire(self, turn_id: int):
+        self._busy += 1
+        self._turn_busy[turn_id] += 1
+
+    def _release(self, turn_id: int | None):
+        self._busy -= 1
+        if turn_id is not None:
+            self._turn_busy[turn_id] -= 1
+            if self._turn_busy[turn_id] <= 0:
+                del self._turn_busy[turn_id]
+                self._turn_tasks.pop(turn_id, None)
+                for stage in self.stages:
+                    self._job_tasks.pop((stage.name, turn_id), None)
+        if self._busy == 0 and self._source_done:
+            # Everything has been published: end the output stream
+            self._track(asyncio.create_task(self._output.put(_END)))
@@ -0,0 +1,225 @@
+"""
+Sentence and clause segmentation for translation.
+Long texts are cut into sentences (and over-long sentences into clauses) so
+they can be translated as a batch and reassembled in order.
+IncrementalSegmenter does the same on a token stream, so translation and
+TTS can start before the agent has finished its answer.
+"""
+import re
+
+from .config import SEGMENT_MAX_WORDS, STREAM_FIRST_SEGMENT_WORDS, STREAM_SEGMENT_WORDS
+
+# Sentence end: terminal punctuation (incl. the danda used in Indic text),
+# optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?।॥])[\"'”’)\]]*\s+")
+# Clause boundary inside a long sentence
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+# English abbreviations that end with a period but not a sentence
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "st", "sr", "jr", "vs", "etc", "e.g",
+    "i.e", "inc", "ltd", "co", "no", "approx", "dept", "est", "fig", "min", "max",
+}
+# A list marker on its own ("1.", "2)", "-", "*") belongs to the next sentence
+_LIST_MARKER = re.compile(r"^(\(?\d{1,3}[.)]|[-*•])$")
+
+
+def _ends_with_abbreviation(piece: str) -> bool:
+    word = piece.split()[-1].lower().rstrip(".")
+    # A known abbreviation, or initials like "J." / "U.S."
+    return word in _ABBREVIATIONS or bool(re.fullmatch(r"[a-z](\.[a-z])*", word))
+
+
+def split_sentences(text: str, lang: str = "en") -> list[str]:
+    """
+    Split text into sentences.
+
+    Args:
+        text: Text to split (English or an Indic language)
+        lang: "en" applies the English abbreviation rules; anything else
+            only splits on terminal punctuation
+
+    Returns:
+        Sentences, stripped, in order
+    """
+    sentences = []
+    for line in text.splitlines():
+        pieces = [p for p in _SENTENCE_END.split(line.strip()) if p.strip()]
+        merged: list[str] = []
+        for piece in pieces:
+            piece = piece.strip()
+            if merged and (
+                _LIST_MARKER.match(merged[-1])
+                or (lang == "en" and merged[-1].endswith(".") and _ends_with_abbreviation(merged[-1]))
+            ):
+                merged[-1] = f"{merged[-1]} {piece}"
+            else:
+                merged.append(piece)
+        sentences.extend(merged)
+    return sentences
+
+
+def split_clauses(sentence: str, max_words: int = SEGMENT_MAX_WORDS) -> list[str]:
+    """
+    Cut a sentence longer than max_words at clause boundaries (, ; :), and
+    at word boundaries when a single clause is still too long.
+    """
+    if len(sentence.split()) <= max_words:
+        return [sentence]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    for clause in _CLAUSE_END.split(sentence):
+        words = clause.split()
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+        while len(current) > max_words:
+            chunks.append(" ".join(current[:max_words]))
+            current = current[max_words:]
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _merge_short(pieces: list[str], min_words: int) -> list[str]:
+    """Attach pieces under min_words to the following piece (the last one to the previous)."""
+    merged: list[str] = []
+    carry = ""
+    for piece in pieces:
+        piece = f"{carry} {piece}".strip() if carry else piece
+        carry = ""
+        if len(piece.split()) < min_words:
+            carry = piece
+        else:
+            merged.append(piece)
+    if carry:
+        if merged:
+            merged[-1] = f"{merged[-1]} {carry}"
+        else:
+            merged.append(carry)
+    return merged
+
+
+def split_segments(
+    text: str,
+    lang: str = "en",
+    max_words: int = SEGMENT_MAX_WORDS,
+    min_words: int = 0,
+) -> list[tuple[str, str]]:
+    """
+    Split text into translation segments.
+
+    Args:
+        text: Text to split
+        lang: "en" or an Indic language code prefix (e.g. "kan")
+        max_words: Longest segment, in words
+        min_words: Shorter sentences are merged into a neighbour on the same
+            line (very short inputs translate poorly on their own)
+
+    Returns:
+        (segment, separator) pairs: joining each segment with its separator
+        (" " or a line break) restores the text's layout
+    """
+    segments = []
+    lines = [line for line in text.splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        pieces = [clause for sentence in split_sentences(line, lang) for clause in split_clauses(sentence, max_words)]
+        if min_words:
+            pieces = _merge_short(pieces, min_words)
+        for j, piece in enumerate(pieces):
+            last_in_line = j == len(pieces) - 1
+            segments.append((piece, "\n" if last_in_line and i < len(lines) - 1 else " "))
+    return segments
+
+
+def join_segments(translations: list[str], separators: list[str]) -> str:
+    """Reassemble translated segments in order with their original separators."""
+    return "".join(t.strip() + sep for t, sep in zip(translations, separators)).strip()
+
+
+# Sentence end or line break inside a growing buffer; the trailing whitespace
+# confirms the boundary (a "." followed by more characters is not one yet)
+_STREAM_BOUNDARY = re.compile(r"(?<=[.!?।॥])[\"'”’)\]]*\s+|\n+")
+_WORD = re.compile(r"\S+\s+")
+
+
+class IncrementalSegmenter:
+    """
+    Cuts a token stream into segments at sentence/clause boundaries.
+
+    The first segment is cut early, at the first clause boundary after
+    first_words, to get audio out quickly; later segments collect whole
+    sentences until they have segment_words, so fewer, larger requests are
+    made. A segment is never longer than max_words.
+    """
+
+    def __init__(
+        self,
+        lang: str = "en",
+        first_words: int = STREAM_FIRST_SEGMENT_WORDS,
+        segment_words: int = STREAM_SEGMENT_WORDS,
+        max_words: int = SEGMENT_MAX_WORDS,
+    ):
+        self.lang = lang
+        self.first_words = first_words
+        self.segment_words = segment_words
+        self.max_words = max_words
+        self.buffer = ""
+        self.emitted = 0  # Segments cut so far
+
+    def feed(self, text: str) -> list[str]:
+        """
+        Add streamed text.
+
+        Returns:
+            Segments completed by this text, in order (often none)
+        """
+        self.buffer += text
+        segments = []
+        while (cut := self._next_cut()) is not None:
+            segment = self.buffer[:cut].strip()
+            self.buffer = self.buffer[cut:]
+            if segment:
+                segments.append(segment)
+                self.emitted += 1
+        return segments
+
+    def flush(self) -> str:
+        """Return whatever is left at the end of the stream (may be empty)."""
+        segment, self.buffer = self.buffer.strip(), ""
+        if segment:
+            self.emitted += 1
+        return segment
+
+    def reset(self):
+        """Drop buffered text that has not been cut yet."""
+        self.buffer = ""
+
+    def _is_sentence_end(self, sentence: str) -> bool:
+        sentence = sentence.strip()
+        if not sentence or _LIST_MARKER.match(sentence):
+            return False
+        return not (self.lang == "en" and sentence.endswith(".") and _ends_with_abbreviation(sentence))
+
+    def _next_cut(self) -> int | None:
+        target = self.first_words if self.emitted == 0 else self.segment_words
+        last_sentence = 0  # Buffer offset of the last confirmed sentence end
+        for match in _STREAM_BOUNDARY.finditer(self.buffer):
+            if match.group().startswith("\n") or self._is_sentence_end(self.buffer[last_sentence:match.start()]):
+                last_sentence = match.end()
+                if len(self.buffer[:last_sentence].split()) >= target:
+                    return last_sentence
+
+        if self.emitted == 0:
+            for match in _CLAUSE_END.finditer(self.buffer):
+                if len(self.buffer[:match.start()].split()) >= self.first_words:
+                    return match.end()
+
+        words = list(_WORD.finditer(self.buffer))
+        if len(words) <= self.max_words:
+            return None
+        # Too long without reaching the target: cut at the last boundary that fits
+        limit = words[self.max_words - 1].end()
+        clauses = [m.end() for m in _CLAUSE_END.finditer(self.buffer[:limit])]
+        return max([last_sentence, *clauses]) or limit
@@ -5,6 +5,7 @@ Real-time voice communication with pipeline.
 import asyncio
 import wave
 import io
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
@@ -12,13 +13,33 @@ from typing import AsyncIterator
 
 from .pipeline import full_pipeline
 from .events import event_to_dict, TTSChunkEvent
-from .config import SAMPLE_RATE
+from .config import SAMPLE_RATE, PREDICTIVE_WARMUP
+from .backend_client import backends
+from .warmup import warmer
+from .translation_cache import translation_cache
+from .vad_engine import get_engine
+from .vad_scheduler import close_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the VAD model and open backend connections before the first session."""
+    get_engine()
+    await backends.preconnect()
+    if PREDICTIVE_WARMUP:
+        warmer.start()
+    yield
+    await warmer.stop()
+    await close_scheduler()
+    await backends.aclose()
+    translation_cache.close()
 
 
 app = FastAPI(
     title="Kannada Voice Agent",
     description="Real-time Kannada voice assistant with Gemini + Google Search",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -39,11 +60,28 @@ async def health():
     return {"status": "healthy", "service": "voice-agent"}
 
 
+@app.get("/backends")
+async def backend_status():
+    """Cold/warm state of each Modal backend as seen by the warmer."""
+    return warmer.status()
+
+
+@app.get("/translation_cache")
+async def translation_cache_stats():
+    """Translation cache hit rate and sizes (this worker)."""
+    return translation_cache.stats()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time voice communication."""
     await websocket.accept()
     print("🔌 Client connected")
+
+    if PREDICTIVE_WARMUP:
+        # The first turn is seconds away: wake every backend now, in parallel
+        warmer.touch()
+        warmer.warm_all()
     
     # Queue for incoming audio chunks
     audio_queue: asyncio.Queue[bytes] = asyncio.Queue()
@@ -1,41 +1,195 @@
 """
 STT Client for Modal IndicConformer service.
 """
+import asyncio
 import base64
-import httpx
-from .config import MODAL_STT_URL, LANGUAGE_CODE, STT_TIMEOUT
+import io
+import json
+import wave
+import websockets
+from .backend_client import backends, get_client
+from .config import (
+    LANGUAGE_CODE,
+    SAMPLE_RATE,
+    BINARY_AUDIO_TRANSPORT,
+    MODAL_STT_WS_URL,
+    STT_STREAM_FINAL_TIMEOUT,
+    BACKEND_CONNECT_TIMEOUT,
+)
 
 
 async def transcribe(audio_bytes: bytes, language: str = LANGUAGE_CODE) -> str:
     """
     Transcribe audio to text using Modal IndicConformer.
-    
+
     Args:
         audio_bytes: WAV audio bytes (16-bit, mono, 16kHz)
         language: Language code (default: "kn" for Kannada)
-    
+
     Returns:
         Transcription text
     """
+    if BINARY_AUDIO_TRANSPORT:
+        try:
+            with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+                if wf.getsampwidth() == 2:
+                    pcm = wf.readframes(wf.getnframes())
+                    return await transcribe_pcm(
+                        pcm, wf.getframerate(), language, channels=wf.getnchannels()
+                    )
+        except wave.Error:
+            pass
+        # Not 16-bit PCM WAV: send the file as-is and let the service decode it
+        return await _transcribe_raw(audio_bytes, language, {"X-Audio-Format": "wav"})
+
     audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-    
-    async with httpx.AsyncClient(timeout=STT_TIMEOUT) as client:
-        response = await client.post(
-            f"{MODAL_STT_URL}/transcribe",
-            json={
-                "audio_b64": audio_b64,
-                "language": language,
-                "decoding": "ctc",
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["transcription"]
+
+    response = await get_client("stt").post(
+        "/transcribe",
+        json={
+            "audio_b64": audio_b64,
+            "language": language,
+            "decoding": "ctc",
+        },
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data["transcription"]
+
+
+async def transcribe_pcm(
+    pcm: bytes,
+    sample_rate: int = SAMPLE_RATE,
+    language: str = LANGUAGE_CODE,
+    channels: int = 1,
+) -> str:
+    """
+    Transcribe raw 16-bit little-endian PCM (sent as-is, no WAV/base64 wrapping).
+
+    Args:
+        pcm: Interleaved int16 samples
+        sample_rate: Sample rate of the PCM
+        language: Language code (default: "kn" for Kannada)
+        channels: Number of interleaved channels
+
+    Returns:
+        Transcription text
+    """
+    headers = {
+        "X-Audio-Format": "pcm_s16le",
+        "X-Sample-Rate": str(sample_rate),
+        "X-Channels": str(channels),
+    }
+    return await _transcribe_raw(pcm, language, headers)
+
+
+async def _transcribe_raw(body: bytes, language: str, headers: dict) -> str:
+    response = await get_client("stt").post(
+        "/transcribe_raw",
+        content=body,
+        params={"language": language, "decoding": "ctc"},
+        headers={"Content-Type": "application/octet-stream", **headers},
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data["transcription"]
+
+
+class StreamingTranscriber:
+    """
+    One streaming transcription (one user turn) over the STT /stream WebSocket.
+
+    Audio is queued with send() and written by a background task, so the
+    VAD loop never waits on the network. Partial transcripts are collected
+    as they arrive; finish() ends the audio and returns the final transcript.
+    """
+
+    def __init__(
+        self,
+        language: str = LANGUAGE_CODE,
+        sample_rate: int = SAMPLE_RATE,
+        url: str = MODAL_STT_WS_URL,
+    ):
+        self.language = language
+        self.sample_rate = sample_rate
+        self.url = url
+        self._outbox: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._partials: list[str] = []
+        self._final: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._ended = False
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, pcm: bytes):
+        """Queue 16-bit mono PCM of the turn."""
+        if pcm and not self._ended:
+            self._outbox.put_nowait(pcm)
+
+    def take_partials(self) -> list[str]:
+        """Partial transcripts received since the last call, oldest first."""
+        partials, self._partials = self._partials, []
+        return partials
+
+    async def finish(self, timeout: float = STT_STREAM_FINAL_TIMEOUT) -> str:
+        """End the audio and wait for the final transcript."""
+        if not self._ended:
+            self._ended = True
+            self._outbox.put_nowait(None)
+        return await asyncio.wait_for(asyncio.shield(self._final), timeout)
+
+    def cancel(self):
+        """Abandon the stream (turn dropped or superseded)."""
+        self._ended = True
+        self._task.cancel()
+        if self._final.done():
+            if not self._final.cancelled():
+                self._final.exception()  # Mark any error as retrieved
+        else:
+            self._final.cancel()
+
+    async def _run(self):
+        try:
+            async with websockets.connect(
+                self.url, open_timeout=BACKEND_CONNECT_TIMEOUT, max_size=None
+            ) as ws:
+                backends.record_activity("stt")  # The warmer counts streaming as traffic
+                await ws.send(json.dumps({
+                    "language": self.language,
+                    "decoding": "ctc",
+                    "sample_rate": self.sample_rate,
+                }))
+                reader = asyncio.create_task(self._read(ws))
+                try:
+                    while True:
+                        pcm = await self._outbox.get()
+                        if pcm is None:
+                            await ws.send(json.dumps({"type": "end"}))
+                            break
+                        await ws.send(pcm)
+                    await reader
+                finally:
+                    reader.cancel()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not self._final.done():
+                self._final.set_exception(e)
+
+    async def _read(self, ws):
+        async for message in ws:
+            backends.record_activity("stt")
+            data = json.loads(message)
+            if data["type"] == "partial":
+                self._partials.append(data["transcription"])
+            elif data["type"] == "final":
+                self._final.set_result(data["transcription"])
+                return
+            elif data["type"] == "error":
+                raise RuntimeError(f"STT stream error: {data['detail']}")
+        raise ConnectionError("STT stream closed before the final transcript")
 
 
 async def health_check() -> dict:
     """Check STT service health."""
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(f"{MODAL_STT_URL}/health")
-        response.raise_for_status()
-        return response.json()
+    response = await get_client("stt").get("/health", timeout=30)
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,174 @@
+"""
+Tests for barge-in: superseded turns lose their STT requests and streams,
+and full_pipeline cancels them when the next turn's speech is confirmed.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent import pipeline
+from src.voice_agent.events import STTOutputEvent, TurnCancelledEvent
+from src.voice_agent.pipeline import STTTurns, full_pipeline, stt_stream
+from src.voice_agent.vad import SileroVAD, SpeechAudio, Utterance, vad_stream
+from src.voice_agent.vad_engine import SileroOnnxEngine, VADState
+
+SAMPLE_RATE = 16000
+
+
+class FakeSTT:
+    """Stand-in for the STT client: turn 1 is slow, other turns answer at once."""
+
+    def __init__(self):
+        self.cancelled: list[str] = []
+        self.closed_streams: set[int] = set()
+        self.streams = 0
+
+    async def transcribe(self, audio: bytes, language: str = "kn") -> str:
+        text = audio.decode()
+        try:
+            await asyncio.sleep(10 if text.startswith("t1") else 0.01)
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        return text
+
+    def streaming_transcriber(self, language: str = "kn"):
+        fake = self
+        fake.streams += 1
+        number = fake.streams
+
+        class Stream:
+            def send(self, pcm):
+                pass
+
+            def take_partials(self):
+                return []
+
+            async def finish(self):
+                await asyncio.sleep(10 if number == 1 else 0.01)
+                return f"stream {number}"
+
+            def cancel(self):
+                fake.closed_streams.add(number)
+
+        return Stream()
+
+
+def utterance(turn: int, is_final: bool = True) -> Utterance:
+    return Utterance(audio=f"t{turn}".encode(), turn_id=turn, is_final=is_final)
+
+
+def test_cancel_turns_aborts_batch_transcription(monkeypatch):
+    stt = FakeSTT()
+    monkeypatch.setattr(pipeline.stt_client, "transcribe", stt.transcribe)
+    turns = STTTurns()
+
+    async def utterances():
+        yield utterance(1)
+        await asyncio.sleep(0.02)  # Turn 1 is being transcribed
+        assert turns.cancel_turns(before=2) == [1]
+        yield utterance(2)
+
+    async def main():
+        return [e async for e in stt_stream(utterances(), streaming=False, turns=turns)]
+
+    events = asyncio.run(main())
+    assert stt.cancelled == ["t1"]
+    assert [(e.turn_id, e.transcript) for e in events if isinstance(e, STTOutputEvent)] == [(2, "t2")]
+
+
+def test_cancel_turns_closes_the_stream(monkeypatch):
+    stt = FakeSTT()
+    monkeypatch.setattr(pipeline.stt_client, "StreamingTranscriber", stt.streaming_transcriber)
+    turns = STTTurns()
+
+    async def utterances():
+        for turn in (1, 2):
+            yield SpeechAudio(pcm=b"\0\0", turn_id=turn, start=True)
+            yield utterance(turn)
+            await asyncio.sleep(0.02)
+            if turn == 1:
+                assert turns.cancel_turns(before=2) == [1]
+
+    async def main():
+        return [e async for e in stt_stream(utterances(), streaming=True, turns=turns)]
+
+    start = time.perf_counter()
+    events = asyncio.run(main())
+    assert time.perf_counter() - start < 2  # Turn 1's final was not waited for
+    # Stream 1 was closed by the barge-in (no batch fallback), stream 2 on completion
+    assert stt.closed_streams == {1, 2}
+    assert [(e.turn_id, e.transcript) for e in events if isinstance(e, STTOutputEvent)] == [(2, "stream 2")]
+
+
+def test_audio_of_cancelled_turns_is_skipped(monkeypatch):
+    stt = FakeSTT()
+    monkeypatch.setattr(pipeline.stt_client, "transcribe", stt.transcribe)
+    turns = STTTurns()
+    turns.cancel_turns(before=2)
+    assert turns.cancel_turns(before=2) == []
+
+    async def utterances():
+        yield utterance(1)
+        yield utterance(2)
+
+    async def main():
+        return [e async for e in stt_stream(utterances(), streaming=False, turns=turns)]
+
+    events = asyncio.run(main())
+    assert {e.turn_id for e in events} == {2}
+    assert stt.cancelled == []
+
+
+class EnergyEngine(SileroOnnxEngine):
+    """Stand-in for the Silero model: loud windows are speech."""
+
+    def __init__(self):
+        pass
+
+    def new_state(self, sample_rate: int = SAMPLE_RATE) -> VADState:
+        return VADState(sample_rate)
+
+    def __call__(self, window: np.ndarray, state: VADState) -> float:
+        return 0.9 if np.sqrt(np.mean(np.square(window))) > 0.05 else 0.05
+
+
+def test_confirmed_speech_cancels_the_previous_turn(monkeypatch):
+    stt = FakeSTT()
+    monkeypatch.setattr(pipeline.stt_client, "StreamingTranscriber", stt.streaming_transcriber)
+    monkeypatch.setattr(pipeline.translation_client, "translate_indic_to_english", lambda *args: asyncio.sleep(0, ""))
+    monkeypatch.setattr(pipeline, "PREDICTIVE_WARMUP", False)
+    monkeypatch.setattr(pipeline, "BARGE_IN", True)
+    monkeypatch.setattr(
+        pipeline, "SileroVAD",
+        lambda **kwargs: SileroVAD(engine=EnergyEngine(), noise_gate=False, adaptive_endpointing=False, **kwargs),
+    )
+    monkeypatch.setattr(pipeline, "vad_stream", lambda audio, vad: vad_stream(audio, vad, batching=False))
+
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    speech = 0.3 * np.sin(2 * np.pi * 200 * t)
+    silence = np.zeros(SAMPLE_RATE)
+    audio = (np.concatenate([speech, silence, speech, silence]) * 32767).astype(np.int16).tobytes()
+
+    async def chunks():
+        for i in range(0, len(audio), 1024):
+            yield audio[i:i + 1024]
+            await asyncio.sleep(0)
+
+    async def main():
+        return [e async for e in full_pipeline(chunks())]
+
+    start = time.perf_counter()
+    events = asyncio.run(main())
+    # Turn 1's stream was still waiting for its final when turn 2 was confirmed
+    assert time.perf_counter() - start < 5
+    assert stt.streams == 2
+    assert stt.closed_streams == {1, 2}
+    assert [e.turn_id for e in events if isinstance(e, TurnCancelledEvent)] == [1]
+    assert [(e.turn_id, e.transcript) for e in events if isinstance(e, STTOutputEvent)] == [(2, "stream 2")]
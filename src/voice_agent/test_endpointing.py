@@ -0,0 +1,63 @@
+"""
+Tests for the adaptive end-of-turn silence timeout.
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.endpointing import AdaptiveEndpointer, estimate_pitch
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+T = np.arange(WINDOW) / SAMPLE_RATE
+
+
+def tone(freq: float, amplitude: float) -> np.ndarray:
+    return (amplitude * np.sin(2 * np.pi * freq * T)).astype(np.float32)
+
+
+def test_estimate_pitch():
+    assert estimate_pitch(tone(200, 0.3)) == 200.0
+    assert estimate_pitch(np.zeros(WINDOW, np.float32)) == 0.0
+    noise = np.random.default_rng(0).standard_normal(WINDOW).astype(np.float32) * 0.1
+    assert estimate_pitch(noise) == 0.0
+
+
+def test_timeout_without_signals_is_the_maximum():
+    endpointer = AdaptiveEndpointer(min_silence_ms=200, max_silence_ms=500)
+    assert endpointer.silence_timeout_ms(threshold=0.5) == 500
+
+
+def test_finished_phrase_shortens_the_timeout():
+    endpointer = AdaptiveEndpointer(min_silence_ms=200, max_silence_ms=500)
+    # ~3s of speech with falling energy and pitch, then confident silence
+    for i in range(100):
+        endpointer.observe(tone(220 - 0.8 * i, 0.5 * 0.97 ** i), speech_prob=0.9, is_speech=True)
+    for _ in range(4):
+        endpointer.observe(np.zeros(WINDOW, np.float32), speech_prob=0.02, is_speech=False)
+
+    timeout = endpointer.silence_timeout_ms(threshold=0.5)
+    assert 200 <= timeout < 350
+    signals = endpointer.last_signals
+    assert signals["length"] == 1.0
+    assert signals["prob"] > 0.9
+    assert signals["energy"] > 0 and signals["pitch"] > 0
+
+
+def test_hovering_probability_keeps_the_timeout_long():
+    endpointer = AdaptiveEndpointer(min_silence_ms=200, max_silence_ms=500)
+    for _ in range(4):
+        endpointer.observe(np.zeros(WINDOW, np.float32), speech_prob=0.4, is_speech=False)
+    assert endpointer.silence_timeout_ms(threshold=0.5) == 500
+
+
+def test_vote_applies_to_the_current_turn_only():
+    endpointer = AdaptiveEndpointer(min_silence_ms=200, max_silence_ms=500)
+    endpointer.vote_complete()
+    assert endpointer.silence_timeout_ms(threshold=0.5) == 200
+    endpointer.start_turn()
+    assert endpointer.silence_timeout_ms(threshold=0.5) == 500
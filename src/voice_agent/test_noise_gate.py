@@ -0,0 +1,86 @@
+"""
+Tests for the VAD energy pre-gate and noise-floor tracking.
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.noise_gate import NoiseGate, PREROLL_WINDOWS
+
+WINDOW = 512
+RNG = np.random.default_rng(0)
+
+
+def hiss(amplitude: float) -> np.ndarray:
+    return (RNG.standard_normal(WINDOW) * amplitude).astype(np.float32)
+
+
+def voice(amplitude: float = 0.3) -> np.ndarray:
+    return (amplitude * np.sin(2 * np.pi * 200 * np.arange(WINDOW) / 16000)).astype(np.float32)
+
+
+def power(window: np.ndarray) -> float:
+    return float(np.dot(window, window))
+
+
+def make_gate() -> NoiseGate:
+    return NoiseGate(margin_db=3.0, abs_silence_db=-60.0, min_snr_db=6.0)
+
+
+def test_digital_silence_always_skips():
+    gate = make_gate()
+    assert gate.should_skip(np.zeros(WINDOW, np.float32))
+    assert gate.skipped == 1
+
+
+def test_floor_is_learned_from_non_speech():
+    gate = make_gate()
+    noise = hiss(0.002)
+    assert not gate.should_skip(noise)  # No floor yet: the model decides
+    gate.update(is_speech=False, skipped=False)
+    assert gate.noise_floor_db is not None
+    assert gate.should_skip(hiss(0.002))
+    assert not gate.should_skip(voice())
+
+
+def test_skipped_windows_only_lower_the_floor():
+    gate = make_gate()
+    gate.should_skip(hiss(0.002))
+    gate.update(is_speech=False, skipped=False)
+    floor = gate.noise_floor_db
+
+    gate.should_skip(hiss(0.0025))
+    gate.update(is_speech=False, skipped=True)
+    assert gate.noise_floor_db == floor
+
+    gate.should_skip(hiss(0.001))
+    gate.update(is_speech=False, skipped=True)
+    assert gate.noise_floor_db < floor
+
+
+def test_preroll_keeps_the_latest_skipped_windows():
+    gate = make_gate()
+    for _ in range(PREROLL_WINDOWS + 3):
+        gate.should_skip(np.zeros(WINDOW, np.float32))
+    assert len(gate.take_preroll()) == PREROLL_WINDOWS
+    assert gate.take_preroll() == []
+
+
+def test_is_speech_level():
+    gate = make_gate()
+    gate.should_skip(hiss(0.002))
+    gate.update(is_speech=False, skipped=False)
+
+    loud = power(voice())
+    weak = power(hiss(0.0025))
+    # Trailing silence padding does not pull a real utterance under the floor
+    assert gate.is_speech_level([loud] * 10 + [weak] * 8, WINDOW)
+
+    assert not gate.is_speech_level([weak] * 10, WINDOW, record=False)
+    assert gate.rejected_utterances == 0
+    assert not gate.is_speech_level([weak] * 10, WINDOW)
+    assert gate.rejected_utterances == 1
@@ -0,0 +1,203 @@
+"""
+Tests for the queue-connected pipeline engine: job ordering and cancellation.
+"""
+import asyncio
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.events import AgentChunkEvent, STTOutputEvent, TurnCancelledEvent
+from src.voice_agent.pipeline_engine import PipelineEngine, Stage
+
+
+class EchoStage(Stage):
+    """Turns each transcript into one job per word, finishing in reverse order."""
+
+    name = "echo"
+
+    def __init__(self, concurrency: int = 4, delay: float = 0.01):
+        self.concurrency = concurrency
+        self.delay = delay
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+        self.cancelled_turns: list[int] = []
+
+    def accepts(self, event):
+        return isinstance(event, STTOutputEvent)
+
+    def plan(self, event):
+        words = event.transcript.split()
+        return [self._job(word, self.delay * (len(words) - i)) for i, word in enumerate(words)]
+
+    def cancel_turn(self, turn_id):
+        self.cancelled_turns.append(turn_id)
+
+    async def _job(self, word, delay):
+        self.started.append(word)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(word)
+            raise
+        yield AgentChunkEvent.create(word)
+
+
+def transcript(text: str, turn_id: int) -> STTOutputEvent:
+    event = STTOutputEvent.create(text)
+    event.turn_id = turn_id
+    return event
+
+
+async def collect(engine: PipelineEngine, source) -> list:
+    return [event async for event in engine.run(source)]
+
+
+def chunks(events, turn_id: int) -> list[str]:
+    return [e.text for e in events if isinstance(e, AgentChunkEvent) and e.turn_id == turn_id]
+
+
+def test_jobs_are_released_in_plan_order():
+    stage = EchoStage()
+
+    async def source():
+        yield transcript("one two three four", 1)
+        yield transcript("five six", 2)
+
+    events = asyncio.run(collect(PipelineEngine([stage]), source()))
+    assert chunks(events, 1) == ["one", "two", "three", "four"]
+    assert chunks(events, 2) == ["five", "six"]
+    # The source events come first, then the stage output
+    assert isinstance(events[0], STTOutputEvent)
+
+
+def test_cancel_turns_stops_running_jobs():
+    stage = EchoStage(delay=0.05)
+
+    async def main():
+        engine = PipelineEngine([stage])
+
+        async def source():
+            yield transcript("slow words here", 1)
+            await asyncio.sleep(0.02)
+            assert engine.cancel_turns(before=2) == [1]
+            yield transcript("next", 2)
+
+        return await collect(engine, source())
+
+    events = asyncio.run(main())
+    assert chunks(events, 1) == []
+    assert chunks(events, 2) == ["next"]
+    assert sorted(stage.cancelled) == ["here", "slow", "words"]
+    assert stage.cancelled_turns == [1]
+    assert [e.turn_id for e in events if isinstance(e, TurnCancelledEvent)] == [1]
+
+
+def test_cancel_turns_notifies_a_finished_turn():
+    stage = EchoStage(delay=0)
+
+    async def main():
+        engine = PipelineEngine([stage])
+
+        async def source():
+            yield transcript("done", 1)
+            await asyncio.sleep(0.02)  # Turn 1 has finished in the pipeline
+            # Its audio may still be playing on the client: it is still notified
+            assert engine.cancel_turns(before=2) == []
+            assert engine.cancel_turns(before=2) == []  # Already cancelled: no-op
+            yield transcript("next", 2)
+
+        return await collect(engine, source())
+
+    events = asyncio.run(main())
+    assert chunks(events, 1) == ["done"]
+    assert [e.turn_id for e in events if isinstance(e, TurnCancelledEvent)] == [1]
+    assert stage.cancelled_turns == []
+
+
+def test_events_of_cancelled_turns_are_dropped():
+    stage = EchoStage(delay=0)
+
+    async def main():
+        engine = PipelineEngine([stage])
+        engine.cancel_turns(before=3)
+
+        async def source():
+            yield transcript("stale", 2)
+            yield transcript("fresh", 3)
+
+        return await collect(engine, source())
+
+    events = asyncio.run(main())
+    assert {e.turn_id for e in events} == {3}
+    assert stage.started == ["fresh"]
+
+
+def test_cancel_jobs_keeps_the_turn_going():
+    stage = EchoStage(delay=0.05)
+
+    async def main():
+        engine = PipelineEngine([stage])
+
+        async def source():
+            yield transcript("draft answer", 1)
+            await asyncio.sleep(0.02)
+            engine.cancel_jobs(stage, 1)
+            yield transcript("final", 1)
+
+        return await collect(engine, source())
+
+    events = asyncio.run(main())
+    assert chunks(events, 1) == ["final"]
+    assert sorted(stage.cancelled) == ["answer", "draft"]
+    assert not any(isinstance(e, TurnCancelledEvent) for e in events)
+
+
+def test_concurrency_limit():
+    stage = EchoStage(concurrency=2, delay=0.01)
+    running = 0
+    peak = 0
+    job = stage._job
+
+    async def tracked(word, delay):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            async for event in job(word, delay):
+                yield event
+        finally:
+            running -= 1
+
+    stage._job = tracked
+
+    async def source():
+        yield transcript("a b c d e", 1)
+
+    events = asyncio.run(collect(PipelineEngine([stage]), source()))
+    assert chunks(events, 1) == ["a", "b", "c", "d", "e"]
+    assert peak == 2
+
+
+def test_cancel_notice_counts_as_pending_work():
+    stage = EchoStage(delay=0)
+
+    async def main():
+        engine = PipelineEngine([stage])
+
+        async def source():
+            yield transcript("done", 1)
+            await asyncio.sleep(0.02)  # Turn 1 has finished: only the source is busy
+            busy = engine._busy
+            engine.cancel_turns(before=2)
+            # The output stream cannot end until the notice has been sent
+            assert engine._busy == busy + 1
+
+        events = await collect(engine, source())
+        assert engine._busy == 0
+        return events
+
+    events = asyncio.run(main())
+    assert isinstance(events[-1], TurnCancelledEvent)
+    assert events[-1].turn_id == 1
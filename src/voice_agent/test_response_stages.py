@@ -0,0 +1,165 @@
+"""
+Tests for segment-by-segment translation and TTS of agent answers
+(EnIndicStage and TTSStage on the pipeline engine, backends replaced).
+"""
+import asyncio
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent import pipeline
+from src.voice_agent.events import (
+    AgentChunkEvent,
+    AgentEndEvent,
+    ResponseRestartEvent,
+    ToolCallEvent,
+    TranslationEvent,
+    TTSChunkEvent,
+    TTSCompleteEvent,
+)
+from src.voice_agent.pipeline import AgentStage, EnIndicStage, TTSStage
+from src.voice_agent.pipeline_engine import PipelineEngine
+
+FIRST = "Bengaluru is the capital of Karnataka, "
+SECOND = "and it is known for its parks and lakes. It is also a technology hub with many software companies and startups. "
+THIRD = "The weather is pleasant for most of the year."
+
+
+class FakeBackends:
+    """Stand-ins for the translation and TTS clients."""
+
+    def __init__(self, fail_translation: str | None = None, fail_tts: str | None = None, delay: float = 0.0):
+        self.fail_translation = fail_translation
+        self.fail_tts = fail_tts
+        self.delay = delay
+        self.translated: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def translate(self, text, tgt_lang=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        self.translated.append(text)
+        if self.fail_translation and self.fail_translation in text:
+            raise RuntimeError("translation failed")
+        return f"kn({text})"
+
+    async def synthesize(self, text):
+        if self.fail_tts and self.fail_tts in text:
+            return b""
+        return text.encode()
+
+
+def agent_events(*items):
+    async def source():
+        yield AgentChunkEvent.create(text="")  # Agent start
+        for item in items:
+            if isinstance(item, str):
+                yield AgentChunkEvent.create(text=item)
+            else:
+                yield item
+            await asyncio.sleep(0.01)
+        yield AgentEndEvent.create(full_response="".join(i for i in items if isinstance(i, str)))
+    return source()
+
+
+def run(backends: FakeBackends, source, monkeypatch) -> list:
+    monkeypatch.setattr(pipeline.translation_client, "translate_english_to_indic", backends.translate)
+    monkeypatch.setattr(pipeline.tts_client, "synthesize", backends.synthesize)
+
+    async def main():
+        engine = PipelineEngine([EnIndicStage(streaming=True), TTSStage()])
+        return [event async for event in engine.run(source)]
+
+    return asyncio.run(main())
+
+
+def audio_seqs(events) -> list[tuple[int, bool]]:
+    return [(e.seq, e.skipped) for e in events if isinstance(e, TTSChunkEvent) and (e.audio or e.skipped)]
+
+
+def test_segments_are_numbered_in_order(monkeypatch):
+    events = run(FakeBackends(), agent_events(FIRST, SECOND, THIRD), monkeypatch)
+    translations = [e for e in events if isinstance(e, TranslationEvent) and e.text]
+    assert [e.seq for e in translations] == [0, 1, 2]
+    assert translations[-1].final
+    assert audio_seqs(events) == [(0, False), (1, False), (2, False)]
+    assert isinstance(events[-1], TTSCompleteEvent)
+
+
+def test_failed_translation_still_reaches_the_client(monkeypatch):
+    backends = FakeBackends(fail_translation="parks")
+    events = run(backends, agent_events(FIRST, SECOND, THIRD), monkeypatch)
+    skipped = [e for e in events if isinstance(e, TranslationEvent) and e.skipped]
+    assert [e.seq for e in skipped] == [1]
+    # Every seq is accounted for, so playback does not stall at the gap
+    assert audio_seqs(events) == [(0, False), (1, True), (2, False)]
+
+
+def test_failed_synthesis_still_reaches_the_client(monkeypatch):
+    events = run(FakeBackends(fail_tts="parks"), agent_events(FIRST, SECOND, THIRD), monkeypatch)
+    assert audio_seqs(events) == [(0, False), (1, True), (2, False)]
+    assert isinstance(events[-1], TTSCompleteEvent)
+
+
+def test_tool_call_withdraws_sent_segments(monkeypatch):
+    backends = FakeBackends(delay=0.05)
+    tool_call = ToolCallEvent.create(id="1", name="search", args={"query": "weather"})
+    events = run(backends, agent_events(FIRST, tool_call, THIRD), monkeypatch)
+
+    restarts = [e for e in events if isinstance(e, ResponseRestartEvent)]
+    assert [e.seq for e in restarts] == [1]
+    assert backends.cancelled == [FIRST.strip()]
+    # The answer continues after the withdrawn seq
+    assert audio_seqs(events) == [(1, False)]
+    assert [e.audio for e in events if isinstance(e, TTSChunkEvent) and e.audio] == [
+        f"kn({THIRD})".encode()
+    ]
+
+
+def test_tool_call_before_any_segment_is_not_a_restart(monkeypatch):
+    tool_call = ToolCallEvent.create(id="1", name="search", args={"query": "weather"})
+    events = run(FakeBackends(), agent_events("Let me ", tool_call, THIRD), monkeypatch)
+    assert not any(isinstance(e, ResponseRestartEvent) for e in events)
+    assert audio_seqs(events) == [(0, False)]
+
+
+def test_agent_failure_mid_answer_ends_with_the_apology(monkeypatch):
+    async def failing_agent(query):
+        yield AgentChunkEvent.create(text=FIRST)
+        yield AgentChunkEvent.create(text="and it is known for")
+        raise RuntimeError("LLM connection reset")
+
+    monkeypatch.setattr(pipeline, "astream_agent", failing_agent)
+
+    async def source():
+        yield TranslationEvent.create(
+            text="What is the capital of Karnataka?",
+            src_lang="kan_Knda",
+            tgt_lang="eng_Latn",
+            direction="indic_to_en",
+        )
+
+    backends = FakeBackends()
+    monkeypatch.setattr(pipeline.translation_client, "translate_english_to_indic", backends.translate)
+    monkeypatch.setattr(pipeline.tts_client, "synthesize", backends.synthesize)
+
+    async def main():
+        engine = PipelineEngine([AgentStage(), EnIndicStage(streaming=True), TTSStage()])
+        return [event async for event in engine.run(source())]
+
+    events = asyncio.run(main())
+    assert [e.error for e in events if isinstance(e, AgentEndEvent)] == [True]
+    translations = [e for e in events if isinstance(e, TranslationEvent) and e.direction == "en_to_indic" and e.text]
+    # The unfinished sentence is not spoken; the apology closes the answer
+    assert [e.text for e in translations] == [
+        f"kn({FIRST.strip()})",
+        "kn(Sorry, I couldn't process that request.)",
+    ]
+    assert translations[-1].final
+    assert audio_seqs(events) == [(0, False), (1, False)]
+    assert isinstance(events[-1], TTSCompleteEvent)
@@ -0,0 +1,63 @@
+"""
+Tests for sentence/clause segmentation and the streaming segmenter.
+"""
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.segmentation import (
+    IncrementalSegmenter,
+    join_segments,
+    split_clauses,
+    split_segments,
+    split_sentences,
+)
+
+
+def test_split_sentences_keeps_abbreviations_and_list_markers():
+    text = "Dr. Smith arrived. He said hi! 1. First item."
+    assert split_sentences(text) == ["Dr. Smith arrived.", "He said hi!", "1. First item."]
+
+
+def test_split_sentences_on_danda():
+    assert split_sentences("ನಮಸ್ಕಾರ। ಹೇಗಿದ್ದೀರಾ?", lang="kan") == ["ನಮಸ್ಕಾರ।", "ಹೇಗಿದ್ದೀರಾ?"]
+
+
+def test_split_clauses_respects_max_words():
+    chunks = split_clauses("a b c, d e f, g h i j k", max_words=4)
+    assert chunks == ["a b c,", "d e f,", "g h i j", "k"]
+    assert all(len(chunk.split()) <= 4 for chunk in chunks)
+    assert split_clauses("short sentence", max_words=4) == ["short sentence"]
+
+
+def test_split_segments_round_trips_layout():
+    text = "One two three four five six. Hi.\nSeven eight nine ten eleven."
+    segments = split_segments(text, min_words=3)
+    # "Hi." is merged into its neighbour on the same line, not across the line break
+    assert segments == [("One two three four five six. Hi.", "\n"), ("Seven eight nine ten eleven.", " ")]
+    assert join_segments([s for s, _ in segments], [sep for _, sep in segments]) == text
+
+
+def test_incremental_segmenter_cuts_first_segment_early():
+    segmenter = IncrementalSegmenter(first_words=3, segment_words=6, max_words=10)
+    segments = []
+    for word in "Hello there my friend, how are you today? I am fine. Thanks for asking. Bye".split(" "):
+        segments += segmenter.feed(word + " ")
+    assert segments == ["Hello there my friend,", "how are you today? I am fine."]
+    assert segmenter.flush() == "Thanks for asking. Bye"
+    assert segmenter.emitted == 3
+
+
+def test_incremental_segmenter_caps_segment_length():
+    segmenter = IncrementalSegmenter(first_words=3, segment_words=6, max_words=5)
+    assert segmenter.feed("a b c d e f g h i j k l ") == ["a b c d e", "f g h i j"]
+    assert segmenter.flush() == "k l"
+
+
+def test_incremental_segmenter_waits_for_confirmed_boundary():
+    segmenter = IncrementalSegmenter(first_words=1, segment_words=1)
+    # "3." could still become "3.5": no cut until whitespace follows
+    assert segmenter.feed("It costs 3.") == []
+    assert segmenter.feed("5 rupees. ") == ["It costs 3.5 rupees."]
@@ -0,0 +1,116 @@
+"""
+Tests for the two-tier translation cache.
+"""
+import asyncio
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.translation_cache import TranslationCache, normalize
+
+
+class CountingTranslator:
+    """translate() stand-in that counts calls and can be held open."""
+
+    def __init__(self, result: str = "hello", delay: float = 0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+def test_normalize():
+    assert normalize("  ನಮಸ್ಕಾರ \n  ಹೇಗಿದ್ದೀರಾ ") == "ನಮಸ್ಕಾರ ಹೇಗಿದ್ದೀರಾ"
+    assert TranslationCache.key("a  b", "en", "kn", "v1") == TranslationCache.key("a b", "en", "kn", "v1")
+    assert TranslationCache.key("a b", "en", "kn", "v1") != TranslationCache.key("a b", "en", "kn", "v2")
+
+
+def test_memory_hit():
+    cache = TranslationCache(path=None)
+    translate = CountingTranslator()
+
+    async def main():
+        assert await cache.get_or_translate("ನಮಸ್ಕಾರ", "kan_Knda", "eng_Latn", "v1", translate) == "hello"
+        assert await cache.get_or_translate("ನಮಸ್ಕಾರ ", "kan_Knda", "eng_Latn", "v1", translate) == "hello"
+
+    asyncio.run(main())
+    assert translate.calls == 1
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = TranslationCache(path=None)
+    translate = CountingTranslator(delay=0.01)
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate) for _ in range(5))
+        )
+
+    assert asyncio.run(main()) == ["hello"] * 5
+    assert translate.calls == 1
+    assert cache.coalesced == 4
+    assert cache.stats()["inflight"] == 0
+
+
+def test_cancelled_leader_does_not_fail_waiters():
+    cache = TranslationCache(path=None)
+    translate = CountingTranslator(delay=0.01)
+
+    async def main():
+        leader = asyncio.create_task(cache.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(main()) == "hello"
+    assert translate.calls == 2
+
+
+def test_empty_translation_is_not_cached():
+    cache = TranslationCache(path=None)
+    translate = CountingTranslator(result="")
+
+    async def main():
+        for _ in range(2):
+            await cache.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate)
+
+    asyncio.run(main())
+    assert translate.calls == 2
+
+
+def test_disk_hit_across_instances(tmp_path):
+    path = str(tmp_path / "cache" / "translations.db")
+    translate = CountingTranslator()
+
+    writer = TranslationCache(path=path)
+    asyncio.run(writer.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate))
+    writer.close()  # Waits for the queued write
+
+    reader = TranslationCache(path=path)
+    try:
+        result = asyncio.run(reader.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", translate))
+    finally:
+        reader.close()
+    assert result == "hello"
+    assert translate.calls == 1
+    assert reader.disk_hits == 1
+    assert reader.disk_errors == 0
+
+
+def test_close_is_idempotent(tmp_path):
+    cache = TranslationCache(path=str(tmp_path / "translations.db"))
+    cache.close()  # Never used: nothing to shut down
+    asyncio.run(cache.get_or_translate("text", "eng_Latn", "kan_Knda", "v1", CountingTranslator()))
+    cache.close()
+    cache.close()
+    assert cache._db is None
@@ -0,0 +1,121 @@
+"""
+Tests for batching (and cancelling) segment translations in translation_client.
+"""
+import asyncio
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent import translation_client
+from src.voice_agent.translation_client import _SegmentBatch
+
+
+class FakeBackend:
+    """Replaces _translate_batch: records requests and can be held open."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.requests: list[list[str]] = []
+        self.cancelled = 0
+
+    async def __call__(self, texts, direction, lang, profile):
+        self.requests.append(list(texts))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return [text.upper() for text in texts]
+
+
+def run_with(backend: FakeBackend, coro_fn, monkeypatch):
+    monkeypatch.setattr(translation_client, "_translate_batch", backend)
+    return asyncio.run(coro_fn())
+
+
+def test_segments_go_out_in_one_request(monkeypatch):
+    backend = FakeBackend()
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        return await asyncio.gather(*(batch.translate(text) for text in ("a", "b", "c")))
+
+    assert run_with(backend, main, monkeypatch) == ["A", "B", "C"]
+    assert backend.requests == [["a", "b", "c"]]
+
+
+def test_requests_are_chunked_by_batch_size(monkeypatch):
+    backend = FakeBackend()
+    monkeypatch.setattr(translation_client, "TRANSLATION_BATCH_SIZE", 2)
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        return await asyncio.gather(*(batch.translate(text) for text in ("a", "b", "c")))
+
+    assert run_with(backend, main, monkeypatch) == ["A", "B", "C"]
+    assert backend.requests == [["a", "b"], ["c"]]
+
+
+def test_errors_reach_every_caller(monkeypatch):
+    backend = FakeBackend(error=ValueError("backend down"))
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        return await asyncio.gather(*(batch.translate(text) for text in ("a", "b")), return_exceptions=True)
+
+    results = run_with(backend, main, monkeypatch)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_flush_is_aborted_when_every_caller_is_cancelled(monkeypatch):
+    backend = FakeBackend(delay=1.0)
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        callers = [asyncio.create_task(batch.translate(text)) for text in ("a", "b")]
+        await asyncio.sleep(0.01)  # The request is in flight
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+    run_with(backend, main, monkeypatch)
+    assert backend.requests == [["a", "b"]]
+    assert backend.cancelled == 1
+
+
+def test_flush_continues_while_a_caller_still_waits(monkeypatch):
+    backend = FakeBackend(delay=0.02)
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        first = asyncio.create_task(batch.translate("a"))
+        second = asyncio.create_task(batch.translate("b"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert run_with(backend, main, monkeypatch) == "B"
+    assert backend.cancelled == 0
+
+
+def test_cancel_before_the_flush_starts_sends_nothing(monkeypatch):
+    backend = FakeBackend()
+
+    async def main():
+        batch = _SegmentBatch("en_indic", "kan_Knda", "realtime")
+        caller = asyncio.create_task(batch.translate("a"))
+        await asyncio.sleep(0)  # Future registered, flush task not run yet
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        # The batch is reusable afterwards
+        return await batch.translate("b")
+
+    assert run_with(backend, main, monkeypatch) == "B"
+    assert backend.requests == [["b"]]
@@ -0,0 +1,56 @@
+"""
+Tests for the VAD benchmark's reference labels and endpoint scoring.
+"""
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.vad_benchmark import energy_segments, load_reference, score_endpoints
+
+SAMPLE_RATE = 16000
+
+
+def pcm(*parts: tuple[str, float]) -> bytes:
+    """Concatenate ("speech" | "silence", seconds) parts into int16 PCM."""
+    audio = []
+    for kind, seconds in parts:
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        audio.append(0.3 * np.sin(2 * np.pi * 200 * t) if kind == "speech" else np.zeros(len(t)))
+    return (np.concatenate(audio) * 32767).astype(np.int16).tobytes()
+
+
+def test_energy_segments_merge_short_pauses():
+    audio = pcm(("silence", 0.5), ("speech", 1.0), ("silence", 0.2), ("speech", 0.5), ("silence", 1.0), ("speech", 0.5), ("silence", 0.5))
+    assert energy_segments(audio, min_gap_ms=500) == [(500.0, 2200.0), (3200.0, 3700.0)]
+
+
+def test_energy_segments_drop_clicks():
+    audio = pcm(("silence", 0.5), ("speech", 0.05), ("silence", 1.0), ("speech", 0.5), ("silence", 0.5))
+    assert energy_segments(audio, min_speech_ms=100) == [(1550.0, 2050.0)]
+
+
+def test_sidecar_labels_are_in_seconds(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps({"speech": [[2.0, 2.5], [0.5, 1.25]]}))
+    args = SimpleNamespace(reference="sidecar")
+    assert load_reference(str(tmp_path / "a.wav"), b"", args) == [(500.0, 1250.0), (2000.0, 2500.0)]
+    assert load_reference(str(tmp_path / "b.wav"), b"", args) is None
+
+
+def test_score_endpoints_counts_delay_misses_and_false_cuts():
+    reference = [(500.0, 1500.0), (3000.0, 4000.0), (6000.0, 7000.0)]
+    # 1900: end of the first utterance; 3500: cut mid-utterance; the second
+    # is merged into the third, so 7600 is the third's end
+    score = score_endpoints(reference, [7600.0, 1900.0, 3500.0], tolerance_ms=200)
+    assert score == {"eos_delay_ms": [400.0, 600.0], "missed_ends": 1, "false_cuts": 1}
+
+
+def test_score_endpoints_allows_slightly_early_ends():
+    score = score_endpoints([(0.0, 1000.0)], [900.0], tolerance_ms=200)
+    assert score == {"eos_delay_ms": [-100.0], "missed_ends": 0, "false_cuts": 0}
+    assert score_endpoints([(0.0, 1000.0)], [700.0], tolerance_ms=200)["false_cuts"] == 1
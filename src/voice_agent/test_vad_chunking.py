@@ -0,0 +1,69 @@
+"""
+Tests that the VAD sees the same audio however the client chunks it,
+including chunks that split a 16-bit sample.
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.vad import SileroVAD, Utterance
+from src.voice_agent.vad_engine import SileroOnnxEngine, VADState
+
+SAMPLE_RATE = 16000
+
+
+class EnergyEngine(SileroOnnxEngine):
+    """Stand-in for the Silero model: loud windows are speech."""
+
+    def __init__(self):
+        self.windows: list[np.ndarray] = []
+
+    def new_state(self, sample_rate: int = SAMPLE_RATE) -> VADState:
+        return VADState(sample_rate)
+
+    def __call__(self, window: np.ndarray, state: VADState) -> float:
+        self.windows.append(window.copy())
+        return 0.9 if np.sqrt(np.mean(np.square(window))) > 0.05 else 0.05
+
+
+def speech_then_silence() -> bytes:
+    """0.5s silence, 1s of a loud tone, 1s silence (16-bit PCM)."""
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    tone = 0.3 * np.sin(2 * np.pi * 200 * t)
+    audio = np.concatenate([np.zeros(SAMPLE_RATE // 2), tone, np.zeros(SAMPLE_RATE)])
+    noise = np.random.default_rng(0).standard_normal(len(audio)) * 0.001
+    return ((audio + noise) * 32767).astype(np.int16).tobytes()
+
+
+def run(data: bytes, chunk_size: int) -> tuple[EnergyEngine, list]:
+    engine = EnergyEngine()
+    vad = SileroVAD(engine=engine, noise_gate=False, adaptive_endpointing=False, max_utterance_ms=0)
+    results = []
+    for i in range(0, len(data), chunk_size):
+        results += vad.process_chunk(data[i:i + chunk_size])
+    return engine, results
+
+
+def test_odd_sized_chunks_keep_sample_alignment():
+    data = speech_then_silence()
+    engine, _ = run(data, 777)
+    seen = np.concatenate(engine.windows)
+    expected = np.frombuffer(data, dtype=np.int16)[:len(seen)] / 32768.0
+    assert np.allclose(seen, expected)
+    assert len(seen) == len(data) // 2 // 512 * 512
+
+
+def test_results_do_not_depend_on_chunk_size():
+    data = speech_then_silence()
+    runs = [run(data, size) for size in (1, 777, 512, 1024, 4096)]
+
+    reference_windows = np.concatenate(runs[0][0].windows)
+    reference = [u.audio for u in runs[0][1] if isinstance(u, Utterance)]
+    assert len(reference) == 1
+    for engine, results in runs[1:]:
+        assert np.array_equal(np.concatenate(engine.windows), reference_windows)
+        assert [u.audio for u in results if isinstance(u, Utterance)] == reference
@@ -0,0 +1,152 @@
+"""
+Tests for cross-session batched VAD inference (VADScheduler).
+"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent.vad_engine import SileroOnnxEngine, VADState, get_engine, window_size_for
+from src.voice_agent.vad_scheduler import VADScheduler
+
+
+class MeanEngine(SileroOnnxEngine):
+    """Stand-in for the Silero model: the probability is the window's mean."""
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.batches: list[list[int]] = []  # Sample rate of each window, per forward pass
+
+    def run_batch(self, windows, states):
+        self.batches.append([state.sample_rate for state in states])
+        if self.error:
+            raise self.error
+        return np.array([window.mean() for window in windows], dtype=np.float32)
+
+
+def window(value: float, sample_rate: int = 16000) -> np.ndarray:
+    return np.full(window_size_for(sample_rate), value, dtype=np.float32)
+
+
+def test_windows_of_concurrent_sessions_share_a_forward_pass():
+    engine = MeanEngine()
+
+    async def main():
+        scheduler = VADScheduler(engine, tick_ms=5)
+        probs = await asyncio.gather(*(scheduler.infer(window(i / 10), VADState()) for i in range(5)))
+        await scheduler.close()
+        return probs, scheduler.stats()
+
+    probs, stats = asyncio.run(main())
+    # Each session gets the probability of its own window
+    assert probs == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert engine.batches == [[16000] * 5]
+    assert stats["batches"] == 1 and stats["max_batch_size"] == 5
+
+
+def test_batches_are_capped_and_split_by_sample_rate():
+    engine = MeanEngine()
+
+    async def main():
+        scheduler = VADScheduler(engine, max_batch_size=3, tick_ms=5)
+        requests = [
+            scheduler.infer(window(0.5, rate), VADState(rate))
+            for rate in (16000, 8000, 16000, 16000, 16000)
+        ]
+        probs = await asyncio.gather(*requests)
+        await scheduler.close()
+        return probs
+
+    assert asyncio.run(main()) == pytest.approx([0.5] * 5)
+    # First tick: 3 windows in two passes (one per rate); second tick: the rest
+    assert engine.batches == [[16000, 16000], [8000], [16000, 16000]]
+
+
+def test_engine_errors_reach_every_waiting_session():
+    engine = MeanEngine(error=RuntimeError("inference failed"))
+
+    async def main():
+        scheduler = VADScheduler(engine, tick_ms=5)
+        results = await asyncio.gather(
+            *(scheduler.infer(window(0.5), VADState()) for _ in range(3)), return_exceptions=True
+        )
+        # The loop survives the failure
+        engine.error = None
+        prob = await scheduler.infer(window(0.25), VADState())
+        await scheduler.close()
+        return results, prob
+
+    results, prob = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert prob == pytest.approx(0.25)
+
+
+def test_cancelled_requests_are_not_run():
+    engine = MeanEngine()
+
+    async def main():
+        scheduler = VADScheduler(engine, tick_ms=20)
+        dropped = asyncio.create_task(scheduler.infer(window(0.1), VADState()))
+        kept = asyncio.create_task(scheduler.infer(window(0.2), VADState()))
+        await asyncio.sleep(0.005)  # Both queued, the tick has not fired
+        dropped.cancel()
+        prob = await kept
+        await scheduler.close()
+        return prob
+
+    assert asyncio.run(main()) == pytest.approx(0.2)
+    assert engine.batches == [[16000]]
+
+
+def test_close_fails_waiting_sessions():
+    engine = MeanEngine()
+
+    async def main():
+        scheduler = VADScheduler(engine, tick_ms=1000)
+        pending = asyncio.create_task(scheduler.infer(window(0.5), VADState()))
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await pending
+
+    asyncio.run(main())
+    assert engine.batches == []
+
+
+def test_batched_inference_matches_per_session_inference():
+    engine = get_engine()
+    rng = np.random.default_rng(0)
+    t = np.arange(512 * 60) / 16000
+    streams = [
+        (0.3 * np.sin(2 * np.pi * 150 * t) * (1 + np.sin(2 * np.pi * 4 * t))).astype(np.float32),
+        (0.02 * rng.standard_normal(len(t))).astype(np.float32),
+        np.zeros(len(t), dtype=np.float32),
+    ]
+    size = window_size_for(16000)
+
+    expected = []
+    for samples in streams:
+        state = engine.new_state()
+        expected.append([engine(samples[i:i + size], state) for i in range(0, len(samples), size)])
+
+    async def session(scheduler, samples):
+        state = engine.new_state()
+        return [await scheduler.infer(samples[i:i + size], state) for i in range(0, len(samples), size)]
+
+    async def main():
+        scheduler = VADScheduler(engine, tick_ms=1)
+        results = await asyncio.gather(*(session(scheduler, samples) for samples in streams))
+        stats = scheduler.stats()
+        await scheduler.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    # Recurrent state stays per session even though windows share passes
+    for got, want in zip(results, expected):
+        assert got == pytest.approx(want, abs=1e-5)
+    assert stats["max_batch_size"] == len(streams)
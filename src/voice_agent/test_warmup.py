@@ -0,0 +1,60 @@
+"""
+Tests for the warmer's view of backend activity.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.voice_agent import stt_client
+from src.voice_agent.backend_client import backends
+from src.voice_agent.stt_client import StreamingTranscriber
+from src.voice_agent.warmup import BackendWarmer
+
+
+class FakeSocket:
+    """Stand-in for the STT /stream WebSocket: a partial now and then, a final after "end"."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.ended = asyncio.Event()
+
+    async def send(self, message):
+        if isinstance(message, str) and json.loads(message).get("type") == "end":
+            self.ended.set()
+
+    async def __aiter__(self):
+        while not self.ended.is_set():
+            await asyncio.sleep(self.delay)
+            yield json.dumps({"type": "partial", "transcription": "ನಮ"})
+        yield json.dumps({"type": "final", "transcription": "ನಮಸ್ಕಾರ"})
+
+
+def test_stt_stream_traffic_counts_as_activity(monkeypatch):
+    monkeypatch.setattr(backends, "last_response", {})
+
+    @contextlib.asynccontextmanager
+    async def connect(url, **kwargs):
+        yield FakeSocket(delay=0.02)
+
+    monkeypatch.setattr(stt_client.websockets, "connect", connect)
+    warmer = BackendWarmer()
+    assert warmer.idle_for("stt") is None
+
+    async def main():
+        stream = StreamingTranscriber()
+        idle = []
+        for _ in range(10):  # A turn longer than the idle check below
+            stream.send(b"\0\0" * 320)
+            await asyncio.sleep(0.02)
+            idle.append(warmer.idle_for("stt"))
+        return idle, await stream.finish()
+
+    idle, transcript = asyncio.run(main())
+    assert transcript == "ನಮಸ್ಕಾರ"
+    # Stream messages refresh the idle clock, so no warm-up ping is due mid-turn
+    assert all(seconds is not None and seconds < 0.1 for seconds in idle)
@@ -0,0 +1,247 @@
+"""
+Two-tier cache for translations.
+An in-memory LRU in front of a SQLite store on disk (WAL mode, so every
+uvicorn worker on the machine reads and writes the same file). Entries are
+keyed by normalized text, language pair and model version; identical
+requests already in flight share one network call. SQLite runs on a
+dedicated thread, so lock waits and pruning never block the event loop.
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable
+
+from .config import (
+    TRANSLATION_CACHE,
+    TRANSLATION_CACHE_SIZE,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_CACHE_MAX_ROWS,
+    TRANSLATION_MODEL_VERSION,
+)
+
+# Trim the disk store back to max_rows every this many inserts
+PRUNE_EVERY = 1000
+
+
+def normalize(text: str) -> str:
+    """Canonical form of a sentence for cache keys (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationCache:
+    """Memory LRU + SQLite translation store with in-flight request coalescing."""
+
+    def __init__(
+        self,
+        path: str | None = TRANSLATION_CACHE_PATH,
+        max_entries: int = TRANSLATION_CACHE_SIZE,
+        max_rows: int = TRANSLATION_CACHE_MAX_ROWS,
+    ):
+        self.path = path  # None = memory only
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._db: sqlite3.Connection | None = None  # Only used on the cache thread
+        self._executor: ThreadPoolExecutor | None = None
+        self._inserts = 0
+
+        # Stats
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.disk_errors = 0
+
+    @staticmethod
+    def key(text: str, src_lang: str, tgt_lang: str, version: str) -> str:
+        """Cache key: hash of normalized text, language pair and model version."""
+        raw = "\x1f".join((normalize(text), src_lang, tgt_lang, version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_or_translate(
+        self,
+        text: str,
+        src_lang: str,
+        tgt_lang: str,
+        version: str,
+        translate: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        Return the cached translation, or run translate() once and cache it.
+
+        Args:
+            text: Source text
+            src_lang: Source language code
+            tgt_lang: Target language code
+            version: Model/decoding version the translation depends on
+            translate: Coroutine function doing the actual translation
+
+        Returns:
+            Translation
+        """
+        key = self.key(text, src_lang, tgt_lang, version)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This request was cancelled
+                # The request we joined was cancelled: translate on our own
+                return await translate()
+
+        # Registered before the disk lookup, so requests arriving meanwhile join it
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            translation = await self._disk_get(key)
+            if translation is not None:
+                self.disk_hits += 1
+                self._remember(key, translation)
+            else:
+                self.misses += 1
+                translation = await translate()
+                if translation:  # Empty output is never cached
+                    self._remember(key, translation)
+                    self._disk_put(key, text, src_lang, tgt_lang, version, translation)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn if there are none
+            raise
+        else:
+            future.set_result(translation)
+            return translation
+        finally:
+            del self._inflight[key]
+
+    def _remember(self, key: str, translation: str):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, text TEXT, src_lang TEXT, tgt_lang TEXT, "
+                "version TEXT, translation TEXT, created REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations (created)")
+            self._db = db
+        return self._db
+
+    def _thread(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-cache")
+        return self._executor
+
+    async def _disk_get(self, key: str) -> str | None:
+        """Look a key up on disk (on the cache thread, after any queued writes)."""
+        if not self.path:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(self._thread(), self._read, key)
+
+    def _disk_put(self, key: str, text: str, src_lang: str, tgt_lang: str, version: str, translation: str):
+        """Queue a write on the cache thread without waiting for it."""
+        if self.path:
+            self._thread().submit(self._write, key, text, src_lang, tgt_lang, version, translation)
+
+    def _read(self, key: str) -> str | None:
+        try:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            self.disk_errors += 1
+            print(f"⚠️ Translation cache read failed: {e}")
+            return None
+
+    def _write(self, key: str, text: str, src_lang: str, tgt_lang: str, version: str, translation: str):
+        try:
+            db = self._connect()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, text, src_lang, tgt_lang, version, translation, time.time()),
+            )
+            self._inserts += 1
+            if self._inserts % PRUNE_EVERY == 0:
+                db.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    "SELECT key FROM translations ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+        except sqlite3.Error as e:
+            self.disk_errors += 1
+            print(f"⚠️ Translation cache write failed: {e}")
+
+    def stats(self) -> dict:
+        """Hit/miss counters since startup."""
+        lookups = self.memory_hits + self.disk_hits + self.coalesced + self.misses
+        hits = lookups - self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "inflight": len(self._inflight),
+            "disk_errors": self.disk_errors,
+            "path": self.path,
+        }
+
+    def close(self):
+        """Finish queued writes and close the SQLite connection (called from the server lifespan)."""
+        if self._executor is not None:
+            self._executor.submit(self._close_db)
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _close_db(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+translation_cache = TranslationCache()
+
+
+async def cached_translate(
+    text: str,
+    src_lang: str,
+    tgt_lang: str,
+    profile: str,
+    translate: Callable[[], Awaitable[str]],
+) -> str:
+    """Run translate() through the shared cache (a pass-through when disabled)."""
+    if not TRANSLATION_CACHE:
+        return await translate()
+    version = f"{TRANSLATION_MODEL_VERSION}/{profile}"
+    return await translation_cache.get_or_translate(text, src_lang, tgt_lang, version, translate)
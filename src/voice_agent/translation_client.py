@@ -1,91 +1,195 @@
 """
-Translation Client for Modal IndicTrans2 services.
+Translation Client for the Modal IndicTrans2 service (both directions).
+Multi-sentence texts are split into segments that are cached individually
+and translated together as a batch, then reassembled in order.
 """
-import httpx
+import asyncio
+
+from .backend_client import get_client
 from .config import (
-    MODAL_TRANS_INDIC_EN_URL,
-    MODAL_TRANS_EN_INDIC_URL,
     LANGUAGE_SCRIPT,
-    TRANSLATION_TIMEOUT,
+    TRANSLATION_PROFILE,
+    TRANSLATION_SEGMENTING,
+    TRANSLATION_BATCH_SIZE,
+    SEGMENT_MIN_WORDS,
 )
+from .segmentation import split_segments, join_segments
+from .translation_cache import cached_translate
+
+ENGLISH = "eng_Latn"
+
+
+async def _translate(text: str, direction: str, lang: str, profile: str) -> str:
+    translations = await _translate_batch([text], direction, lang, profile)
+    return translations[0] if translations else ""
+
+
+async def _translate_batch(texts: list[str], direction: str, lang: str, profile: str) -> list[str]:
+    response = await get_client("translation").post(
+        "/translate",
+        json={
+            "text": texts,
+            "direction": direction,
+            "lang": lang,
+            "profile": profile,
+        },
+    )
+    response.raise_for_status()
+    translations = response.json()["translations"]
+    if len(translations) != len(texts):
+        raise ValueError(f"Expected {len(texts)} translations, got {len(translations)}")
+    return translations
+
+
+class _SegmentBatch:
+    """
+    Collects the segments of one text that missed the cache and sends them
+    in as few requests as possible (chunks of TRANSLATION_BATCH_SIZE, sent
+    concurrently). The requests run in a separate flush task, which is
+    cancelled once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, direction: str, lang: str, profile: str):
+        self.direction = direction
+        self.lang = lang
+        self.profile = profile
+        self._texts: list[str] = []
+        self._futures: list[asyncio.Future] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def translate(self, text: str) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._texts.append(text)
+        self._futures.append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        flush, futures = self._flush_task, self._futures
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if all(f.done() for f in futures):
+                # Nobody is waiting for this flush any more: abort its requests
+                flush.cancel()
+                if self._flush_task is flush:
+                    self._texts, self._futures, self._flush_task = [], [], None
+            raise
+
+    async def _flush(self):
+        # Let every segment's cache lookup run first, so all misses go out together
+        await asyncio.sleep(0)
+        texts, futures = self._texts, self._futures
+        self._texts, self._futures, self._flush_task = [], [], None
+
+        starts = range(0, len(texts), TRANSLATION_BATCH_SIZE)
+        results = await asyncio.gather(
+            *(
+                _translate_batch(texts[i:i + TRANSLATION_BATCH_SIZE], self.direction, self.lang, self.profile)
+                for i in starts
+            ),
+            return_exceptions=True,
+        )
+        for i, result in zip(starts, results):
+            for j, future in enumerate(futures[i:i + TRANSLATION_BATCH_SIZE]):
+                if future.done():
+                    continue  # Caller was cancelled
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result[j])
+
+
+async def _translate_segments(
+    segments: list[tuple[str, str]],
+    src_lang: str,
+    tgt_lang: str,
+    direction: str,
+    lang: str,
+    profile: str,
+) -> str:
+    """Translate (segment, separator) pairs through the cache as one batch and reassemble them."""
+    batch = _SegmentBatch(direction, lang, profile)
+    translations = await asyncio.gather(
+        *(
+            cached_translate(segment, src_lang, tgt_lang, profile, lambda segment=segment: batch.translate(segment))
+            for segment, _ in segments
+        )
+    )
+    return join_segments(list(translations), [separator for _, separator in segments])
 
 
-async def translate_indic_to_english(text: str, src_lang: str = LANGUAGE_SCRIPT) -> str:
+async def translate_indic_to_english(
+    text: str, src_lang: str = LANGUAGE_SCRIPT, profile: str = TRANSLATION_PROFILE
+) -> str:
     """
     Translate Indic text (Kannada) to English.
     
     Args:
         text: Text in Indic language
         src_lang: Source language code (default: "kan_Knda")
+        profile: Decoding profile ("realtime", "balanced" or "quality")
     
     Returns:
         English translation
     """
-    async with httpx.AsyncClient(timeout=TRANSLATION_TIMEOUT) as client:
-        # Workaround for IndicTrans2 short text hallucination (outputs Hindi for short Kannada)
-        input_text = text
-        is_padded = False
-        if src_lang == "kan_Knda" and len(text.split()) < 5:
-            input_text = f"ನಮಸ್ಕಾರ, {text}"
-            is_padded = True
-            
-        response = await client.post(
-            f"{MODAL_TRANS_INDIC_EN_URL}/translate",
-            json={
-                "text": input_text,
-                "src_lang": src_lang,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        translation = data["translations"][0] if data["translations"] else ""
+    if TRANSLATION_SEGMENTING:
+        segments = split_segments(text, lang=src_lang.split("_")[0], min_words=SEGMENT_MIN_WORDS)
+        if len(segments) > 1:
+            return await _translate_segments(segments, src_lang, ENGLISH, "indic_en", src_lang, profile)
+
+    return await cached_translate(
+        text, src_lang, ENGLISH, profile,
+        lambda: _translate_indic_to_english(text, src_lang, profile),
+    )
+
+
+async def _translate_indic_to_english(text: str, src_lang: str, profile: str) -> str:
+    # Workaround for IndicTrans2 short text hallucination (outputs Hindi for short Kannada)
+    input_text = text
+    is_padded = False
+    if src_lang == "kan_Knda" and len(text.split()) < 5:
+        input_text = f"ನಮಸ್ಕಾರ, {text}"
+        is_padded = True
+        
+    translation = await _translate(input_text, "indic_en", src_lang, profile)
+    
+    # Optional: Clean up the padding from translation if we added it
+    # "ನಮಸ್ಕಾರ" -> "Hello" / "Greetings" / "Salutations" / "Namaskar"
+    if is_padded:
+        # Simple heuristic: if translation starts with common greetings, we might strip them
+        # But Agent handles "Hello, ..." fine.
+        # Just ensuring we get English is the main goal.
+        pass
         
-        # Optional: Clean up the padding from translation if we added it
-        # "ನಮಸ್ಕಾರ" -> "Hello" / "Greetings" / "Salutations" / "Namaskar"
-        if is_padded:
-            # Simple heuristic: if translation starts with common greetings, we might strip them
-            # But Agent handles "Hello, ..." fine.
-            # Just ensuring we get English is the main goal.
-            pass
-            
-        return translation
-
-
-async def translate_english_to_indic(text: str, tgt_lang: str = LANGUAGE_SCRIPT) -> str:
+    return translation
+
+
+async def translate_english_to_indic(
+    text: str, tgt_lang: str = LANGUAGE_SCRIPT, profile: str = TRANSLATION_PROFILE
+) -> str:
     """
     Translate English text to Indic language (Kannada).
     
     Args:
         text: Text in English
         tgt_lang: Target language code (default: "kan_Knda")
+        profile: Decoding profile ("realtime", "balanced" or "quality")
     
     Returns:
         Indic language translation
     """
-    async with httpx.AsyncClient(timeout=TRANSLATION_TIMEOUT) as client:
-        response = await client.post(
-            f"{MODAL_TRANS_EN_INDIC_URL}/translate",
-            json={
-                "text": text,
-                "tgt_lang": tgt_lang,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["translations"][0] if data["translations"] else ""
-
+    if TRANSLATION_SEGMENTING:
+        segments = split_segments(text, lang="en")
+        if len(segments) > 1:
+            return await _translate_segments(segments, ENGLISH, tgt_lang, "en_indic", tgt_lang, profile)
 
-async def health_check_indic_en() -> dict:
-    """Check Indic→En translation service health."""
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(f"{MODAL_TRANS_INDIC_EN_URL}/health")
-        response.raise_for_status()
-        return response.json()
+    return await cached_translate(
+        text, ENGLISH, tgt_lang, profile,
+        lambda: _translate(text, "en_indic", tgt_lang, profile),
+    )
 
 
-async def health_check_en_indic() -> dict:
-    """Check En→Indic translation service health."""
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(f"{MODAL_TRANS_EN_INDIC_URL}/health")
-        response.raise_for_status()
-        return response.json()
+async def health_check() -> dict:
+    """Check translation service health."""
+    response = await get_client("translation").get("/health", timeout=30)
+    response.raise_for_status()
+    return response.json()
@@ -1,32 +1,48 @@
 """
 TTS Client for Modal IndicF5 service.
 """
-import httpx
-from .config import MODAL_TTS_URL, TTS_TIMEOUT
+import base64
+from .backend_client import get_client
+from .config import BINARY_AUDIO_TRANSPORT
 
 
-async def synthesize(text: str, ref_audio_b64: str = None, ref_text: str = None) -> bytes:
+async def synthesize(text: str, ref_audio: bytes | str = None, ref_text: str = None) -> bytes:
     """
     Synthesize speech from text using Modal IndicF5.
-    
+
     Args:
         text: Text to speak (Kannada)
-        ref_audio_b64: Optional reference audio for voice cloning (base64)
+        ref_audio: Optional reference audio for voice cloning
+            (WAV bytes, or a base64 string as before)
         ref_text: Optional transcript of reference audio
-    
+
     Returns:
         WAV audio bytes
     """
-    payload = {"text": text}
-    if ref_audio_b64:
-        payload["ref_audio"] = ref_audio_b64
-    if ref_text:
-        payload["ref_text"] = ref_text
-    
-    async with httpx.AsyncClient(timeout=TTS_TIMEOUT) as client:
-        response = await client.post(
-            MODAL_TTS_URL,
-            json=payload,
+    if ref_audio and BINARY_AUDIO_TRANSPORT:
+        # Reference clip goes as the raw request body, text in the query
+        if isinstance(ref_audio, str):
+            ref_audio = base64.b64decode(ref_audio)
+        params = {"text": text}
+        if ref_text:
+            params["ref_text"] = ref_text
+        response = await get_client("tts_raw").post(
+            "",
+            content=ref_audio,
+            params=params,
+            headers={"Content-Type": "application/octet-stream"},
         )
         response.raise_for_status()
         return response.content  # WAV audio bytes
+
+    payload = {"text": text}
+    if ref_audio:
+        if isinstance(ref_audio, bytes):
+            ref_audio = base64.b64encode(ref_audio).decode("utf-8")
+        payload["ref_audio"] = ref_audio
+    if ref_text:
+        payload["ref_text"] = ref_text
+
+    response = await get_client("tts").post("", json=payload)
+    response.raise_for_status()
+    return response.content  # WAV audio bytes
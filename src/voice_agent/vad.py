@@ -2,154 +2,394 @@
 Voice Activity Detection using Silero VAD.
 Detects speech start/end and buffers complete utterances.
 """
-import torch
+import numpy as np
 import io
 import wave
-from typing import AsyncIterator
-from .config import SAMPLE_RATE, VAD_THRESHOLD, MIN_SILENCE_DURATION_MS, MIN_SPEECH_DURATION_MS
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator
+from .config import (
+    SAMPLE_RATE,
+    VAD_THRESHOLD,
+    MIN_SILENCE_DURATION_MS,
+    MIN_SPEECH_DURATION_MS,
+    VAD_BATCHING,
+    ADAPTIVE_ENDPOINTING,
+    VAD_SEGMENTING,
+    MAX_UTTERANCE_MS,
+    SEGMENT_SEARCH_MS,
+    NOISE_GATE,
+    BARGE_IN_MIN_SPEECH_MS,
+)
+from .endpointing import AdaptiveEndpointer
+from .noise_gate import NoiseGate
+from .vad_engine import SileroOnnxEngine, get_engine, window_size_for
+from .vad_scheduler import VADScheduler, get_scheduler
+
+# Capacity of the per-session sample buffer, in VAD windows (~1s at 16kHz)
+RING_BUFFER_WINDOWS = 32
+
+
+@dataclass
+class Utterance:
+    """A user turn (or one segment of a long turn) produced by the VAD."""
+    audio: bytes  # WAV bytes (16-bit, mono)
+    turn_id: int
+    segment: int = 0  # Position within the turn
+    is_final: bool = True  # False for continuation segments cut at the max length
+    speech_end_ms: float = 0.0  # Session time at the end of the last speech window
+    detected_ms: float = 0.0  # Session time when the VAD emitted the utterance
+
+
+@dataclass
+class SpeechAudio:
+    """PCM of the turn in progress, streamed while the user is still speaking."""
+    pcm: bytes  # Raw 16-bit mono PCM since the previous SpeechAudio
+    turn_id: int
+    start: bool = False  # First audio of the turn (includes the onset buffer)
+    end: bool = False  # Endpoint reached; an Utterance follows unless it was dropped
 
 
 class SileroVAD:
     """Silero VAD wrapper for voice activity detection."""
-    
+
     def __init__(
         self,
         threshold: float = VAD_THRESHOLD,
         sample_rate: int = SAMPLE_RATE,
         min_silence_duration_ms: int = MIN_SILENCE_DURATION_MS,
         min_speech_duration_ms: int = MIN_SPEECH_DURATION_MS,
+        engine: SileroOnnxEngine = None,
+        adaptive_endpointing: bool = ADAPTIVE_ENDPOINTING,
+        max_utterance_ms: int = MAX_UTTERANCE_MS if VAD_SEGMENTING else 0,
+        segment_search_ms: int = SEGMENT_SEARCH_MS,
+        noise_gate: bool = NOISE_GATE,
+        stream_audio: bool = False,
+        confirm_speech_ms: int = BARGE_IN_MIN_SPEECH_MS,
     ):
         self.threshold = threshold
         self.sample_rate = sample_rate
         self.min_silence_duration_ms = min_silence_duration_ms
         self.min_speech_duration_ms = min_speech_duration_ms
-        
-        # Load Silero VAD model
-        self.model, self.utils = torch.hub.load(
-            repo_or_dir='snakers4/silero-vad',
-            model='silero_vad',
-            force_reload=False,
-            trust_repo=True,
-        )
-        self.model.eval()
-        
-        # State
-        self.raw_buffer = bytearray()  # Buffer for incoming raw bytes
+
+        # Shared Silero model (loaded once per process) + per-session state
+        self.engine = engine or get_engine()
+        self.state = self.engine.new_state(sample_rate)
+
+        # Preallocated sample buffers: int16 for utterance audio, float32 for
+        # the model. Incoming audio is converted once on write and windows are
+        # handed out as views, so per-window cost does not depend on chunk size.
+        self.window_size = window_size_for(sample_rate)
+        self.frame_duration_ms = self.window_size / sample_rate * 1000
+        capacity = self.window_size * RING_BUFFER_WINDOWS
+        self._pcm = np.zeros(capacity, dtype=np.int16)
+        self._audio = np.zeros(capacity, dtype=np.float32)
+        self._read = 0
+        self._write = 0
+        self._odd_byte = b""  # Half a sample left over from the last chunk
+
+        # Per-turn silence timeout (fixed min_silence_duration_ms when disabled)
+        self.endpointer = None
+        if adaptive_endpointing:
+            self.endpointer = AdaptiveEndpointer(
+                max_silence_ms=min_silence_duration_ms,
+                frame_duration_ms=self.frame_duration_ms,
+                sample_rate=sample_rate,
+            )
+
+        # Segmenting: cap the speech buffer at max_utterance_ms (0 = unbounded)
+        self.max_utterance_windows = int(max_utterance_ms / self.frame_duration_ms)
+        self.segment_search_windows = max(1, int(segment_search_ms / self.frame_duration_ms))
+
+        # Energy pre-gate in front of the model (None = run the model on every window)
+        self.noise_gate = NoiseGate() if noise_gate else None
+        self._gated = False
+
+        # Streaming STT: also emit SpeechAudio for the turn while it is spoken
+        self.stream_audio = stream_audio
+        self._stream_pcm: list[bytes] = []
+        self._stream_start = False
+        self._stream_end = False
+
+        # Called with no arguments when a turn starts (e.g. to pre-warm backends)
+        self.on_speech_start: Callable[[], None] | None = None
+        # Called with no arguments once per turn, after confirm_speech_ms of
+        # speech windows that pass the noise gate's speech-level check (e.g.
+        # for barge-in, which a cough or an echo must not trigger)
+        self.on_speech_confirmed: Callable[[], None] | None = None
+        self.confirm_speech_windows = max(1, int(confirm_speech_ms / self.frame_duration_ms))
+
+        self.turn_id = 0
+        self.windows_processed = 0  # Session clock, in windows
+        self.last_speech_window = 0
+        self.last_silence_timeout_ms = float(min_silence_duration_ms)
         self.reset()
-    
+
     def reset(self):
-        """Reset VAD state."""
+        """Reset VAD state (pending input samples are kept)."""
         self.is_speaking = False
-        self.speech_buffer = []  # List of 512-sample chunks
+        self.speech_buffer = []  # List of per-window PCM bytes
+        self.speech_energy = []  # Per-window energy, parallel to speech_buffer
+        self.segment = 0
         self.silence_frames = 0
         self.speech_frames = 0
-        try:
-            self.model.reset_states()
-        except:
-            pass
-    
+        self.confirmed = False
+        self.state.reset()
+        if self.endpointer:
+            self.endpointer.start_turn()
+
+    def vote_complete(self):
+        """
+        Downstream hook: the current utterance looks complete, so end the turn
+        after the minimum silence instead of the adaptive timeout.
+        """
+        if self.endpointer:
+            self.endpointer.vote_complete()
+
     def clear_buffers(self):
         """Clear audio buffers without resetting model state (for echo suppression)."""
-        self.raw_buffer = bytearray()
+        self._read = 0
+        self._write = 0
         self.speech_buffer = []
+        self.speech_energy = []
+        self.segment = 0
         self.is_speaking = False
         self.silence_frames = 0
         self.speech_frames = 0
-    
-    def process_chunk(self, audio_chunk: bytes) -> bytes | None:
+        self.confirmed = False
+        self._stream_pcm = []
+        self._stream_start = False
+        self._stream_end = False
+
+    def process_chunk(self, audio_chunk: bytes) -> list[Utterance | SpeechAudio]:
         """
-        Process an audio chunk and return complete utterance when speech ends.
-        Accumlates audio to ensure correct window size for VAD.
-        
+        Process an audio chunk and return utterances completed by it.
+        Accumulates audio to ensure correct window size for VAD.
+
         Args:
             audio_chunk: Raw PCM audio bytes (16-bit, mono, 16kHz)
-        
+
         Returns:
-            WAV bytes of complete utterance if speech ended, None otherwise
+            Utterances (final or continuation segments) completed in this chunk,
+            preceded by SpeechAudio for the turn in progress when stream_audio is set
         """
-        self.raw_buffer.extend(audio_chunk)
-        
-        window_size_samples = 512 if self.sample_rate == 16000 else 256
-        window_size_bytes = window_size_samples * 2  # 16-bit = 2 bytes per sample
-        
-        utterance = None
-        
-        while len(self.raw_buffer) >= window_size_bytes:
-            # Extract window
-            window_bytes = self.raw_buffer[:window_size_bytes]
-            self.raw_buffer = self.raw_buffer[window_size_bytes:]
-            
-            # Process window
-            result = self._process_window(bytes(window_bytes), window_size_samples)
+        utterances = []
+        for window_pcm, window in self._windows(audio_chunk):
+            speech_prob = self._pregate(window)
+            if speech_prob is None:
+                for skipped in self._preroll():
+                    self.engine(skipped, self.state)
+                speech_prob = self.engine(window, self.state)
+            result = self._process_window(window_pcm, window, speech_prob)
+            if result or self._stream_end:
+                self._flush_stream(utterances)
             if result:
-                utterance = result
-                
-        return utterance
+                utterances.append(result)
+        self._flush_stream(utterances)
+        return utterances
+
+    async def aprocess_chunk(self, audio_chunk: bytes, scheduler: VADScheduler) -> list[Utterance | SpeechAudio]:
+        """
+        Same as process_chunk, but model calls go through the batching scheduler
+        so the event loop is never blocked on inference.
+        """
+        utterances = []
+        for window_pcm, window in self._windows(audio_chunk):
+            speech_prob = self._pregate(window)
+            if speech_prob is None:
+                for skipped in self._preroll():
+                    await scheduler.infer(skipped, self.state)
+                speech_prob = await scheduler.infer(window, self.state)
+            result = self._process_window(window_pcm, window, speech_prob)
+            if result or self._stream_end:
+                self._flush_stream(utterances)
+            if result:
+                utterances.append(result)
+        self._flush_stream(utterances)
+        return utterances
+
+    def _pregate(self, window: np.ndarray) -> float | None:
+        """
+        Speech probability 0.0 for windows the noise gate rejects, else None.
+        Only idle windows are gated; once speech may have started every
+        window goes to the model so endpointing is unaffected.
+        """
+        self._gated = False
+        if not self.noise_gate or self.speech_frames or self.is_speaking:
+            return None
+        if self.noise_gate.should_skip(window):
+            self.state.skip(window)
+            self._gated = True
+            return 0.0
+        return None
+
+    def _preroll(self) -> list[np.ndarray]:
+        """Recently gated windows to warm the model state with."""
+        return self.noise_gate.take_preroll() if self.noise_gate else []
+
+    def _windows(self, audio_chunk: bytes) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Append a chunk to the sample buffer and yield complete windows.
+
+        Yields (int16, float32) views into the buffer; they are only valid
+        until the next window is requested. Chunks need not hold whole
+        samples: a trailing odd byte is kept for the next chunk.
+        """
+        if self._odd_byte:
+            audio_chunk = self._odd_byte + audio_chunk
+            self._odd_byte = b""
+        if len(audio_chunk) % 2:
+            self._odd_byte = audio_chunk[-1:]
+            audio_chunk = audio_chunk[:-1]
+        samples = np.frombuffer(audio_chunk, dtype=np.int16)
+        capacity = len(self._pcm)
+        offset = 0
+
+        while offset < len(samples):
+            if self._write == capacity:
+                # Move the partial window left over to the front
+                pending = self._write - self._read
+                self._pcm[:pending] = self._pcm[self._read:self._write]
+                self._audio[:pending] = self._audio[self._read:self._write]
+                self._read, self._write = 0, pending
+
+            n = min(capacity - self._write, len(samples) - offset)
+            piece = samples[offset:offset + n]
+            end = self._write + n
+            self._pcm[self._write:end] = piece
+            np.multiply(piece, 1.0 / 32768.0, out=self._audio[self._write:end], casting="unsafe")
+            self._write = end
+            offset += n
+
+            while self._write - self._read >= self.window_size:
+                start = self._read
+                self._read += self.window_size
+                yield self._pcm[start:self._read], self._audio[start:self._read]
+
+    def _process_window(self, window_pcm: np.ndarray, window: np.ndarray, speech_prob: float) -> Utterance | None:
+        """Update speech/silence state for one window and its speech probability."""
+        self.windows_processed += 1
+        if self.noise_gate:
+            if not self._gated and (self.speech_frames or self.is_speaking):
+                self.noise_gate.measure(window)
+            self.noise_gate.update(is_speech=speech_prob >= self.threshold, skipped=self._gated)
 
-    def _process_window(self, audio_bytes: bytes, window_size_samples: int) -> bytes | None:
-        """Process a single fixed-size window."""
-        # Convert bytes to tensor (copy to avoid warning/error)
-        # Note: input must be exactly window_size_samples
-        audio_int16 = torch.frombuffer(audio_bytes, dtype=torch.int16).clone()
-        audio_float = audio_int16.float() / 32768.0  # Normalize to [-1, 1]
-        
-        # Run VAD
-        # Silero expects (batch, samples) or (samples,)
-        # It's stateful, so we feed chunks sequentially
-        speech_prob = self.model(audio_float, self.sample_rate).item()
-        
-        # Calculate frame duration in ms
-        frame_duration_ms = (window_size_samples / self.sample_rate) * 1000
-        
         if speech_prob >= self.threshold:
             # Speech detected
-            self.speech_buffer.append(audio_bytes)
+            self.last_speech_window = self.windows_processed
+            self._append_speech(window_pcm, window)
             self.speech_frames += 1
             self.silence_frames = 0
-            
+            if self.endpointer:
+                self.endpointer.observe(window, speech_prob, is_speech=True)
+
             if not self.is_speaking:
                 # Check minimum speech duration before considering it "speaking"
-                total_speech_ms = self.speech_frames * frame_duration_ms
+                total_speech_ms = self.speech_frames * self.frame_duration_ms
                 if total_speech_ms >= self.min_speech_duration_ms:
                     self.is_speaking = True
+                    self.turn_id += 1
                     print("🎤 Speech started")
-        else:
-            # Silence detected
-            if self.is_speaking:
-                self.speech_buffer.append(audio_bytes)  # Keep some silence padding
-                self.silence_frames += 1
-                
-                # Check if silence duration exceeds threshold
-                silence_ms = self.silence_frames * frame_duration_ms
-                if silence_ms >= self.min_silence_duration_ms:
-                    # Speech ended - return complete utterance
+                    if self.on_speech_start:
+                        self.on_speech_start()
+                    if self.stream_audio:
+                        self._stream_pcm = list(self.speech_buffer)
+                        self._stream_start = True
+            if self.is_speaking and not self.confirmed and self.speech_frames >= self.confirm_speech_windows:
+                if self.segment or self._is_speech_level(record=False):
+                    self.confirmed = True
+                    if self.on_speech_confirmed:
+                        self.on_speech_confirmed()
+        elif self.is_speaking:
+            # Silence while speaking - keep it as padding
+            self._append_speech(window_pcm, window)
+            self.silence_frames += 1
+
+            # Check if silence duration exceeds this turn's timeout
+            silence_ms = self.silence_frames * self.frame_duration_ms
+            timeout_ms = self.min_silence_duration_ms
+            if self.endpointer:
+                self.endpointer.observe(window, speech_prob, is_speech=False)
+                timeout_ms = self.endpointer.silence_timeout_ms(self.threshold)
+            if silence_ms >= timeout_ms:
+                # Speech ended - return complete utterance
+                self.last_silence_timeout_ms = timeout_ms
+                if self.endpointer:
+                    print(f"🔇 Speech ended (endpoint after {timeout_ms:.0f} ms silence, {self.endpointer.last_signals})")
+                else:
                     print("🔇 Speech ended")
-                    utterance = self._create_wav(self.speech_buffer)
-                    self.reset()
-                    # If we had leftover raw bytes, we should preserve them? 
-                    # reset() clears raw_buffer. We should NOT clear raw_buffer in reset if called here.
-                    # But reset() is designed to look like fresh state.
-                    # Actually, raw_buffer contains *future* audio not yet processed. we shouldn't clear it.
-                    # So reset() should be modified or we handle raw_buffer separately.
-                    return utterance
-            else:
-                # Not speaking, keep a small circular buffer? 
-                # For simplicity, we discard silence *before* speech starts, 
-                # but maybe keep a few frames for context? Silero example uses a trigger.
-                # Here we just start buffer when speech detected + maybe some lookback if we implemented ring buffer.
-                # Current logic discards silence until threshold triggered.
-                self.speech_frames = 0
-                # Clear speech buffer if getting too big while not speaking (e.g. spurious spikes didn't trigger min duration)
-                if not self.is_speaking and self.speech_buffer:
-                     # Check if we should flush buffer if not confirmed speaking
-                     # Ideally we keep last N frames.
-                     pass
-                if not self.is_speaking:
-                    self.speech_buffer = [] # Reset buffer if we fell back to silence without confirming speech
-        
-        return None
+                utterance = None
+                if self.segment or self._is_speech_level():
+                    utterance = self._utterance(self.speech_buffer)
+                self.reset()
+                self._stream_end = self.stream_audio
+                return utterance
+        else:
+            # Fell back to silence without confirming speech - drop the spike
+            if self.speech_buffer and self.endpointer:
+                self.endpointer.start_turn()
+            self.speech_frames = 0
+            self.speech_buffer = []
+            self.speech_energy = []
+
+        if self.is_speaking and self.max_utterance_windows and len(self.speech_buffer) >= self.max_utterance_windows:
+            return self._cut_segment()
+
         return None
 
+    def _is_speech_level(self, record: bool = True) -> bool:
+        """Noise-gate check that the buffered turn is loud enough to be speech."""
+        if not self.noise_gate:
+            return True
+        return self.noise_gate.is_speech_level(self.speech_energy, self.window_size, record)
+
+    def _append_speech(self, window_pcm: np.ndarray, window: np.ndarray):
+        """Buffer a window of the current utterance."""
+        self.speech_buffer.append(window_pcm.tobytes())
+        self.speech_energy.append(float(np.dot(window, window)))
+        if self.stream_audio and self.is_speaking:
+            self._stream_pcm.append(self.speech_buffer[-1])
+
+    def _flush_stream(self, out: list):
+        """Emit audio buffered for streaming since the last flush."""
+        if not (self._stream_pcm or self._stream_start or self._stream_end):
+            return
+        out.append(SpeechAudio(
+            pcm=b"".join(self._stream_pcm),
+            turn_id=self.turn_id,
+            start=self._stream_start,
+            end=self._stream_end,
+        ))
+        self._stream_pcm = []
+        self._stream_start = False
+        self._stream_end = False
+
+    def _cut_segment(self) -> Utterance:
+        """
+        Emit the buffered audio as a continuation segment, cutting at the
+        quietest window near the end so words are not split where possible.
+        """
+        n = len(self.speech_buffer)
+        start = max(0, n - self.segment_search_windows)
+        cut = start + int(np.argmin(self.speech_energy[start:])) + 1
+
+        utterance = self._utterance(self.speech_buffer[:cut], is_final=False)
+        print(f"✂️ Segment {self.segment} of turn {self.turn_id} ({cut * self.frame_duration_ms:.0f} ms)")
+        self.speech_buffer = self.speech_buffer[cut:]
+        self.speech_energy = self.speech_energy[cut:]
+        self.segment += 1
+        return utterance
+
+    def _utterance(self, audio_chunks: list[bytes], is_final: bool = True) -> Utterance:
+        """Package buffered windows of the current turn."""
+        return Utterance(
+            audio=self._create_wav(audio_chunks),
+            turn_id=self.turn_id,
+            segment=self.segment,
+            is_final=is_final,
+            speech_end_ms=self.last_speech_window * self.frame_duration_ms,
+            detected_ms=self.windows_processed * self.frame_duration_ms,
+        )
+
     def _create_wav(self, audio_chunks: list[bytes]) -> bytes:
         """Create WAV file from audio chunks."""
         buffer = io.BytesIO()
@@ -160,46 +400,51 @@ class SileroVAD:
             wf.writeframes(b"".join(audio_chunks))
         return buffer.getvalue()
 
-    def get_remaining(self) -> bytes | None:
+    def get_remaining(self) -> Utterance | None:
         """Get any remaining speech in buffer."""
-        if self.speech_buffer and self.is_speaking:
-            utterance = self._create_wav(self.speech_buffer)
-            # soft reset
-            self.is_speaking = False
-            self.speech_buffer = []
-            self.silence_frames = 0
-            self.speech_frames = 0
-            try:
-                self.model.reset_states()
-            except:
-                pass
+        if self.speech_buffer and self.is_speaking and (self.segment or self._is_speech_level()):
+            utterance = self._utterance(self.speech_buffer)
+            self.reset()
             return utterance
         return None
 
 
-
 async def vad_stream(
     audio_stream: AsyncIterator[bytes],
     vad: SileroVAD = None,
-) -> AsyncIterator[bytes]:
+    scheduler: VADScheduler = None,
+    batching: bool = VAD_BATCHING,
+) -> AsyncIterator[Utterance | SpeechAudio]:
     """
     VAD stream: Filter audio and yield complete utterances.
-    
+
+    Turns longer than MAX_UTTERANCE_MS are yielded as continuation segments
+    (is_final=False) sharing a turn_id, so STT can start on the first part
+    while the user is still talking. A VAD created with stream_audio=True
+    additionally yields the turn's audio as SpeechAudio while it is spoken.
+
     Args:
         audio_stream: Async iterator of raw PCM audio chunks
         vad: Optional SileroVAD instance
-    
+        scheduler: Optional batching scheduler (defaults to the shared one)
+        batching: Use a batching scheduler; when False inference runs inline
+
     Yields:
-        WAV bytes of complete utterances
+        Utterance segments (and SpeechAudio) in order
     """
     if vad is None:
         vad = SileroVAD()
-    
+    if scheduler is None and batching:
+        scheduler = get_scheduler()
+
     async for audio_chunk in audio_stream:
-        utterance = vad.process_chunk(audio_chunk)
-        if utterance:
+        if scheduler:
+            utterances = await vad.aprocess_chunk(audio_chunk, scheduler)
+        else:
+            utterances = vad.process_chunk(audio_chunk)
+        for utterance in utterances:
             yield utterance
-    
+
     # Handle any remaining audio
     remaining = vad.get_remaining()
     if remaining:
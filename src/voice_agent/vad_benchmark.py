@@ -0,0 +1,356 @@
+"""
+VAD benchmark and accuracy harness.
+
+Streams a directory of 16 kHz mono 16-bit WAV files through vad_stream in
+frontend-sized chunks (1600 samples, like the AudioWorklet) at N times real
+time and reports CPU per window, utterance counts and endpointing accuracy
+as JSON. With --trace-memory it also reports peak traced memory
+(tracemalloc slows allocation down, so CPU figures from such a run are
+inflated; time and measure memory in separate runs).
+
+Endpointing is scored against reference speech segments, so the numbers
+mean the same thing whatever VAD settings are compared:
+- sidecar (default): foo.json next to foo.wav, {"speech": [[start_s, end_s], ...]}
+  with one entry per utterance; files without one are not scored.
+- energy: segments where the clean signal is above --energy-db, pauses
+  shorter than --reference-gap-ms merged. Point --clean-dir at clean copies
+  (same relative paths) when the corpus itself is noisy.
+Each reference end is matched to the first end-of-speech the VAD reports
+between it (minus --tolerance-ms) and the next reference start; the delay
+is measured from the reference end. Unmatched reference ends are misses,
+unmatched VAD ends are false cuts. The VAD does not flush at end of file,
+so give every file some trailing silence.
+
+Usage:
+    python -m src.voice_agent.vad_benchmark corpus/ --speed 10
+    python -m src.voice_agent.vad_benchmark corpus/ --speed 0 --sessions 50 --engine batched
+    python -m src.voice_agent.vad_benchmark corpus/ --min-silence-ms 400 --output run.json
+    python -m src.voice_agent.vad_benchmark corpus/ --sessions 50 --trace-memory
+    python -m src.voice_agent.vad_benchmark noisy/ --reference energy --clean-dir clean/
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+from .config import (
+    SAMPLE_RATE,
+    VAD_THRESHOLD,
+    MIN_SILENCE_DURATION_MS,
+    MIN_SPEECH_DURATION_MS,
+    ADAPTIVE_ENDPOINTING,
+    NOISE_GATE,
+    MAX_UTTERANCE_MS,
+)
+from .vad import SileroVAD, vad_stream
+from .vad_engine import get_engine
+from .vad_scheduler import VADScheduler
+
+FRONTEND_CHUNK_SAMPLES = 1600  # AudioWorklet CHUNK_SIZE in src/web
+ENERGY_FRAME_MS = 10
+ENERGY_THRESHOLD_DB = -35.0  # dBFS, for clean close-talk recordings
+REFERENCE_GAP_MS = 500  # Shorter pauses do not end a reference utterance
+REFERENCE_MIN_SPEECH_MS = 100
+TOLERANCE_MS = 200
+
+
+def load_wav(path: str) -> bytes:
+    """Read a WAV file as 16 kHz mono int16 PCM bytes."""
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected {SAMPLE_RATE} Hz 16-bit PCM")
+        pcm = wf.readframes(wf.getnframes())
+        channels = wf.getnchannels()
+    if channels > 1:
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, channels)
+        pcm = samples.mean(axis=1).astype(np.int16).tobytes()
+    return pcm
+
+
+def energy_segments(
+    pcm: bytes,
+    threshold_db: float = ENERGY_THRESHOLD_DB,
+    min_gap_ms: float = REFERENCE_GAP_MS,
+    min_speech_ms: float = REFERENCE_MIN_SPEECH_MS,
+) -> list[tuple[float, float]]:
+    """
+    Reference speech segments of clean audio from a frame energy threshold.
+
+    Args:
+        pcm: 16 kHz mono int16 PCM bytes
+        threshold_db: Frame RMS level (dBFS) that counts as speech
+        min_gap_ms: Pauses shorter than this are merged into the utterance
+        min_speech_ms: Shorter segments (clicks, breaths) are dropped
+
+    Returns:
+        (start_ms, end_ms) of each utterance, in order
+    """
+    frame = SAMPLE_RATE * ENERGY_FRAME_MS // 1000
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    frames = samples[:len(samples) // frame * frame].reshape(-1, frame)
+    level_db = 10 * np.log10(np.mean(np.square(frames), axis=1) + 1e-12)
+
+    segments: list[list[float]] = []
+    for i in np.flatnonzero(level_db > threshold_db):
+        start, end = i * ENERGY_FRAME_MS, (i + 1) * ENERGY_FRAME_MS
+        if segments and start - segments[-1][1] < min_gap_ms:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+    return [(float(s), float(e)) for s, e in segments if e - s >= min_speech_ms]
+
+
+def load_reference(path: str, pcm: bytes, args) -> list[tuple[float, float]] | None:
+    """Reference speech segments (ms) of a corpus file, or None if it has no labels."""
+    if args.reference == "energy":
+        if args.clean_dir:
+            pcm = load_wav(os.path.join(args.clean_dir, os.path.relpath(path, args.corpus)))
+        return energy_segments(pcm, args.energy_db, args.reference_gap_ms)
+
+    sidecar = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar, encoding="utf-8") as f:
+        labels = json.load(f)
+    return sorted((start * 1000, end * 1000) for start, end in labels["speech"])
+
+
+def score_endpoints(reference: list[tuple[float, float]], detected_ms: list[float], tolerance_ms: float = TOLERANCE_MS) -> dict:
+    """
+    Match the VAD's end-of-speech times to reference utterance ends.
+
+    Args:
+        reference: (start_ms, end_ms) of each reference utterance, in order
+        detected_ms: Session times at which the VAD ended an utterance
+        tolerance_ms: How early (before the reference end) a match may be
+
+    Returns:
+        Delays of matched ends, missed reference ends and false cuts
+    """
+    unmatched = sorted(detected_ms)
+    delays = []
+    for i, (_, end) in enumerate(reference):
+        next_start = reference[i + 1][0] if i + 1 < len(reference) else float("inf")
+        hit = next((d for d in unmatched if end - tolerance_ms <= d < next_start + tolerance_ms), None)
+        if hit is not None:
+            delays.append(hit - end)
+            unmatched.remove(hit)
+    return {
+        "eos_delay_ms": delays,
+        "missed_ends": len(reference) - len(delays),
+        "false_cuts": len(unmatched),
+    }
+
+
+def percentiles(values: list[float]) -> dict:
+    """Summary statistics for a list of measurements."""
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "count": len(values),
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+async def run_file(
+    path: str,
+    pcm: bytes,
+    reference: list[tuple[float, float]] | None,
+    args,
+    scheduler: VADScheduler | None,
+) -> dict:
+    """Stream one file through a fresh VAD session and collect its results."""
+    vad = SileroVAD(
+        threshold=args.threshold,
+        min_silence_duration_ms=args.min_silence_ms,
+        min_speech_duration_ms=args.min_speech_ms,
+        adaptive_endpointing=not args.no_adaptive,
+        noise_gate=not args.no_gate,
+        max_utterance_ms=args.max_utterance_ms,
+    )
+    chunk_bytes = args.chunk_samples * 2
+    chunk_seconds = args.chunk_samples / SAMPLE_RATE
+    chunk_wall_ms: list[float] = []
+
+    async def audio_source():
+        for i in range(0, len(pcm), chunk_bytes):
+            start = time.perf_counter()
+            yield pcm[i:i + chunk_bytes]
+            # Time until the pipeline asks for the next chunk = processing time
+            chunk_wall_ms.append((time.perf_counter() - start) * 1000)
+            if args.speed > 0:
+                await asyncio.sleep(chunk_seconds / args.speed)
+
+    turns = set()
+    segments = 0
+    ends_ms = []
+    async for utterance in vad_stream(audio_source(), vad, scheduler, batching=scheduler is not None):
+        segments += 1
+        turns.add(utterance.turn_id)
+        if utterance.is_final:
+            ends_ms.append(utterance.detected_ms)
+
+    gate = vad.noise_gate
+    result = {
+        "file": os.path.basename(path),
+        "duration_s": round(len(pcm) / 2 / SAMPLE_RATE, 3),
+        "windows": vad.windows_processed,
+        "gated_windows": gate.skipped if gate else 0,
+        "utterances": len(turns),
+        "segments": segments,
+        "rejected_utterances": gate.rejected_utterances if gate else 0,
+        "reference_ends": len(reference) if reference is not None else None,
+        "chunk_wall_ms": chunk_wall_ms,
+    }
+    if reference is not None:
+        score = score_endpoints(reference, ends_ms, args.tolerance_ms)
+        score["eos_delay_ms"] = [round(d, 1) for d in score["eos_delay_ms"]]
+        result.update(score)
+    return result
+
+
+async def run(args) -> dict:
+    paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.wav"), recursive=True))
+    if not paths:
+        raise SystemExit(f"No WAV files found in {args.corpus}")
+    corpus = []
+    for path in paths:
+        pcm = load_wav(path)
+        corpus.append((path, pcm, load_reference(path, pcm, args)))
+
+    get_engine()  # Load the model before timing starts
+    scheduler = VADScheduler() if args.engine == "batched" else None
+
+    async def session():
+        return [await run_file(path, pcm, reference, args, scheduler) for path, pcm, reference in corpus]
+
+    if args.trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    sessions = await asyncio.gather(*(session() for _ in range(args.sessions)))
+
+    cpu_s = time.process_time() - cpu_start
+    wall_s = time.perf_counter() - wall_start
+    peak_mb = None
+    if args.trace_memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    if scheduler:
+        await scheduler.close()
+
+    files = sessions[0]
+    results = [r for rs in sessions for r in rs]
+    windows = sum(r["windows"] for r in results)
+    audio_s = sum(r["duration_s"] for r in results)
+    scored = [r for r in results if r["reference_ends"] is not None]
+    reference_ends = sum(r["reference_ends"] for r in scored)
+    missed = sum(r["missed_ends"] for r in scored)
+    false_cuts = sum(r["false_cuts"] for r in scored)
+    vad_ends = reference_ends - missed + false_cuts
+
+    summary = {
+        "audio_seconds": round(audio_s, 3),
+        "wall_seconds": round(wall_s, 3),
+        "realtime_factor": round(audio_s / wall_s, 2) if wall_s else None,
+        "cpu_seconds": round(cpu_s, 3),
+        "windows": windows,
+        "gated_windows": sum(r["gated_windows"] for r in results),
+        "cpu_us_per_window": round(cpu_s / windows * 1e6, 2) if windows else None,
+        "chunk_wall_ms": percentiles([ms for r in results for ms in r["chunk_wall_ms"]]),
+        "utterances": sum(r["utterances"] for r in results),
+        "segments": sum(r["segments"] for r in results),
+        "rejected_utterances": sum(r["rejected_utterances"] for r in results),
+        "scored_files": len(scored) // args.sessions,
+        "reference_ends": reference_ends,
+        "eos_delay_ms": percentiles([d for r in scored for d in r["eos_delay_ms"]]),
+        "missed_ends": missed,
+        "miss_rate": round(missed / reference_ends, 4) if reference_ends else None,
+        "false_cuts": false_cuts,
+        "false_cut_rate": round(false_cuts / vad_ends, 4) if vad_ends else None,
+        "peak_traced_memory_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        "peak_traced_memory_mb_per_session": (
+            round(peak_mb / args.sessions, 3) if peak_mb is not None else None
+        ),
+    }
+    if scheduler:
+        summary["scheduler"] = scheduler.stats()
+
+    for r in files:
+        del r["chunk_wall_ms"]
+
+    return {
+        "config": {
+            "corpus": args.corpus,
+            "files": len(corpus),
+            "sessions": args.sessions,
+            "speed": args.speed,
+            "chunk_samples": args.chunk_samples,
+            "engine": args.engine,
+            "threshold": args.threshold,
+            "min_silence_ms": args.min_silence_ms,
+            "min_speech_ms": args.min_speech_ms,
+            "adaptive_endpointing": not args.no_adaptive,
+            "noise_gate": not args.no_gate,
+            "max_utterance_ms": args.max_utterance_ms,
+            "trace_memory": args.trace_memory,
+            "reference": args.reference,
+            "clean_dir": args.clean_dir,
+            "energy_db": args.energy_db,
+            "reference_gap_ms": args.reference_gap_ms,
+            "tolerance_ms": args.tolerance_ms,
+        },
+        "summary": summary,
+        "files": files,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VAD on a WAV corpus")
+    parser.add_argument("corpus", help="Directory of 16 kHz mono 16-bit WAV files")
+    parser.add_argument("--speed", type=float, default=10.0, help="Times real time (0 = as fast as possible)")
+    parser.add_argument("--sessions", type=int, default=1, help="Concurrent sessions replaying the corpus")
+    parser.add_argument("--chunk-samples", type=int, default=FRONTEND_CHUNK_SAMPLES, help="Samples per streamed chunk")
+    parser.add_argument("--engine", choices=["inline", "batched"], default="inline", help="Per-session inline inference or the batching scheduler")
+    parser.add_argument("--threshold", type=float, default=VAD_THRESHOLD)
+    parser.add_argument("--min-silence-ms", type=int, default=MIN_SILENCE_DURATION_MS)
+    parser.add_argument("--min-speech-ms", type=int, default=MIN_SPEECH_DURATION_MS)
+    parser.add_argument("--max-utterance-ms", type=int, default=MAX_UTTERANCE_MS, help="0 disables segmenting")
+    parser.add_argument("--no-adaptive", action="store_true", default=not ADAPTIVE_ENDPOINTING, help="Fixed silence timeout")
+    parser.add_argument("--no-gate", action="store_true", default=not NOISE_GATE, help="Run the model on every window")
+    parser.add_argument("--reference", choices=["sidecar", "energy"], default="sidecar", help="Where reference utterance ends come from")
+    parser.add_argument("--clean-dir", help="Clean copies of the corpus for --reference energy")
+    parser.add_argument("--energy-db", type=float, default=ENERGY_THRESHOLD_DB, help="Speech level (dBFS) for --reference energy")
+    parser.add_argument("--reference-gap-ms", type=int, default=REFERENCE_GAP_MS, help="Shorter pauses do not end a reference utterance")
+    parser.add_argument("--tolerance-ms", type=int, default=TOLERANCE_MS, help="How early a VAD end may match a reference end")
+    parser.add_argument("--trace-memory", action="store_true", help="Report peak memory with tracemalloc (inflates CPU figures)")
+    parser.add_argument("--output", "-o", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    # Keep the VAD's progress prints out of the JSON on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"📄 Saved to: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Silero VAD inference engine on ONNX Runtime.
+One model session is shared by the whole process; each WebSocket session
+only owns a small VADState (recurrent state + context samples).
+"""
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import onnxruntime as ort
+
+from .config import SAMPLE_RATE, VAD_MODEL_PATH, VAD_NUM_THREADS
+
+
+def window_size_for(sample_rate: int) -> int:
+    """Samples per VAD window (Silero requires 512 @ 16kHz, 256 @ 8kHz)."""
+    return 512 if sample_rate == 16000 else 256
+
+
+def context_size_for(sample_rate: int) -> int:
+    """Samples of the previous window prepended to each model input."""
+    return 64 if sample_rate == 16000 else 32
+
+
+@dataclass
+class VADState:
+    """Per-session recurrent state for the shared Silero model."""
+    sample_rate: int = SAMPLE_RATE
+    state: np.ndarray = field(default=None, repr=False)  # (2, 1, 128)
+    context: np.ndarray = field(default=None, repr=False)  # (context_size,)
+
+    def __post_init__(self):
+        self.reset()
+
+    def reset(self):
+        """Zero the recurrent state and context (start of a new stream)."""
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(context_size_for(self.sample_rate), dtype=np.float32)
+
+    def skip(self, window: np.ndarray):
+        """Advance the context past a window the model was not run on."""
+        self.context[:] = window[-len(self.context):]
+
+
+class SileroOnnxEngine:
+    """Stateless Silero VAD model; all state lives in VADState objects."""
+
+    def __init__(self, model_path: str = VAD_MODEL_PATH, num_threads: int = VAD_NUM_THREADS):
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = num_threads
+        opts.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=opts,
+            providers=["CPUExecutionProvider"],
+        )
+
+    def new_state(self, sample_rate: int = SAMPLE_RATE) -> VADState:
+        """Create a fresh per-session state."""
+        return VADState(sample_rate=sample_rate)
+
+    def __call__(self, window: np.ndarray, state: VADState) -> float:
+        """Speech probability for one float32 window of a single session."""
+        return float(self.run_batch([window], [state])[0])
+
+    def run_batch(self, windows: list[np.ndarray], states: list[VADState]) -> np.ndarray:
+        """
+        Run one forward pass over windows from several sessions.
+
+        Args:
+            windows: float32 windows in [-1, 1], one per session
+            states: Matching VADState objects (updated in place)
+
+        Returns:
+            Speech probabilities, shape (len(windows),)
+        """
+        sample_rate = states[0].sample_rate
+        if any(s.sample_rate != sample_rate for s in states):
+            raise ValueError("All windows in a batch must share one sample rate")
+
+        context_size = context_size_for(sample_rate)
+        window_size = window_size_for(sample_rate)
+
+        x = np.empty((len(windows), context_size + window_size), dtype=np.float32)
+        for i, (window, state) in enumerate(zip(windows, states)):
+            x[i, :context_size] = state.context
+            x[i, context_size:] = window
+
+        out, new_state = self.session.run(None, {
+            "input": x,
+            "state": np.concatenate([s.state for s in states], axis=1),
+            "sr": np.array(sample_rate, dtype=np.int64),
+        })
+
+        for i, state in enumerate(states):
+            state.state = new_state[:, i:i + 1, :].copy()
+            state.context = x[i, -context_size:].copy()
+
+        return out[:, 0]
+
+
+_engine: SileroOnnxEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> SileroOnnxEngine:
+    """Return the process-wide engine, loading the bundled model on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                print(f"🔄 Loading Silero VAD from {VAD_MODEL_PATH}...")
+                _engine = SileroOnnxEngine()
+    return _engine
@@ -0,0 +1,139 @@
+"""
+Cross-session batched VAD inference.
+Sessions submit one window at a time; each tick the scheduler stacks every
+pending window and its session's recurrent state into one forward pass on a
+dedicated worker thread, then resolves each session's future.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .config import VAD_MAX_BATCH_SIZE, VAD_BATCH_TICK_MS
+from .vad_engine import SileroOnnxEngine, VADState, get_engine
+
+
+class VADScheduler:
+    """Batches VAD windows from all sessions onto a single inference thread."""
+
+    def __init__(
+        self,
+        engine: SileroOnnxEngine = None,
+        max_batch_size: int = VAD_MAX_BATCH_SIZE,
+        tick_ms: float = VAD_BATCH_TICK_MS,
+    ):
+        self.engine = engine or get_engine()
+        self.max_batch_size = max_batch_size
+        self.tick_ms = tick_ms
+
+        self._pending: list[tuple[np.ndarray, VADState, asyncio.Future]] = []
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad")
+        self._task: asyncio.Task | None = None
+
+        # Stats
+        self.batches = 0
+        self.windows = 0
+        self.max_batch_seen = 0
+
+    def start(self):
+        """Start the batching loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Stop the batching loop and fail any waiting sessions."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("VAD scheduler closed"))
+        self._pending = []
+        self._executor.shutdown(wait=False)
+
+    async def infer(self, window: np.ndarray, state: VADState) -> float:
+        """
+        Queue one window for the next batch and wait for its probability.
+
+        The window may be a view into the session's sample buffer; it stays
+        valid because a session never advances its buffer while awaiting.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((window, state, future))
+        self._wakeup.set()
+        return await future
+
+    def stats(self) -> dict:
+        """Batching statistics since startup."""
+        return {
+            "batches": self.batches,
+            "windows": self.windows,
+            "mean_batch_size": self.windows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": len(self._pending),
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Give other sessions a chance to submit their window for this tick
+            await asyncio.sleep(self.tick_ms / 1000)
+            self._wakeup.clear()
+
+            batch = [item for item in self._pending[:self.max_batch_size] if not item[2].done()]
+            self._pending = self._pending[self.max_batch_size:]
+            if self._pending:
+                self._wakeup.set()
+            if not batch:
+                continue
+
+            # One forward pass per sample rate present in this tick
+            by_rate: dict[int, list] = {}
+            for item in batch:
+                by_rate.setdefault(item[1].sample_rate, []).append(item)
+
+            for items in by_rate.values():
+                windows = [window for window, _, _ in items]
+                states = [state for _, state, _ in items]
+                try:
+                    probs = await loop.run_in_executor(
+                        self._executor, self.engine.run_batch, windows, states
+                    )
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                self.batches += 1
+                self.windows += len(items)
+                self.max_batch_seen = max(self.max_batch_seen, len(items))
+                for (_, _, future), prob in zip(items, probs):
+                    if not future.done():
+                        future.set_result(float(prob))
+
+
+_scheduler: VADScheduler | None = None
+
+
+def get_scheduler() -> VADScheduler:
+    """Return the process-wide scheduler (created on first use)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = VADScheduler()
+    return _scheduler
+
+
+async def close_scheduler():
+    """Stop the process-wide scheduler if it was started (server shutdown)."""
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
@@ -0,0 +1,152 @@
+"""
+Predictive warm-up of the Modal backends from the orchestrator.
+
+Modal scales idle containers to zero, so the first turn after a quiet
+period pays a cold start on every stage. The warmer pings each service's
+readiness endpoint when a session opens, re-warms stages that have been
+idle long enough to scale down when the user starts speaking, and keeps
+the services warm in the background while users are around.
+"""
+import asyncio
+import time
+import httpx
+from .backend_client import backends, get_client
+from .config import (
+    WARMUP_PROBES,
+    WARMUP_IDLE_S,
+    WARMUP_TIMEOUT,
+    KEEPALIVE_INTERVAL_S,
+    KEEPALIVE_IDLE_HORIZON_S,
+    COLD_START_THRESHOLD_MS,
+)
+
+
+class BackendWarmer:
+    """Tracks per-service warmth and sends readiness probes to idle services."""
+
+    def __init__(self, probes: dict = WARMUP_PROBES, idle_s: float = WARMUP_IDLE_S):
+        self.probes = probes
+        self.idle_s = idle_s
+        self.last_activity = 0.0  # Monotonic time of the last user activity
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._last_probe: dict[str, dict] = {}
+        self._keepalive: asyncio.Task | None = None
+
+    def touch(self):
+        """Record user activity (session open, speech) for the keep-alive horizon."""
+        self.last_activity = time.monotonic()
+
+    def idle_for(self, service: str) -> float | None:
+        """Seconds since the service last answered (None if never seen)."""
+        last = backends.last_response.get(service)
+        return None if last is None else time.monotonic() - last
+
+    def warm_all(self) -> list[str]:
+        """
+        Probe every service concurrently (probes already in flight are reused).
+
+        Returns:
+            Services a probe was started for
+        """
+        return self._warm(list(self.probes))
+
+    def warm_idle(self) -> list[str]:
+        """
+        Probe only the services that may have scaled down.
+
+        Returns:
+            Services a probe was started for
+        """
+        idle = []
+        for service in self.probes:
+            idle_for = self.idle_for(service)
+            if idle_for is None or idle_for >= self.idle_s:
+                idle.append(service)
+        return self._warm(idle)
+
+    def _warm(self, services: list[str]) -> list[str]:
+        started = []
+        for service in services:
+            if service in self._inflight:
+                continue
+            task = asyncio.create_task(self._probe(service))
+            self._inflight[service] = task
+            task.add_done_callback(lambda _, s=service: self._inflight.pop(s, None))
+            started.append(service)
+        return started
+
+    async def _probe(self, service: str):
+        client, path = self.probes[service]
+        idle_for = self.idle_for(service)
+        start = time.perf_counter()
+        result = {"ts": time.time(), "idle_s": idle_for, "error": None}
+        try:
+            response = await get_client(client).get(path, timeout=WARMUP_TIMEOUT)
+            result["status_code"] = response.status_code
+            if response.status_code >= 400:
+                # 503 = container up but the model is still loading/warming
+                result["error"] = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            result["error"] = repr(e)
+        result["latency_ms"] = (time.perf_counter() - start) * 1000
+        result["cold"] = result["latency_ms"] > COLD_START_THRESHOLD_MS
+        self._last_probe[service] = result
+
+        if result["error"]:
+            print(f"⚠️ Warm-up of {service} failed: {result['error']}")
+        else:
+            kind = "cold start" if result["cold"] else "warm"
+            print(f"🔥 {service} ready in {result['latency_ms']:.0f}ms ({kind})")
+
+    def status(self) -> dict:
+        """Per-service state: warm, warming, cold, unhealthy or unknown."""
+        services = {}
+        for service in self.probes:
+            idle_for = self.idle_for(service)
+            probe = self._last_probe.get(service)
+            if service in self._inflight:
+                state = "warming"
+            elif idle_for is not None and idle_for < self.idle_s:
+                state = "warm"
+            elif probe and probe["error"]:
+                state = "unhealthy"
+            elif idle_for is None:
+                state = "unknown"
+            else:
+                state = "cold"
+            services[service] = {
+                "state": state,
+                "idle_s": None if idle_for is None else round(idle_for, 1),
+                "last_probe": probe,
+            }
+        since_activity = time.monotonic() - self.last_activity if self.last_activity else None
+        return {
+            "services": services,
+            "keepalive": self._keepalive is not None and not self._keepalive.done(),
+            "since_activity_s": None if since_activity is None else round(since_activity, 1),
+        }
+
+    def start(self):
+        """Start the background keep-alive scheduler (from the server lifespan)."""
+        if self._keepalive is None or self._keepalive.done():
+            self._keepalive = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self):
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL_S)
+            # Only while someone used the agent recently; afterwards let Modal scale down
+            if self.last_activity and time.monotonic() - self.last_activity < KEEPALIVE_IDLE_HORIZON_S:
+                self.warm_idle()
+
+    async def stop(self):
+        """Stop the keep-alive scheduler and any probes in flight."""
+        tasks = list(self._inflight.values())
+        if self._keepalive:
+            tasks.append(self._keepalive)
+            self._keepalive = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+warmer = BackendWarmer()
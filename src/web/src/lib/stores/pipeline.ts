@@ -65,6 +65,10 @@ function createTurnStore() {
       }));
     },
 
+    agentEnd(ts: number, fullResponse: string) {
+      update((t) => ({ ...t, agentEndTs: ts, response: fullResponse }));
+    },
+
     trans2Start(ts: number) {
       update((t) => ({ ...t, trans2StartTs: t.trans2StartTs ?? ts }));
     },
@@ -1,5 +1,5 @@
-// Server event types
-export type ServerEvent =
+// Server event types (turn_id: the VAD turn the event belongs to)
+export type ServerEvent = (
   | { type: "user_input"; ts: number }
   | { type: "stt_chunk"; ts: number; transcript: string }
   | { type: "stt_output"; ts: number; transcript: string }
@@ -18,15 +18,29 @@ export type ServerEvent =
     result: string;
     ts: number;
   }
-  | { type: "agent_end"; full_response: string; ts: number }
+  | {
+    type: "agent_end";
+    full_response: string;
+    ttft_ms: number | null;
+    tokens_per_sec: number | null;
+    output_tokens: number;
+    error: boolean;
+    ts: number;
+  }
   | {
     type: "translation";
     ts: number;
     text: string;
     direction: "indic_to_en" | "en_to_indic";
+    seq: number;
+    final: boolean;
+    skipped: boolean;
   }
-  | { type: "tts_chunk"; audio_length: number; ts: number }
-  | { type: "tts_complete"; ts: number };
+  | { type: "tts_chunk"; audio_length: number; seq: number; skipped: boolean; ts: number }
+  | { type: "tts_complete"; ts: number }
+  | { type: "turn_cancelled"; reason: string; ts: number }
+  | { type: "response_restart"; seq: number; ts: number }
+) & { turn_id: number };
 
 // Session state
 export interface SessionState {
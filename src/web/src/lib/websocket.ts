@@ -17,6 +17,10 @@ export interface VoiceSession {
 }
 
 let ttsComplete = false;
+// Keep the mic open while the agent speaks, so the user can interrupt it
+// (the server cancels the old turn once new speech is confirmed and sends
+// turn_cancelled; relies on the browser's echo cancellation)
+const BARGE_IN = true;
 let muteLingerTimeout: ReturnType<typeof setTimeout> | null = null;
 
 export function createVoiceSession(): VoiceSession {
@@ -37,13 +41,42 @@ export function createVoiceSession(): VoiceSession {
   let isMuted = false;
   let ttsFinishTimeout: ReturnType<typeof setTimeout> | null = null;
 
+  // Response audio arrives as a tts_chunk event (with its turn and segment
+  // seq) followed by the WAV bytes; segments of the newest turn with audio
+  // are played strictly in seq order, audio of older turns is dropped.
+  // A skipped tts_chunk (no bytes follow) marks a segment without audio.
+  let pendingAudio: { turn: number; seq: number } | null = null;
+  let audioTurnId = 0;
+  let cancelledTurnId = -1; // Audio of this turn and older is never played
+  let nextAudioSeq = 0;
+  const audioBySeq = new Map<number, ArrayBuffer | null>(); // null: skipped
+
+  function queueAudio(turn: number, seq: number, audio: ArrayBuffer | null) {
+    if (turn > audioTurnId) {
+      // First audio of a newer turn
+      audioTurnId = turn;
+      nextAudioSeq = 0;
+      audioBySeq.clear();
+    }
+    if (turn !== audioTurnId || turn <= cancelledTurnId) return;
+    audioBySeq.set(seq, audio);
+    while (audioBySeq.has(nextAudioSeq)) {
+      const next = audioBySeq.get(nextAudioSeq);
+      if (next) audioPlayback.push(next);
+      audioBySeq.delete(nextAudioSeq);
+      nextAudioSeq++;
+    }
+  }
+
   function handleEvent(event: ServerEvent) {
     const turn = get(currentTurn);
 
     switch (event.type) {
       case "user_input":
-        // MUTE MIC IMMEDIATELY
-        isMuted = true;
+        if (!BARGE_IN) {
+          // MUTE MIC IMMEDIATELY
+          isMuted = true;
+        }
         ttsComplete = false; // Reset state for new turn
         if (muteLingerTimeout) {
           clearTimeout(muteLingerTimeout);
@@ -64,6 +97,33 @@ export function createVoiceSession(): VoiceSession {
         console.log("Turn Started (User Input):", event.ts);
         break;
 
+      case "turn_cancelled":
+        // Drop the cancelled turn's queued and playing audio (sent on every
+        // barge-in, also when the server had already finished the turn)
+        cancelledTurnId = Math.max(cancelledTurnId, event.turn_id);
+        if (event.turn_id >= audioTurnId) {
+          audioPlayback.stop();
+          audioBySeq.clear();
+          pendingAudio = null;
+          ttsComplete = false;
+          isMuted = false;
+        }
+        logs.log(`Turn ${event.turn_id} cancelled (${event.reason})`);
+        break;
+
+      case "response_restart":
+        // The agent called a tool: audio of the text it wrote before is
+        // withdrawn and the answer continues at event.seq
+        if (event.turn_id === audioTurnId) {
+          audioPlayback.stop();
+        }
+        if (event.turn_id >= audioTurnId && event.turn_id > cancelledTurnId) {
+          audioTurnId = event.turn_id;
+          nextAudioSeq = event.seq;
+          audioBySeq.clear();
+        }
+        break;
+
       case "tts_complete":
         ttsComplete = true;
         console.log("TTS Generation Complete signal received");
@@ -74,6 +134,12 @@ export function createVoiceSession(): VoiceSession {
         break;
 
       case "stt_chunk":
+        if (!turn.active && event.transcript) {
+          // Live partial (streaming STT) while the user is still speaking;
+          // the turn itself starts at user_input
+          currentTurn.sttChunk(event.transcript);
+          break;
+        }
         if (!turn.active) {
           currentTurn.startTurn(event.ts || Date.now());
         }
@@ -96,7 +162,11 @@ export function createVoiceSession(): VoiceSession {
           }
         } else {
           if (!event.text) {
-            currentTurn.trans2Start(event.ts);
+            if (event.final) {
+              currentTurn.trans2End(event.ts);
+            } else {
+              currentTurn.trans2Start(event.ts);
+            }
           } else {
             currentTurn.trans2End(event.ts);
             activities.add("agent", "Translation (En→In)", event.text);
@@ -108,6 +178,15 @@ export function createVoiceSession(): VoiceSession {
         currentTurn.agentChunk(event.ts, event.text);
         break;
 
+      case "agent_end":
+        currentTurn.agentEnd(event.ts, event.full_response);
+        activities.add("agent", "Agent Response", event.full_response);
+        if (event.ttft_ms !== null) {
+          const rate = event.tokens_per_sec !== null ? `${event.tokens_per_sec.toFixed(1)} tok/s` : "n/a";
+          logs.log(`Agent TTFT ${Math.round(event.ttft_ms)}ms, ${event.output_tokens} tokens, ${rate}`);
+        }
+        break;
+
       case "tool_call":
         activities.add(
           "tool",
@@ -124,9 +203,10 @@ export function createVoiceSession(): VoiceSession {
         break;
 
       case "tts_chunk": {
-        const currentTurnState = get(currentTurn);
-        if (!currentTurnState.ttsStartTs && currentTurnState.response) {
-          activities.add("agent", "Agent Response", currentTurnState.response);
+        if (event.skipped) {
+          queueAudio(event.turn_id, event.seq, null);
+        } else if (event.audio_length > 0) {
+          pendingAudio = { turn: event.turn_id, seq: event.seq };
         }
         currentTurn.ttsChunk(event.ts);
 
@@ -188,8 +268,13 @@ export function createVoiceSession(): VoiceSession {
 
     ws.onmessage = async (event) => {
       if (event.data instanceof ArrayBuffer) {
-        // Binary audio data (TTS)
-        audioPlayback.push(event.data);
+        // Binary audio data (TTS) for the segment announced by the last tts_chunk
+        if (pendingAudio !== null) {
+          queueAudio(pendingAudio.turn, pendingAudio.seq, event.data);
+          pendingAudio = null;
+        } else {
+          audioPlayback.push(event.data);
+        }
       } else {
         try {
           const eventData: ServerEvent = JSON.parse(event.data);